@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+class AccountsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.accounts'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from apps.core.prometheus import store
+        from .token_cache import token_cache
+        store.register_cache('token', token_cache)
@@ -0,0 +1,29 @@
+from asgiref.sync import sync_to_async
+from rest_framework.response import Response
+from rest_framework.authtoken.models import Token
+from apps.core.async_views import AsyncAPIViewMixin
+from .serializers import UserSerializer, LoginSerializer
+from .views import LoginView, MeView
+
+# Async versions of the hot account endpoints (see taskmanager.asgi_urls).
+
+
+class AsyncLoginView(AsyncAPIViewMixin, LoginView):
+    
+    async def post(self, request):
+        serializer = LoginSerializer(data=request.data)
+        # authenticate() queries and runs the password hasher: keep both off the event loop
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        user = serializer.validated_data
+        token, created = await Token.objects.aget_or_create(user=user)
+        return Response({
+            'user': UserSerializer(user).data,
+            'token': token.key
+        })
+
+
+class AsyncMeView(AsyncAPIViewMixin, MeView):
+    
+    async def get(self, request, *args, **kwargs):
+        # The authenticated user is the object: no query at all
+        return Response(self.get_serializer(self.get_object()).data)
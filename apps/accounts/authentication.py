@@ -1,6 +1,9 @@
+from asgiref.sync import sync_to_async
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.authtoken.models import Token
+from apps.core.metrics import timing
+from .token_cache import token_cache
 
 
 class StrictTokenAuthentication(TokenAuthentication):
@@ -8,6 +11,7 @@ class StrictTokenAuthentication(TokenAuthentication):
     Custom token authentication that strictly validates tokens.
     Rejects invalid tokens and ensures token exists in database.
     Handles both 'Token <token>' and just '<token>' formats for Swagger compatibility.
+    Resolved tokens are kept in the in-process `token_cache`.
     """
     
     def authenticate(self, request):
@@ -15,7 +19,12 @@ class StrictTokenAuthentication(TokenAuthentication):
         Override to ensure strict token validation.
         Returns None if no token is provided, allowing other auth methods.
         Raises AuthenticationFailed if token is invalid.
+        Timed as the request's `auth` timing.
         """
+        with timing('auth'):
+            return self._authenticate(request)
+    
+    def _authenticate(self, request):
         auth_header = request.META.get('HTTP_AUTHORIZATION', '')
         
         # If no Authorization header, return None to allow other auth methods
@@ -48,9 +57,20 @@ class StrictTokenAuthentication(TokenAuthentication):
         if not token_key:
             return None
         
+        return self.authenticate_credentials(token_key)
+    
+    def authenticate_credentials(self, key):
+        """
+        Resolve a token key to `(user, token)`, from the cache when possible.
+        Shared with the parent's 'Token <token>' parsing path.
+        """
+        cached = token_cache.get(key)
+        if cached is not None:
+            return cached
+        
         # Validate token exists and is valid
         try:
-            token = Token.objects.select_related('user').get(key=token_key)
+            token = Token.objects.select_related('user').get(key=key)
         except Token.DoesNotExist:
             raise AuthenticationFailed('Invalid token.')
         
@@ -58,6 +78,42 @@ class StrictTokenAuthentication(TokenAuthentication):
         if not token.user.is_active:
             raise AuthenticationFailed('User account is disabled.')
         
+        token_cache.set(key, token.user, token)
+        return (token.user, token)
+    
+    async def aauthenticate(self, request):
+        """
+        `authenticate()` for async views: cache misses are resolved with the
+        async ORM. Bare tokens (no 'Token '/'Bearer ' prefix) are rare and
+        take the sync path in a thread.
+        """
+        with timing('auth'):
+            return await self._aauthenticate(request)
+    
+    async def _aauthenticate(self, request):
+        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+        if not auth_header:
+            return None
+        for prefix in ('Token ', 'Bearer '):
+            if auth_header.startswith(prefix):
+                token_key = auth_header.split(prefix)[1].strip()
+                if not token_key:
+                    return None
+                return await self.aauthenticate_credentials(token_key)
+        return await sync_to_async(self.authenticate)(request)
+    
+    async def aauthenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            token = await Token.objects.select_related('user').aget(key=key)
+        except Token.DoesNotExist:
+            raise AuthenticationFailed('Invalid token.')
+        
+        if not token.user.is_active:
+            raise AuthenticationFailed('User account is disabled.')
+        
+        token_cache.set(key, token.user, token)
         return (token.user, token)
-
-
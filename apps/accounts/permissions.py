@@ -5,4 +5,5 @@ class IsOwner(permissions.BasePermission):
     Custom permission to only allow owners of an object to access it.
     """
     def has_object_permission(self, request, view, obj):
-        return obj.user == request.user
\ No newline at end of file
+        # Compare ids so the owner row never has to be loaded
+        return obj.user_id == request.user.id
\ No newline at end of file
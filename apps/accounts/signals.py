@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from apps.core.response_cache import invalidate_users
+from .models import User
+from .token_cache import token_cache
+
+
+@receiver([post_save, post_delete], sender=Token)
+def evict_token(sender, instance, **kwargs):
+    """Drop a token from the cache when it is deleted (logout) or replaced."""
+    token_cache.delete(instance.key)
+
+
+@receiver([post_save, post_delete], sender=User)
+def evict_user_tokens(sender, instance, **kwargs):
+    """
+    Drop every cached token of a user on any save, which covers
+    deactivation and password changes, and on deletion.
+    """
+    token_cache.delete_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_responses(sender, instance, using, **kwargs):
+    """Cached responses embed user fields (e.g. `user_email`); a recreated id starts afresh too."""
+    invalidate_users([instance.pk], using=using)
@@ -0,0 +1,107 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of token key -> (user, token), with a TTL.
+
+    The cache is per process: signal handlers in `apps.accounts.signals`
+    evict entries when a token is deleted or its user is saved (deactivation,
+    password change), and the TTL bounds how long another worker process
+    may keep honouring a token that was revoked elsewhere.
+    """
+
+    def __init__(self, max_entries=10000, timeout=60, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls):
+        options = getattr(settings, 'TOKEN_CACHE', {})
+        return cls(
+            max_entries=options.get('MAX_ENTRIES', 10000),
+            timeout=options.get('TIMEOUT', 60),
+        )
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.timeout > 0
+
+    def get(self, key):
+        """Return a private copy of the cached `(user, token)`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Requests may annotate `request.user`; never hand out the shared copy.
+        user = copy.copy(entry[1])
+        token = copy.copy(entry[2])
+        token.user = user
+        return user, token
+
+    def set(self, key, user, token):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (self.clock() + self.timeout, user, token)
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def delete(self, key):
+        with self._lock:
+            self._discard(key)
+
+    def delete_user(self, user_id):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[1].pk
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+
+token_cache = TokenCache.from_settings()
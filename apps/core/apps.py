@@ -2,4 +2,12 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.core'
\ No newline at end of file
+    name = 'apps.core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .metrics import install
+        connection_created.connect(install, dispatch_uid='apps.core.metrics.install')
+        from .prometheus import store
+        from .response_cache import response_cache
+        store.register_cache('response', response_cache)
@@ -0,0 +1,89 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+SAFE_METHODS = ('GET', 'HEAD')
+PRECONDITION_HEADERS = ('HTTP_IF_MATCH', 'HTTP_IF_UNMODIFIED_SINCE', 'HTTP_IF_NONE_MATCH')
+
+
+def make_etag(*parts):
+    """A strong ETag over the values a representation is built from."""
+    return quote_etag(hashlib.sha1(repr(parts).encode('utf-8')).hexdigest())
+
+
+def query_signature(request, names=None):
+    """The query parameters (optionally only `names`) in a canonical order."""
+    return sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        if names is None or name in names
+        for value in values
+    )
+
+
+class ConditionalGetMixin:
+    """
+    Conditional reads for generic views.
+
+    `get_validators()` returns `(etag, last_modified)` computed without
+    serializing the response, usually from one small query, so
+    `If-None-Match`/`If-Modified-Since` are answered with 304 before the
+    main query runs.
+    """
+
+    def get_validators(self):
+        raise NotImplementedError
+
+    async def aget_validators(self):
+        """`get_validators()` for async views; by default run in a thread."""
+        return await sync_to_async(self.get_validators)()
+
+    def evaluate_preconditions(self, request):
+        return self.conditional_response(request, *self.get_validators())
+
+    async def aevaluate_preconditions(self, request):
+        return self.conditional_response(request, *await self.aget_validators())
+
+    def conditional_response(self, request, etag, last_modified):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        self.validator_headers = {'ETag': etag}
+        if timestamp is not None:
+            self.validator_headers['Last-Modified'] = http_date(timestamp)
+        return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+    def get(self, request, *args, **kwargs):
+        response = self.evaluate_preconditions(request)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method in SAFE_METHODS and response.status_code in (200, 304):
+            for header, value in getattr(self, 'validator_headers', {}).items():
+                response.headers.setdefault(header, value)
+        return response
+
+
+class ConditionalRequestMixin(ConditionalGetMixin):
+    """
+    Conditional reads plus `If-Match`/`If-Unmodified-Since` on writes,
+    answered with 412 when the resource changed. The validators are only
+    computed when the client sent a precondition.
+    """
+
+    def check_write_preconditions(self, request):
+        if any(header in request.META for header in PRECONDITION_HEADERS):
+            return self.evaluate_preconditions(request)
+        return None
+
+    def put(self, request, *args, **kwargs):
+        return self.check_write_preconditions(request) or super().put(request, *args, **kwargs)
+
+    def patch(self, request, *args, **kwargs):
+        return self.check_write_preconditions(request) or super().patch(request, *args, **kwargs)
+
+    def delete(self, request, *args, **kwargs):
+        return self.check_write_preconditions(request) or super().delete(request, *args, **kwargs)
@@ -0,0 +1,302 @@
+import asyncio
+import itertools
+import json
+import threading
+from collections import deque, namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - only needed by RedisBroker
+    redis = None
+
+Event = namedtuple('Event', 'id user_id type data')
+
+
+class Subscription:
+    """
+    The live events of one stream. Filled from any thread through the
+    owning event loop; a stream that falls `maxsize` events behind is
+    closed instead (`get()` returns None) and resumes from its last id.
+    """
+
+    def __init__(self, user_id, maxsize):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        self.closed = False
+
+    def deliver(self, event):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.close()
+
+    def close(self):
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class Hub:
+    """
+    In-process fan-out: the subscriptions of the streams open in this
+    process, per user. An idle stream is one queue and one suspended
+    coroutine, so a worker holds thousands of them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, user_id, maxsize):
+        subscription = Subscription(user_id, maxsize)
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.user_id, None)
+
+    def dispatch(self, event):
+        """Hand `event` to its user's streams; safe from any thread."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(event.user_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The stream's event loop is closed
+                self.unsubscribe(subscription)
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+class BaseBroker:
+    """
+    Keeps recent events for replay and delivers new ones to the `hub` of
+    every process serving streams.
+
+    Event ids increase in publication order, so a client reconnecting with
+    `Last-Event-ID` gets what it missed from `replay()`.
+    """
+
+    def __init__(self, replay=10000):
+        self.replay_size = replay
+        self.hub = Hub()
+
+    @classmethod
+    def from_settings(cls, options):
+        return cls(replay=options.get('REPLAY', 10000))
+
+    def publish(self, user_id, type, data):
+        raise NotImplementedError
+
+    def replay(self, user_id, last_event_id):
+        """The user's events after `last_event_id`, or None when they are no longer all kept."""
+        raise NotImplementedError
+
+    def sort_key(self, event_id):
+        raise NotImplementedError
+
+    def subscribe(self, user_id, maxsize=100):
+        return self.hub.subscribe(user_id, maxsize)
+
+    def unsubscribe(self, subscription):
+        self.hub.unsubscribe(subscription)
+
+
+class MemoryBroker(BaseBroker):
+    """
+    Events kept in this process only: the default, and the broker for tests.
+    Streams only see writes made by the same process, so serve the feed
+    from a single (ASGI) worker or use `RedisBroker`.
+    """
+
+    def __init__(self, replay=10000):
+        super().__init__(replay)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._events = deque(maxlen=replay)
+
+    def publish(self, user_id, type, data):
+        with self._lock:
+            event = Event(str(next(self._ids)), user_id, type, data)
+            self._events.append(event)
+        self.hub.dispatch(event)
+        return event
+
+    def replay(self, user_id, last_event_id):
+        try:
+            last = int(last_event_id)
+        except (TypeError, ValueError):
+            return None
+        with self._lock:
+            events = list(self._events)
+        newest = int(events[-1].id) if events else 0
+        oldest = int(events[0].id) if events else 1
+        if last > newest or last < oldest - 1:
+            # From before a restart, or already dropped from the buffer
+            return None
+        return [event for event in events if int(event.id) > last and event.user_id == user_id]
+
+    def sort_key(self, event_id):
+        return int(event_id)
+
+
+class RedisBroker(BaseBroker):
+    """
+    Events in one Redis stream shared by all workers, trimmed to about
+    `replay` entries. Each process runs a single reader thread that follows
+    the stream and fans the events out to its own streams.
+    """
+
+    def __init__(self, url, key='events', replay=10000, block=5000):
+        if redis is None:
+            raise ImproperlyConfigured('RedisBroker requires the redis package.')
+        super().__init__(replay)
+        self.client = redis.Redis.from_url(url)
+        self.key = key
+        self.block = block
+        self._reader = None
+        self._reader_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, options):
+        return cls(url=options['URL'], key=options.get('KEY', 'events'), replay=options.get('REPLAY', 10000))
+
+    def publish(self, user_id, type, data):
+        event_id = self.client.xadd(
+            self.key, {'user': user_id, 'type': type, 'data': json.dumps(data)},
+            maxlen=self.replay_size, approximate=True
+        )
+        return Event(event_id.decode(), user_id, type, data)
+
+    def replay(self, user_id, last_event_id):
+        try:
+            last = self.sort_key(last_event_id)
+        except (TypeError, ValueError):
+            return None
+        oldest = self.client.xrange(self.key, count=1)
+        if oldest and self.sort_key(oldest[0][0].decode()) > last:
+            return None
+        events = (self._event(entry) for entry in self.client.xrange(self.key, min='(' + last_event_id))
+        return [event for event in events if event.user_id == user_id]
+
+    def sort_key(self, event_id):
+        milliseconds, sequence = event_id.split('-')
+        return int(milliseconds), int(sequence)
+
+    def subscribe(self, user_id, maxsize=100):
+        subscription = super().subscribe(user_id, maxsize)
+        with self._reader_lock:
+            if self._reader is None or not self._reader.is_alive():
+                latest = self.client.xrevrange(self.key, count=1)
+                self._reader = threading.Thread(
+                    target=self._follow, args=(latest[0][0] if latest else b'0-0',), daemon=True
+                )
+                self._reader.start()
+        return subscription
+
+    def _follow(self, last_id):
+        while True:
+            for key, entries in self.client.xread({self.key: last_id}, count=500, block=self.block) or ():
+                for entry in entries:
+                    last_id = entry[0]
+                    self.hub.dispatch(self._event(entry))
+
+    def _event(self, entry):
+        event_id, fields = entry
+        return Event(
+            event_id.decode(), int(fields[b'user']), fields[b'type'].decode(), json.loads(fields[b'data'])
+        )
+
+
+def event_settings():
+    options = getattr(settings, 'EVENTS', {})
+    return {
+        'BROKER': options.get('BROKER', 'apps.core.events.MemoryBroker'),
+        'OPTIONS': options.get('OPTIONS', {}),
+        'HEARTBEAT': options.get('HEARTBEAT', 15),
+        'MAX_AGE': options.get('MAX_AGE', 300),
+        'QUEUE_SIZE': options.get('QUEUE_SIZE', 100),
+        'RETRY': options.get('RETRY', 3000),
+    }
+
+
+def load_broker():
+    options = event_settings()
+    return import_string(options['BROKER']).from_settings(options['OPTIONS'])
+
+
+broker = load_broker()
+
+
+def publish(user_id, type, data):
+    return broker.publish(user_id, type, data)
+
+
+def format_event(event):
+    return f'id: {event.id}\nevent: {event.type}\ndata: {json.dumps(event.data, separators=(",", ":"))}\n\n'
+
+
+async def event_stream(user_id, last_event_id=None, source=None):
+    """
+    The Server-Sent Events body of a user's change feed: the events missed
+    since `last_event_id`, then live events, with a comment as heartbeat.
+
+    A `resync` event means the missed events are gone; the client reloads
+    its data. The stream ends after `MAX_AGE` seconds or when it falls too
+    far behind; clients reconnect with `Last-Event-ID` and lose nothing.
+    """
+    source = source or broker
+    options = event_settings()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + options['MAX_AGE']
+    # Subscribe before reading the history, so nothing falls in between.
+    subscription = source.subscribe(user_id, options['QUEUE_SIZE'])
+    try:
+        yield f'retry: {options["RETRY"]}\n\n'
+        last_key = None
+        if last_event_id:
+            history = await sync_to_async(source.replay)(user_id, last_event_id)
+            if history is None:
+                yield 'event: resync\ndata: {}\n\n'
+            else:
+                for event in history:
+                    yield format_event(event)
+                last_key = source.sort_key(history[-1].id) if history else source.sort_key(last_event_id)
+        while True:
+            timeout = min(options['HEARTBEAT'], deadline - loop.time())
+            if timeout <= 0:
+                return
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout)
+            except asyncio.TimeoutError:
+                if loop.time() >= deadline:
+                    return
+                yield ': keepalive\n\n'
+                continue
+            if event is None:
+                return
+            if last_key is not None and source.sort_key(event.id) <= last_key:
+                continue
+            yield format_event(event)
+    finally:
+        source.unsubscribe(subscription)
@@ -0,0 +1,82 @@
+from rest_framework.exceptions import ValidationError
+
+from .conditional import SAFE_METHODS
+from .serialization import query_fields
+
+FIELDSET_PARAMS = ('fields', 'exclude')
+
+
+class FieldsetSerializerMixin:
+    """
+    Serializer taking `fields` and/or `exclude` (field names) to drop fields
+    from its output. With `many=True` they apply to every item.
+    """
+
+    def __init__(self, *args, fields=None, exclude=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is None and not exclude:
+            return
+        for name in list(self.fields):
+            if (fields is not None and name not in fields) or (exclude and name in exclude):
+                self.fields.pop(name)
+
+
+class SparseFieldsetMixin:
+    """
+    `?fields=id,title` / `?exclude=description` on reads of a generic view
+    with a `FieldsetSerializerMixin` serializer. Unknown names are a 400.
+
+    `sparse_queryset()` pushes the selection down to the query: only the
+    columns the remaining fields read are loaded, and relations are only
+    joined when a remaining field reads through them.
+    """
+
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+
+    def get_fieldset(self):
+        """The `fields`/`exclude` serializer kwargs of this request."""
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = self.parse_fieldset()
+        return self._fieldset
+
+    def parse_fieldset(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return {}
+        fieldset = {}
+        available = None
+        for kwarg, param in (('fields', self.fields_query_param), ('exclude', self.exclude_query_param)):
+            names = [name.strip() for name in request.query_params.get(param, '').split(',') if name.strip()]
+            if not names:
+                continue
+            if available is None:
+                available = list(self.get_serializer_class()(context=self.get_serializer_context()).fields)
+            unknown = [name for name in names if name not in available]
+            if unknown:
+                raise ValidationError({
+                    param: f"Unknown field(s): {', '.join(unknown)}. Must be among: {', '.join(available)}"
+                })
+            fieldset[kwarg] = names
+        return fieldset
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(self.get_fieldset())
+        return super().get_serializer(*args, **kwargs)
+
+    def sparse_queryset(self, queryset, columns=(), related_columns=None):
+        """
+        `queryset` loading only what the requested fields read, plus the
+        `columns` the view itself needs (ownership, validators) and, for
+        each joined relation, its `related_columns` ({relation: names}).
+        """
+        if not self.get_fieldset():
+            return queryset
+        only, relations = query_fields(self.get_serializer())
+        only.extend(columns)
+        for relation in relations:
+            only.extend(f'{relation}__{name}' for name in (related_columns or {}).get(relation, ()))
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*only)
@@ -0,0 +1,180 @@
+import asyncio
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from rest_framework.authtoken.models import Token
+
+from apps.core.response_cache import response_cache
+from apps.tasks.models import Task
+
+BENCH_EMAIL = 'benchmark@example.com'
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the WSGI and ASGI entry points in process: concurrent clients that "
+        "read their responses slowly, served by a WSGI worker's thread pool versus one event loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/tasks/', help="Path (with query string) to request.")
+        parser.add_argument('--requests', type=int, default=600, help="Total requests per entry point.")
+        parser.add_argument('--concurrency', type=int, default=200, help="Concurrent clients.")
+        parser.add_argument('--threads', type=int, default=8,
+                            help="WSGI worker threads (e.g. gunicorn --threads).")
+        parser.add_argument('--client-delay', type=float, default=0.2,
+                            help="Seconds each client takes to read a response body.")
+        parser.add_argument('--tasks', type=int, default=100, help="Tasks owned by the benchmark user.")
+        parser.add_argument('--with-cache', action='store_true', help="Keep the response cache enabled.")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON.")
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1 or options['threads'] < 1:
+            raise CommandError('--requests, --concurrency and --threads must be positive.')
+        token = self.setup_data(options['tasks'])
+        url = urlsplit(options['path'])
+        request = {'path': url.path, 'query': url.query, 'token': token.key, 'delay': options['client_delay']}
+
+        timeout = response_cache.timeout
+        if not options['with_cache']:
+            response_cache.timeout = 0
+        try:
+            results = {
+                'wsgi': asyncio.run(self.run_wsgi(request, options)),
+                'asgi': asyncio.run(self.run_asgi(request, options)),
+            }
+        finally:
+            response_cache.timeout = timeout
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write('%d requests to %s, %d clients, %.0f ms client read time' % (
+            options['requests'], options['path'], options['concurrency'], options['client_delay'] * 1000))
+        for name, result in results.items():
+            self.stdout.write('%-5s %8.1f req/s  p50 %7.1f ms  p99 %7.1f ms  errors %d' % (
+                name.upper(), result['requests_per_second'], result['p50_ms'], result['p99_ms'], result['errors']))
+
+    def setup_data(self, count):
+        User = get_user_model()
+        user = User.objects.filter(email=BENCH_EMAIL).first()
+        if user is None:
+            user = User.objects.create_user(email=BENCH_EMAIL, name='Benchmark', password=None)
+        missing = count - Task.objects.filter(user=user).count()
+        if missing > 0:
+            Task.objects.bulk_create(Task(title=f'Benchmark task {i}', user=user) for i in range(missing))
+        token, created = Token.objects.get_or_create(user=user)
+        return token
+
+    async def drive(self, call, options):
+        """Run `options['requests']` calls from `options['concurrency']` clients."""
+        latencies = []
+        errors = 0
+        remaining = options['requests']
+
+        async def client():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                status = await call()
+                latencies.append(time.perf_counter() - started)
+                errors += status != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(options['concurrency'])))
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': errors,
+            'seconds': round(elapsed, 3),
+            'requests_per_second': round(len(latencies) / elapsed, 1),
+            'p50_ms': round(statistics.median(latencies) * 1000, 1),
+            'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 1),
+        }
+
+    async def run_wsgi(self, request, options):
+        application = get_wsgi_application()
+
+        def call():
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': request['path'],
+                'QUERY_STRING': request['query'],
+                'SERVER_NAME': 'localhost',
+                'SERVER_PORT': '80',
+                'SERVER_PROTOCOL': 'HTTP/1.1',
+                'HTTP_HOST': 'localhost',
+                'HTTP_AUTHORIZATION': f"Token {request['token']}",
+                'wsgi.input': BytesIO(),
+                'wsgi.errors': BytesIO(),
+                'wsgi.url_scheme': 'http',
+                'wsgi.multithread': True,
+                'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+                'wsgi.version': (1, 0),
+            }
+            status = []
+            body = application(environ, lambda line, headers: status.append(int(line.split()[0])))
+            try:
+                b''.join(body)
+                # The worker thread is held while a slow client drains the body.
+                time.sleep(request['delay'])
+            finally:
+                if hasattr(body, 'close'):
+                    body.close()
+            return status[0]
+
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(options['threads']) as pool:
+            return await self.drive(lambda: loop.run_in_executor(pool, call), options)
+
+    async def run_asgi(self, request, options):
+        application = get_asgi_application()
+
+        async def call():
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': request['path'],
+                'raw_path': request['path'].encode(),
+                'query_string': request['query'].encode(),
+                'root_path': '',
+                'headers': [
+                    (b'host', b'localhost'),
+                    (b'authorization', f"Token {request['token']}".encode()),
+                ],
+                'client': ('127.0.0.1', 0),
+                'server': ('localhost', 80),
+            }
+            messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+            status = []
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await asyncio.Event().wait()
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+                elif not message.get('more_body'):
+                    # Only this client's coroutine waits for the slow read.
+                    await asyncio.sleep(request['delay'])
+
+            await application(scope, receive, send)
+            return status[0]
+
+        return await self.drive(call, options)
@@ -0,0 +1,246 @@
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+import urllib3
+from django.core.management.base import BaseCommand, CommandError
+
+from .seed_data import WORDS
+
+# Scenario -> share of the requests each client makes after logging in.
+MIX = {
+    'task-list': 25,
+    'task-filter': 15,
+    'task-search': 10,
+    'task-ordering': 10,
+    'task-detail': 20,
+    'task-toggle': 8,
+    'project-detail': 8,
+    'login': 4,
+}
+ORDERINGS = ('created_at', '-due_date', 'due_date', 'priority', '-priority')
+FILTERS = (('status', ('pending', 'in_progress', 'completed')), ('priority', ('low', 'medium', 'high')))
+
+
+def percentile(latencies, q):
+    """Nearest-rank percentile of sorted `latencies`."""
+    return latencies[max(0, math.ceil(q / 100 * len(latencies)) - 1)]
+
+
+def summarize(samples, seconds):
+    """Throughput and latency (ms) of `(latency, status, cache_hit)` samples; status 0 is a network error."""
+    latencies = sorted(latency for latency, status, hit in samples)
+    if not latencies:
+        return {'requests': 0, 'errors': 0}
+    statuses = Counter(str(status) for latency, status, hit in samples)
+    return {
+        'requests': len(latencies),
+        'errors': sum(count for status, count in statuses.items() if not 0 < int(status) < 400),
+        'statuses': dict(sorted(statuses.items())),
+        'cache_hits': sum(hit for latency, status, hit in samples),
+        'requests_per_second': round(len(latencies) / seconds, 1),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2),
+    }
+
+
+class Client:
+    """One simulated user: logs in, then requests a random mix of endpoints."""
+
+    def __init__(self, http, base_url, email, password, rng, timeout):
+        self.http = http
+        self.base_url = base_url
+        self.email = email
+        self.password = password
+        self.rng = rng
+        self.timeout = timeout
+        self.token = None
+        self.task_ids = []
+        self.project_ids = []
+        self.samples = {}
+
+    def request(self, scenario, method, path, params=None, body=None):
+        """Time one request; returns the decoded JSON body, or None on failure."""
+        url = self.base_url + path + (f'?{urlencode(params)}' if params else '')
+        headers = {'Accept': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Token {self.token}'
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+            body = json.dumps(body).encode()
+        started = time.perf_counter()
+        try:
+            response = self.http.request(method, url, body=body, headers=headers, timeout=self.timeout,
+                                         retries=False)
+        except urllib3.exceptions.HTTPError:
+            self.samples.setdefault(scenario, []).append((time.perf_counter() - started, 0, False))
+            return None
+        latency = time.perf_counter() - started
+        hit = response.headers.get('X-Cache') == 'HIT'
+        self.samples.setdefault(scenario, []).append((latency, response.status, hit))
+        if response.status >= 400:
+            return None
+        try:
+            return json.loads(response.data)
+        except ValueError:
+            return None
+
+    def login(self):
+        data = self.request('login', 'POST', '/api/auth/login/', body={'email': self.email, 'password': self.password})
+        if data:
+            self.token = data['token']
+        return self.token is not None
+
+    def start(self):
+        """Log in and learn some task and project ids; False if the login failed."""
+        if not self.login():
+            return False
+        projects = self.request('project-list', 'GET', '/api/projects/')
+        self.project_ids = [project['id'] for project in (projects or {}).get('results', [])]
+        self.list_tasks('task-list', {})
+        return True
+
+    def list_tasks(self, scenario, params):
+        data = self.request(scenario, 'GET', '/api/tasks/', params)
+        ids = [task['id'] for task in (data or {}).get('results', [])]
+        if ids:
+            # Keep a bounded sample of ids seen, for the detail and toggle requests.
+            self.task_ids = (self.task_ids + ids)[-100:]
+
+    def step(self):
+        scenario = self.rng.choices(list(MIX), list(MIX.values()))[0]
+        if scenario == 'task-list':
+            self.list_tasks(scenario, {'page': self.rng.choice((1, 1, 1, 2, 3))})
+        elif scenario == 'task-filter':
+            name, values = self.rng.choice(FILTERS)
+            params = {name: self.rng.choice(values)}
+            if self.project_ids and self.rng.random() < 0.3:
+                params = {'project': self.rng.choice(self.project_ids)}
+            self.list_tasks(scenario, params)
+        elif scenario == 'task-search':
+            self.list_tasks(scenario, {'search': self.rng.choice(WORDS)})
+        elif scenario == 'task-ordering':
+            self.list_tasks(scenario, {'ordering': self.rng.choice(ORDERINGS)})
+        elif scenario == 'task-detail' and self.task_ids:
+            self.request(scenario, 'GET', f'/api/tasks/{self.rng.choice(self.task_ids)}/')
+        elif scenario == 'task-toggle' and self.task_ids:
+            self.request(scenario, 'POST', f'/api/tasks/{self.rng.choice(self.task_ids)}/toggle-complete/')
+        elif scenario == 'project-detail' and self.project_ids:
+            self.request(scenario, 'GET', f'/api/projects/{self.rng.choice(self.project_ids)}/')
+        elif scenario == 'login':
+            self.login()
+        else:
+            # A user without tasks or projects lists their tasks instead.
+            self.list_tasks('task-list', {})
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a running server with concurrent clients logged in as the users of `seed_data`: "
+        "login, task lists with filters, search and ordering, task detail, toggle and project "
+        "detail. Reports throughput and p50/p95/p99 latency per endpoint and writes them as JSON "
+        "to compare between runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help="Base URL of the server.")
+        parser.add_argument('--concurrency', type=int, default=20, help="Concurrent clients.")
+        parser.add_argument('--duration', type=float, default=30, help="Seconds to run.")
+        parser.add_argument('--requests', type=int, default=0,
+                            help="Stop after this many requests once logged in (0: run for --duration).")
+        parser.add_argument('--users', type=int, default=100, help="Seeded users the clients log in as.")
+        parser.add_argument('--prefix', default='seed', help="Email prefix given to seed_data.")
+        parser.add_argument('--password', default='seed-password', help="Password given to seed_data.")
+        parser.add_argument('--timeout', type=float, default=30, help="Seconds before a request fails.")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed of the request mix.")
+        parser.add_argument('--label', default='', help="Name of this run, stored in the report.")
+        parser.add_argument('--output', default='', help="Write the report here (default load-test-<time>.json).")
+        parser.add_argument('--compare', default='', help="A previous report to compare this run with.")
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['users'] < 1 or options['duration'] <= 0:
+            raise CommandError('--concurrency, --users and --duration must be positive.')
+        previous = self.load_report(options['compare']) if options['compare'] else None
+        base_url = options['url'].rstrip('/')
+        http = urllib3.PoolManager(maxsize=options['concurrency'])
+        clients = [
+            Client(http, base_url, f"{options['prefix']}-{i % options['users']}@example.com",
+                   options['password'], random.Random(options['seed'] * 100003 + i), options['timeout'])
+            for i in range(options['concurrency'])
+        ]
+        started_at = datetime.now(timezone.utc)
+        budget = threading.Semaphore(options['requests']) if options['requests'] else None
+        started = time.perf_counter()
+        deadline = started + options['duration']
+
+        def run(client):
+            if not client.start():
+                return False
+            while time.perf_counter() < deadline and (budget is None or budget.acquire(blocking=False)):
+                client.step()
+            return True
+
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            logged_in = sum(pool.map(run, clients))
+        seconds = time.perf_counter() - started
+        http.clear()
+        if not logged_in:
+            raise CommandError(f"No client could log in as {clients[0].email}: run seed_data against the server.")
+
+        samples = {}
+        for client in clients:
+            for scenario, scenario_samples in client.samples.items():
+                samples.setdefault(scenario, []).extend(scenario_samples)
+        report = {
+            'label': options['label'],
+            'url': base_url,
+            'started_at': started_at.isoformat(),
+            'seconds': round(seconds, 3),
+            'options': {name: options[name] for name in ('concurrency', 'duration', 'requests', 'users', 'seed')},
+            'total': summarize([sample for values in samples.values() for sample in values], seconds),
+            'scenarios': {scenario: summarize(samples[scenario], seconds) for scenario in sorted(samples)},
+        }
+        output = options['output'] or f"load-test-{started_at.strftime('%Y%m%d-%H%M%S')}.json"
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        self.write_table(report, previous)
+        self.stdout.write(self.style.SUCCESS(f'Report written to {output}'))
+
+    def load_report(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read the report to compare with: {e}')
+
+    def write_table(self, report, previous):
+        self.stdout.write('%d clients for %.1f s against %s' % (
+            report['options']['concurrency'], report['seconds'], report['url']))
+        self.stdout.write('%-16s %8s %7s %9s %9s %9s %9s' % (
+            'endpoint', 'requests', 'errors', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms'))
+        rows = [('total', report['total'])] + list(report['scenarios'].items())
+        for name, result in rows:
+            if not result['requests']:
+                continue
+            self.stdout.write('%-16s %8d %7d %9.1f %9.2f %9.2f %9.2f' % (
+                name, result['requests'], result['errors'], result['requests_per_second'],
+                result['p50_ms'], result['p95_ms'], result['p99_ms']))
+            before = previous and (previous['total'] if name == 'total' else previous['scenarios'].get(name))
+            if before and before.get('requests'):
+                self.stdout.write('%-16s %8s %7s %9s %9s %9s %9s' % (
+                    '  vs previous', '', '',
+                    *(self.change(before[key], result[key])
+                      for key in ('requests_per_second', 'p50_ms', 'p95_ms', 'p99_ms'))))
+
+    def change(self, before, after):
+        return f'{(after - before) / before * 100:+.1f}%' if before else 'n/a'
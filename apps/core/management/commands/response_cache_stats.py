@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.response_cache import response_cache
+
+
+class Command(BaseCommand):
+    help = "Report the response cache hit ratio across every process sharing the cache backend."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Reset the counters after reporting.")
+
+    def handle(self, *args, **options):
+        stats = response_cache.shared_stats()
+        self.stdout.write('Cache alias: %s (timeout %ss)' % (response_cache.alias, response_cache.timeout))
+        self.stdout.write('Hits: %d, misses: %d, hit rate: %.1f%%' % (
+            stats['hits'], stats['misses'], stats['hit_rate'] * 100))
+        if options['reset']:
+            response_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
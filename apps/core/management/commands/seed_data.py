@@ -0,0 +1,151 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+SEED_BATCH = 5000
+
+# Words of generated titles and descriptions; `loadtest` searches for them.
+WORDS = (
+    'api', 'backend', 'billing', 'bug', 'cache', 'client', 'config', 'dashboard', 'database', 'deploy',
+    'design', 'docs', 'email', 'export', 'feature', 'frontend', 'import', 'index', 'invoice', 'login',
+    'metrics', 'migration', 'mobile', 'onboarding', 'payment', 'performance', 'release', 'report',
+    'review', 'search', 'security', 'server', 'signup', 'staging', 'support', 'sync', 'test', 'upload',
+)
+VERBS = ('Fix', 'Add', 'Update', 'Review', 'Refactor', 'Write', 'Plan', 'Investigate', 'Remove', 'Ship')
+
+STATUSES = (('pending', 35), ('in_progress', 20), ('completed', 45))
+PRIORITIES = (('low', 25), ('medium', 55), ('high', 20))
+# (weight, fewest words, most words): mostly empty or a sentence, a few long notes.
+DESCRIPTION_SIZES = ((40, 0, 0), (35, 5, 40), (20, 40, 300), (5, 300, 1500))
+
+
+def spread(total, weights):
+    """Split `total` over `weights` proportionally; the counts add up to `total`."""
+    scale = sum(weights)
+    counts = [int(total * weight / scale) for weight in weights]
+    remainders = sorted(range(len(weights)), key=lambda i: total * weights[i] / scale - counts[i], reverse=True)
+    for i in remainders[:total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def choose(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed users, projects and tasks with production-like distributions: a few heavy "
+        "users and many light ones, mixed statuses and priorities, past, upcoming and missing "
+        "due dates, and descriptions from empty to several pages. Every user shares one password, "
+        "for `loadtest`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help="Users to create.")
+        parser.add_argument('--projects', type=int, default=500, help="Projects, spread over the users.")
+        parser.add_argument('--tasks', type=int, default=20000, help="Tasks, spread over the users.")
+        parser.add_argument('--prefix', default='seed', help="Users are <prefix>-<n>@example.com.")
+        parser.add_argument('--password', default='seed-password', help="Password of every seeded user.")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed; the same seed gives the same data.")
+        parser.add_argument('--clear', action='store_true',
+                            help="Delete the users of --prefix (and their data) before seeding.")
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['projects'] < 0 or options['tasks'] < 0:
+            raise CommandError('--users must be positive, --projects and --tasks not negative.')
+        User = get_user_model()
+        existing = User.objects.filter(email__startswith=f"{options['prefix']}-", email__endswith='@example.com')
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+        with transaction.atomic():
+            if options['clear']:
+                existing.delete()
+            elif existing.exists():
+                raise CommandError(f"Users {options['prefix']}-*@example.com exist: pass --clear to replace them.")
+            users = self.seed_users(options)
+            projects = self.seed_projects(rng, users, options['projects'])
+            self.seed_tasks(rng, users, projects, options['tasks'])
+        self.stdout.write('Seeded %d users, %d projects and %d tasks in %.1f s' % (
+            len(users), sum(len(user_projects) for user_projects in projects.values()), options['tasks'],
+            time.perf_counter() - started))
+        counts = Task.objects.filter(user__in=users).values('status').annotate(count=Count('id')).order_by('status')
+        self.stdout.write('Statuses: ' + ', '.join(f"{row['status']} {row['count']}" for row in counts))
+        self.stdout.write(f"Log in as {options['prefix']}-0@example.com (to -{len(users) - 1}) "
+                          f"with password {options['password']!r}.")
+
+    def seed_users(self, options):
+        User = get_user_model()
+        # Hashing is deliberately slow: hash once and share it.
+        password = make_password(options['password'])
+        return User.objects.bulk_create(
+            (User(email=f"{options['prefix']}-{i}@example.com", name=f"Seed User {i}", password=password)
+             for i in range(options['users'])),
+            batch_size=SEED_BATCH,
+        )
+
+    def seed_projects(self, rng, users, total):
+        """`{user_id: [project ids]}`; projects follow the same skew as tasks."""
+        weights = [rng.lognormvariate(0, 0.75) for _ in users]
+        projects = [
+            Project(name=f'{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} {n + 1}',
+                    description=self.text(rng, 0, 30), user_id=user.pk)
+            for user, count in zip(users, spread(total, weights))
+            for n in range(count)
+        ]
+        by_user = {user.pk: [] for user in users}
+        for project in Project.objects.bulk_create(projects, batch_size=SEED_BATCH):
+            by_user[project.user_id].append(project.pk)
+        return by_user
+
+    def seed_tasks(self, rng, users, projects, total):
+        # Log-normal task counts: most users have a few tasks, some thousands.
+        counts = spread(total, [rng.lognormvariate(0, 1.2) for _ in users])
+        now = timezone.now()
+        tasks = []
+        for user, count in zip(users, counts):
+            for _ in range(count):
+                tasks.append(self.task(rng, user.pk, projects[user.pk], now))
+                if len(tasks) == SEED_BATCH:
+                    Task.objects.bulk_create(tasks)
+                    tasks = []
+        Task.objects.bulk_create(tasks)
+
+    def task(self, rng, user_id, project_ids, now):
+        status = choose(rng, STATUSES)
+        if rng.random() < 0.25:
+            due_date = None
+        elif status == 'completed':
+            due_date = now - timedelta(days=rng.uniform(0, 60))
+        else:
+            # Open tasks: a tail of overdue ones, most due in the coming weeks.
+            due_date = now + timedelta(days=rng.uniform(-14, 45))
+        weight, fewest, most = rng.choices(DESCRIPTION_SIZES, [size[0] for size in DESCRIPTION_SIZES])[0]
+        return Task(
+            title=f'{rng.choice(VERBS)} {rng.choice(WORDS)} {rng.choice(WORDS)}',
+            description=self.text(rng, fewest, most),
+            status=status,
+            priority=choose(rng, PRIORITIES),
+            due_date=due_date,
+            completed_at=now - timedelta(days=rng.uniform(0, 60)) if status == 'completed' else None,
+            user_id=user_id,
+            # Most tasks belong to one of the user's projects.
+            project_id=rng.choice(project_ids) if project_ids and rng.random() < 0.7 else None,
+        )
+
+    def text(self, rng, fewest, most):
+        count = rng.randint(fewest, most)
+        if not count:
+            return ''
+        return ' '.join(rng.choices(WORDS, k=count)).capitalize() + '.'
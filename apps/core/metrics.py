@@ -0,0 +1,132 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# The metrics of the request being served. Context variables follow the
+# request into `sync_to_async` threads, so ORM calls made there count too.
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Query count, database time and named timings (in seconds) of one request."""
+    __slots__ = ('started', 'queries', 'db_time', 'timings', 'active')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.timings = {}
+        # Names being timed, so nested spans of the same name count once
+        self.active = set()
+
+    def add(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def current():
+    return _current.get()
+
+
+def activate():
+    """Start collecting metrics for the current request; returns them."""
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timing(name):
+    """Add the time spent in the block to the current request's `name` timing."""
+    metrics = _current.get()
+    if metrics is None or name in metrics.active:
+        yield
+        return
+    metrics.active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.active.discard(name)
+        metrics.add(name, time.perf_counter() - started)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every database connection."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - started
+        metrics.queries += 1
+
+
+def install(sender, connection, **kwargs):
+    """`connection_created` receiver: count the connection's queries."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def metrics_settings():
+    options = getattr(settings, 'REQUEST_METRICS', {})
+    return {
+        'ENABLED': options.get('ENABLED', True),
+        'SERVER_TIMING': options.get('SERVER_TIMING', True),
+        'QUERY_BUDGET': options.get('QUERY_BUDGET', 20),
+        'LATENCY_BUDGET_MS': options.get('LATENCY_BUDGET_MS', 500),
+        'ROUTES': options.get('ROUTES', {}),
+    }
+
+
+def route_name(request):
+    """The name of the URL the request resolved to, or None."""
+    return getattr(getattr(request, 'resolver_match', None), 'view_name', None)
+
+
+def server_timing(metrics, total):
+    """The `Server-Timing` header value; durations in milliseconds."""
+    entries = [f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries"']
+    entries.extend(f'{name};dur={seconds * 1000:.2f}' for name, seconds in sorted(metrics.timings.items()))
+    entries.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(entries)
+
+
+def report(request, response, metrics, total, options):
+    """Log the request as one JSON line: INFO, or WARNING when it is over a budget."""
+    route = route_name(request)
+    budgets = {**options, **options['ROUTES'].get(route, {})}
+    exceeded = []
+    if budgets['QUERY_BUDGET'] is not None and metrics.queries > budgets['QUERY_BUDGET']:
+        exceeded.append('queries')
+    if budgets['LATENCY_BUDGET_MS'] is not None and total * 1000 > budgets['LATENCY_BUDGET_MS']:
+        exceeded.append('latency')
+    level = logging.WARNING if exceeded else logging.INFO
+    if not logger.isEnabledFor(level):
+        return exceeded
+    record = {
+        'method': request.method,
+        'path': request.path,
+        'route': route,
+        'status': response.status_code,
+        'queries': metrics.queries,
+        'db_ms': round(metrics.db_time * 1000, 2),
+        **{f'{name}_ms': round(seconds * 1000, 2) for name, seconds in metrics.timings.items()},
+        'total_ms': round(total * 1000, 2),
+        'budget_exceeded': exceeded,
+    }
+    logger.log(level, json.dumps(record), extra={'request_metrics': record})
+    return exceeded
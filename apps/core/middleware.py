@@ -1,5 +1,10 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from django.utils.deprecation import MiddlewareMixin
 
+from . import metrics, prometheus
+
 
 class CsrfExemptApiMiddleware(MiddlewareMixin):
     """
@@ -15,3 +20,73 @@ class CsrfExemptApiMiddleware(MiddlewareMixin):
             setattr(request, '_dont_enforce_csrf_checks', True)
         return None
 
+
+class AsgiUrlconfMiddleware(MiddlewareMixin):
+    """
+    Route requests served by the ASGI handler (`taskmanager.asgi`) through
+    `ASGI_ROOT_URLCONF`, whose hot endpoints are async views. Requests of
+    the WSGI handler keep `ROOT_URLCONF`.
+    """
+    
+    def process_request(self, request):
+        if isinstance(request, ASGIRequest):
+            request.urlconf = settings.ASGI_ROOT_URLCONF
+        return None
+
+
+class RequestMetricsMiddleware:
+    """
+    Per-request query count, database time and the `auth` and `serialize`
+    timings, sent as a `Server-Timing` header and logged as one JSON line
+    by the `apps.core.metrics` logger: INFO, or WARNING when the request
+    is over its query or latency budget (see `REQUEST_METRICS`). They are
+    also added to the per-route counters of `/api/metrics/` (`PROMETHEUS`).
+    
+    Queries are counted by an execute wrapper on every connection, so it
+    works with DEBUG off. Put it first in MIDDLEWARE so `total` covers the
+    other middleware. For streaming responses the figures stop at the
+    first byte.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.options = metrics.metrics_settings()
+        self.prometheus = prometheus.prometheus_settings()['ENABLED']
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.options['ENABLED']:
+            return self.get_response(request)
+        current, token = metrics.activate()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        return self.finish(request, response, current)
+    
+    async def __acall__(self, request):
+        if not self.options['ENABLED']:
+            return await self.get_response(request)
+        current, token = metrics.activate()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        return self.finish(request, response, current)
+    
+    def finish(self, request, response, current):
+        total = current.elapsed()
+        if self.options['SERVER_TIMING']:
+            response['Server-Timing'] = metrics.server_timing(current, total)
+        metrics.report(request, response, current, total, self.options)
+        if self.prometheus:
+            prometheus.store.observe_request(
+                metrics.route_name(request), request.method, response.status_code,
+                total, current.queries, current.db_time
+            )
+        return response
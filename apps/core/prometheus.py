@@ -0,0 +1,235 @@
+import atexit
+import bisect
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Prometheus' default latency buckets, in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+# Other methods are counted as `other`, so junk requests can't add label values.
+METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+
+# Exposed metrics, in output order: name -> (type, help)
+METRICS = {
+    'http_requests_total': ('counter', 'Requests served, by route, method and status code.'),
+    'http_request_duration_seconds': ('histogram', 'Request latency, by route and method.'),
+    'http_request_db_queries_total': ('counter', 'Database queries run by requests, by route.'),
+    'http_request_db_seconds_total': ('counter', 'Time requests spent in the database, by route.'),
+    'cache_requests_total': ('counter', 'Cache lookups, by cache and result.'),
+    'cache_hit_ratio': ('gauge', 'Hits over lookups of each cache since its processes started.'),
+}
+
+
+def prometheus_settings():
+    options = getattr(settings, 'PROMETHEUS', {})
+    return {
+        'ENABLED': options.get('ENABLED', True),
+        'DIRECTORY': options.get('DIRECTORY'),
+        'FLUSH_INTERVAL': options.get('FLUSH_INTERVAL', 1.0),
+        'BUCKETS': tuple(options.get('BUCKETS', DEFAULT_BUCKETS)),
+    }
+
+
+class MetricsStore:
+    """
+    Request counters and latency histograms of this process, merged with
+    those of the host's other worker processes when exposed.
+
+    Each process owns one file in `directory`, named after its pid and a
+    random suffix so a recycled pid never takes over a dead worker's
+    counts, and a daemon thread rewrites it atomically at most every
+    `flush_interval` seconds: processes share nothing and take no lock on
+    each other. `collect()` sums the files of every process, including
+    those that exited, so totals never go backwards when a worker is
+    replaced; empty the directory when the service starts. Without a
+    directory only this process is reported.
+
+    Cache hits and misses are not counted here: the hit/miss counters of
+    the caches passed to `register_cache` are copied when writing.
+    """
+
+    def __init__(self, directory=None, flush_interval=1.0, buckets=DEFAULT_BUCKETS):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.buckets = tuple(sorted(buckets))
+        self.caches = {}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._reset()
+        # A forked worker starts from zero with a file of its own.
+        os.register_at_fork(after_in_child=self._reset)
+
+    @classmethod
+    def from_settings(cls):
+        options = prometheus_settings()
+        return cls(
+            directory=options['DIRECTORY'],
+            flush_interval=options['FLUSH_INTERVAL'],
+            buckets=options['BUCKETS'],
+        )
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.counters = defaultdict(float)
+        # (name, labels) -> [observations per bucket..., above the last bucket, sum]
+        self.histograms = {}
+        self.path = None
+        if self.directory:
+            self.path = os.path.join(self.directory, f'{os.getpid()}-{uuid.uuid4().hex[:8]}.json')
+        self._dirty = False
+        self._flusher = None
+
+    def register_cache(self, name, cache):
+        """Report `cache.hits` and `cache.misses` as `cache_requests_total{cache=name}`."""
+        self.caches[name] = cache
+
+    def observe_request(self, route, method, status, seconds, queries, db_time):
+        """Count one request of the URL named `route` (None when no URL matched)."""
+        route = route or 'unmatched'
+        method = method if method in METHODS else 'other'
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counters[('http_requests_total', (('method', method), ('route', route), ('status', str(status))))] += 1
+            self.counters[('http_request_db_queries_total', (('route', route),))] += queries
+            self.counters[('http_request_db_seconds_total', (('route', route),))] += db_time
+            self._observe('http_request_duration_seconds', (('method', method), ('route', route)), index, seconds)
+            self._changed()
+
+    def _observe(self, name, labels, index, value):
+        series = self.histograms.get((name, labels))
+        if series is None:
+            series = self.histograms[(name, labels)] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[index] += 1
+        series[-1] += value
+
+    def _changed(self):
+        self._dirty = True
+        if self._flusher is None and self.path is not None:
+            self._flusher = threading.Thread(target=self._run_flusher, name='metrics-flusher', daemon=True)
+            self._flusher.start()
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                self.flush()
+
+    def snapshot(self):
+        """This process's series, as written to its file."""
+        with self._lock:
+            counters = [[name, labels, value] for (name, labels), value in self.counters.items()]
+            histograms = [
+                [name, labels, list(self.buckets), series[:-1], series[-1]]
+                for (name, labels), series in self.histograms.items()
+            ]
+        for cache_name, cache in self.caches.items():
+            for result, value in (('hit', cache.hits), ('miss', cache.misses)):
+                counters.append(['cache_requests_total', (('cache', cache_name), ('result', result)), value])
+        return {'counters': counters, 'histograms': histograms}
+
+    def flush(self):
+        """Write this process's file."""
+        if self.path is None:
+            return
+        self._dirty = False
+        data = self.snapshot()
+        temporary = f'{self.path}.tmp'
+        with self._flush_lock:
+            try:
+                with open(temporary, 'w') as f:
+                    json.dump(data, f)
+                os.replace(temporary, self.path)
+            except OSError:
+                logger.warning('Could not write the metrics of this process to %s', self.path, exc_info=True)
+
+    def collect(self):
+        """Counters and histograms summed over every process writing to `directory`."""
+        snapshots = [self.snapshot()]
+        if self.directory and os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith('.json') or entry.path == self.path:
+                    continue
+                try:
+                    with open(entry.path) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    # Removed since the scan
+                    continue
+        counters = defaultdict(float)
+        histograms = {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot['counters']:
+                counters[(name, _labels(labels))] += value
+            for name, labels, buckets, counts, total in snapshot['histograms']:
+                series = histograms.setdefault((name, _labels(labels)), {'buckets': defaultdict(int), 'sum': 0.0})
+                for bound, count in zip(buckets + [math.inf], counts):
+                    series['buckets'][bound] += count
+                series['sum'] += total
+        return counters, histograms
+
+    def render(self):
+        """Every process's metrics in the Prometheus text format (0.0.4)."""
+        counters, histograms = self.collect()
+        lookups = defaultdict(lambda: [0, 0])
+        for (name, labels), value in counters.items():
+            if name == 'cache_requests_total':
+                lookups[dict(labels)['cache']][dict(labels)['result'] == 'miss'] += value
+        gauges = {
+            ('cache_hit_ratio', (('cache', cache_name),)): hits / (hits + misses) if hits + misses else 0.0
+            for cache_name, (hits, misses) in lookups.items()
+        }
+
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            if kind == 'histogram':
+                for (series_name, labels), series in sorted(histograms.items()):
+                    if series_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in sorted(series['buckets'].items()):
+                        cumulative += count
+                        le = '+Inf' if bound == math.inf else repr(float(bound))
+                        lines.append(f'{name}_bucket{_format_labels(labels + (("le", le),))} {cumulative}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(series["sum"])}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+            else:
+                values = gauges if kind == 'gauge' else counters
+                for (series_name, labels), value in sorted(values.items()):
+                    if series_name == name:
+                        lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(pairs):
+    return tuple(tuple(pair) for pair in pairs)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+store = MetricsStore.from_settings()
+atexit.register(store.flush)
@@ -0,0 +1,85 @@
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .metrics import timing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` producing the same bytes through orjson when it is
+    installed: compact UTF-8, datetimes encoded natively (UTC as `Z`), and
+    everything orjson doesn't know (Decimal, lazy strings, querysets, ...)
+    handed to DRF's encoder. Indented output, `ensure_ascii`/non-compact
+    settings and data orjson rejects (non-string keys, integers over 64
+    bits) fall back to the stock renderer.
+
+    Floats are the one difference: orjson spells exponents `1e16` where the
+    stdlib writes `1e+16`, and NaN renders as `null` instead of failing.
+    """
+    default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timing('serialize'):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.default, option=orjson.OPT_UTC_Z)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same strict-javascript-subset escaping as JSONRenderer
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    `text/event-stream` for the change feed. The stream itself is a
+    `StreamingHttpResponse`; this only renders error responses (401, ...),
+    as an `error` event an `EventSource` can read.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        payload = json.dumps(data, cls=JSONEncoder, separators=(',', ':'))
+        return f'event: error\ndata: {payload}\n\n'.encode('utf-8')
+
+
+class PrometheusRenderer(BaseRenderer):
+    """
+    Prometheus text exposition format for `/api/metrics/`. Error responses
+    (401, 403) are rendered as comment lines.
+    """
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not isinstance(data, str):
+            data = ''.join(f'# {key}: {value}\n' for key, value in data.items())
+        return data.encode('utf-8')
@@ -0,0 +1,228 @@
+import hashlib
+import threading
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from .conditional import query_signature
+
+# Headers of a cached response that are replayed on a hit.
+CACHED_HEADERS = ('ETag', 'Last-Modified')
+
+
+class ResponseCache:
+    """
+    Rendered GET responses per user, in a Django cache alias.
+
+    Entries are keyed on the user, the user's current version and the
+    request (path, normalized query string, negotiated media type). Every
+    write of the user's data bumps the version, so all of their entries are
+    invalidated with one `incr` and simply age out of the backend.
+
+    With the default local-memory backend each worker has its own entries
+    and versions; a shared backend (Redis, Memcached) makes a write in one
+    worker invalidate every worker.
+    """
+
+    # Local hit/miss counts are added to the shared counters this often.
+    flush_every = 100
+
+    def __init__(self, alias='default', timeout=300):
+        self.alias = alias
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._pending = [0, 0]
+
+    @classmethod
+    def from_settings(cls):
+        options = getattr(settings, 'RESPONSE_CACHE', {})
+        return cls(
+            alias=options.get('ALIAS', 'default'),
+            timeout=options.get('TIMEOUT', 300),
+        )
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def enabled(self):
+        return self.timeout > 0
+
+    def version_key(self, user_id):
+        return f'resp:v:{user_id}'
+
+    def get_version(self, user_id):
+        key = self.version_key(user_id)
+        version = self.cache.get(key)
+        if version is None:
+            # Start from the clock, so a version evicted from the backend never
+            # restarts at a value that older entries were stored under.
+            self.cache.add(key, time.time_ns(), None)
+            version = self.cache.get(key)
+        return version
+
+    async def aget_version(self, user_id):
+        key = self.version_key(user_id)
+        version = await self.cache.aget(key)
+        if version is None:
+            await self.cache.aadd(key, time.time_ns(), None)
+            version = await self.cache.aget(key)
+        return version
+
+    def bump(self, user_ids):
+        for user_id in user_ids:
+            try:
+                self.cache.incr(self.version_key(user_id))
+            except ValueError:
+                self.cache.add(self.version_key(user_id), time.time_ns(), None)
+
+    def key(self, request, version):
+        signature = urlencode(query_signature(request))
+        digest = hashlib.sha1(
+            f'{request.path}?{signature}|{request.accepted_media_type}'.encode('utf-8')
+        ).hexdigest()
+        return f'resp:{request.user.pk}:{version}:{digest}'
+
+    def get(self, key):
+        entry = self.cache.get(key)
+        self.record(entry is not None)
+        return entry
+
+    async def aget(self, key):
+        entry = await self.cache.aget(key)
+        self.record(entry is not None)
+        return entry
+
+    def set(self, key, response):
+        self.cache.set(key, {
+            'content': response.content,
+            'content_type': response['Content-Type'],
+            'headers': {header: response[header] for header in CACHED_HEADERS if header in response},
+        }, self.timeout)
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._pending[0 if hit else 1] += 1
+            if sum(self._pending) < self.flush_every:
+                return
+            pending, self._pending = self._pending, [0, 0]
+        self._add_shared(*pending)
+
+    def flush_stats(self):
+        with self._lock:
+            pending, self._pending = self._pending, [0, 0]
+        self._add_shared(*pending)
+
+    def _add_shared(self, hits, misses):
+        for name, value in (('hits', hits), ('misses', misses)):
+            if not value:
+                continue
+            key = f'resp:stats:{name}'
+            try:
+                self.cache.incr(key, value)
+            except ValueError:
+                if not self.cache.add(key, value, None):
+                    self.cache.incr(key, value)
+
+    def stats(self):
+        """Hit/miss counts of this process."""
+        with self._lock:
+            return _ratio(self.hits, self.misses)
+
+    def shared_stats(self):
+        """Hit/miss counts flushed by every process using the backend."""
+        values = self.cache.get_many(['resp:stats:hits', 'resp:stats:misses'])
+        return _ratio(values.get('resp:stats:hits', 0), values.get('resp:stats:misses', 0))
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+            self._pending = [0, 0]
+        self.cache.delete_many(['resp:stats:hits', 'resp:stats:misses'])
+
+
+def _ratio(hits, misses):
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / lookups if lookups else 0.0,
+    }
+
+
+response_cache = ResponseCache.from_settings()
+
+
+def invalidate_users(user_ids, using=DEFAULT_DB_ALIAS):
+    """
+    Bump the users' versions now, so the writing request never reads its
+    own stale entries, and again on commit, so a response cached by another
+    request from the pre-commit data is dropped too.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    response_cache.bump(user_ids)
+    transaction.on_commit(lambda: response_cache.bump(user_ids), using=using)
+
+
+class ResponseCacheMixin:
+    """
+    Serve GET from `response_cache` for authenticated users. Only
+    `cached_formats` are stored (not the browsable API, whose pages carry
+    per-request tokens). Hits still answer `If-None-Match` and
+    `If-Modified-Since` from the stored validators. `X-Cache` tells
+    whether the response was a HIT or a MISS.
+    """
+
+    cached_formats = ('json',)
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return super().get(request, *args, **kwargs)
+        key = response_cache.key(request, response_cache.get_version(request.user.pk))
+        entry = response_cache.get(key)
+        if entry is not None:
+            return self.cached_response(request, entry)
+
+        return self.store(key, super().get(request, *args, **kwargs))
+
+    def store(self, key, response):
+        """Cache a successful response once it is rendered."""
+        if isinstance(response, Response) and response.status_code == 200:
+            response['X-Cache'] = 'MISS'
+            response.add_post_render_callback(lambda rendered: response_cache.set(key, rendered))
+        return response
+
+    def is_cacheable(self, request):
+        return (
+            response_cache.enabled
+            and request.method == 'GET'
+            and request.user.is_authenticated
+            and request.accepted_renderer.format in self.cached_formats
+        )
+
+    def cached_response(self, request, entry):
+        headers = entry['headers']
+        last_modified = parse_http_date_safe(headers.get('Last-Modified', ''))
+        response = get_conditional_response(request, etag=headers.get('ETag'), last_modified=last_modified)
+        if response is None:
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        for header, value in headers.items():
+            response[header] = value
+        response['X-Cache'] = 'HIT'
+        return response
@@ -0,0 +1,269 @@
+from operator import attrgetter, itemgetter
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ObjectDoesNotExist
+from rest_framework import fields, relations, serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.settings import api_settings
+
+from . import metrics
+
+
+class CompiledRepresentationMixin:
+    """
+    Read-optimized `to_representation()` for model serializers.
+
+    On first use the readable fields are compiled into `(name, getter)`
+    pairs. Plain model columns, foreign key ids and `ReadOnlyField`s over
+    model field paths are read with direct attribute access and converted
+    like their DRF field would; every other field goes through its own
+    `get_attribute()`/`to_representation()`. The output is the same as the
+    stock `Serializer.to_representation()`, without its per-value field
+    dispatch.
+
+    Besides model instances, the serializer represents the named tuples of
+    `rows()`: just the columns its fields read, fetched without building
+    model instances. Use them for reads only; writes still take instances.
+
+    Fields are compiled per serializer instance (once per request for a
+    list), so context-dependent fields and the active time zone are honoured.
+    Time spent here counts as the request's `serialize` timing.
+    """
+
+    def to_representation(self, instance):
+        current = metrics.current()
+        if current is not None and 'serialize' not in current.active:
+            with metrics.timing('serialize'):
+                return self.to_representation(instance)
+        compiled = self.__dict__.get('_compiled_fields')
+        if compiled is None:
+            compiled = self._compiled_fields = {}
+        accessors = compiled.get(type(instance))
+        if accessors is None:
+            accessors = compiled[type(instance)] = compile_fields(self, type(instance))
+        ret = {}
+        for name, get in accessors:
+            try:
+                ret[name] = get(instance)
+            except SkipField:
+                pass
+        return ret
+
+    def rows(self, queryset, *columns):
+        """`queryset` as named tuples of the columns this serializer reads, plus `columns`."""
+        return queryset.values_list(*dict.fromkeys([*row_columns(self), *columns]), named=True)
+
+
+def compile_fields(serializer, instance_type=None):
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if instance_type is not None and issubclass(instance_type, tuple) and hasattr(instance_type, '_fields'):
+        positions = {column: index for index, column in enumerate(instance_type._fields)}
+        return tuple(
+            (field.field_name, compile_row_field(field, model, positions))
+            for field in serializer._readable_fields
+        )
+    return tuple((field.field_name, compile_field(field, model)) for field in serializer._readable_fields)
+
+
+def row_columns(serializer):
+    """The `values_list()` lookups `serializer` needs to represent a row."""
+    model = serializer.Meta.model
+    columns = []
+    for field in serializer._readable_fields:
+        for column in _row_plan(field, model)[1]:
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def compile_field(field, model):
+    """A getter returning the representation of `field` for an instance."""
+    path = _model_path(model, field.source_attrs) if model is not None else None
+    if path is None:
+        return _generic(field)
+
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        # Subclasses that only customize validation (e.g. the queryset) qualify.
+        if (len(path) == 1 and path[0].many_to_one and field.pk_field is None
+                and type(field).get_attribute is relations.RelatedField.get_attribute
+                and type(field).to_representation is relations.PrimaryKeyRelatedField.to_representation):
+            return attrgetter(path[0].attname)
+        return _generic(field)
+
+    if type(field) is fields.ReadOnlyField:
+        return _chain(field, field.source_attrs)
+
+    if len(path) != 1 or path[0].is_relation:
+        return _generic(field)
+    convert = _converter(field)
+    if convert is None:
+        return _generic(field)
+    name = field.source_attrs[0]
+
+    def get(instance):
+        value = getattr(instance, name)
+        return None if value is None else convert(value)
+    return get
+
+
+def query_fields(serializer):
+    """
+    `(columns, relations)`: the `only()` names and the relations to
+    `select_related()` for what `serializer` reads from model instances.
+    Fields that aren't model field paths are left to load what they use.
+    """
+    model = serializer.Meta.model
+    columns, relations = [], []
+    for field in serializer._readable_fields:
+        try:
+            kind, lookups = _row_plan(field, model)
+        except ImproperlyConfigured:
+            continue
+        if kind == 'related' and field.source_attrs[0] not in relations:
+            relations.append(field.source_attrs[0])
+        columns.extend(lookup for lookup in lookups if lookup not in columns)
+    return columns, relations
+
+
+def compile_row_field(field, model, positions):
+    """A getter returning the representation of `field` for a `rows()` tuple."""
+    kind, columns = _row_plan(field, model)
+    try:
+        indexes = [positions[column] for column in columns]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Rows for {model.__name__} lack the {', '.join(columns)} column(s) of `{field.field_name}`."
+        )
+    if kind == 'related':
+        # The related row is missing when the foreign key is null: the
+        # field's own rules decide (default, allow_null or skipping the key).
+        fk_index, index = indexes
+
+        def get(row):
+            if row[fk_index] is None:
+                return field.get_attribute(None)
+            return row[index]
+        return get
+
+    index = indexes[0]
+    if kind == 'pk' or type(field) is fields.ReadOnlyField:
+        return itemgetter(index)
+    convert = _converter(field) or field.to_representation
+
+    def get(row):
+        value = row[index]
+        return None if value is None else convert(value)
+    return get
+
+
+def _row_plan(field, model):
+    """
+    How `field` is read from a row: `(kind, columns)` where kind is 'pk'
+    (a foreign key id), 'column' or 'related' (a column across a foreign
+    key, after the key itself).
+    """
+    path = _model_path(model, field.source_attrs)
+    if path and isinstance(field, relations.PrimaryKeyRelatedField):
+        if (len(path) == 1 and path[0].many_to_one and field.pk_field is None
+                and type(field).get_attribute is relations.RelatedField.get_attribute
+                and type(field).to_representation is relations.PrimaryKeyRelatedField.to_representation):
+            return 'pk', [path[0].attname]
+    elif path and type(field).get_attribute is fields.Field.get_attribute:
+        if len(path) == 1 and not path[0].is_relation:
+            return 'column', [path[0].attname]
+        if (len(path) == 2 and type(field) is fields.ReadOnlyField
+                and path[0].many_to_one and not path[1].is_relation):
+            return 'related', [path[0].attname, '__'.join(field.source_attrs)]
+    raise ImproperlyConfigured(
+        f"`{field.field_name}` of {type(field.parent).__name__} can't be read from a values row."
+    )
+
+
+def _model_path(model, attrs):
+    """The model fields `attrs` walks through, or None if any is not a model field."""
+    path = []
+    for attr in attrs:
+        if model is None:
+            return None
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        path.append(model_field)
+        model = model_field.related_model
+    return path
+
+
+def _chain(field, attrs):
+    """`ReadOnlyField` over model fields; unusual cases take the field's own lookup."""
+    def get(instance):
+        value = instance
+        try:
+            for attr in attrs:
+                value = getattr(value, attr)
+        except ObjectDoesNotExist:
+            return None
+        except AttributeError:
+            # e.g. a null foreign key on the way: defer to the field's rules
+            # (default, allow_null or skipping the key).
+            return field.get_attribute(instance)
+        return value
+    return get
+
+
+def _converter(field):
+    field_class = type(field)
+    if field_class in (fields.CharField, fields.EmailField, fields.SlugField, fields.URLField):
+        return lambda value: value if type(value) is str else str(value)
+    if field_class is fields.ChoiceField:
+        choices = field.choice_strings_to_values
+
+        def choice(value):
+            if type(value) is str:
+                return choices.get(value, value) if value else value
+            return choices.get(str(value), value)
+        return choice
+    if field_class is fields.IntegerField:
+        return int
+    if field_class is fields.DateTimeField:
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if output_format is None or output_format.lower() != fields.ISO_8601:
+            return None
+        timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+        if timezone is None:
+            return None
+
+        def iso_datetime(value):
+            if not value:
+                return None
+            if isinstance(value, str):
+                return value
+            if value.tzinfo is None:
+                value = field.enforce_timezone(value)
+            else:
+                value = value.astimezone(timezone)
+            value = value.isoformat()
+            if value.endswith('+00:00'):
+                value = value[:-6] + 'Z'
+            return value
+        return iso_datetime
+    return None
+
+
+def _generic(field):
+    def get(instance):
+        attribute = field.get_attribute(instance)
+        check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+        if check_for_none is None:
+            return None
+        return field.to_representation(attribute)
+    return get
+
+
+def uncompiled(serializer_class):
+    """`serializer_class` with DRF's stock `to_representation()`, for comparisons."""
+    return type(serializer_class.__name__, (serializer_class,), {
+        'to_representation': serializers.Serializer.to_representation,
+    })
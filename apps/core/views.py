@@ -1,7 +1,17 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.authentication import SessionAuthentication
+from rest_framework import status
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.urls import reverse
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from apps.accounts.authentication import StrictTokenAuthentication
+from apps.core import events, prometheus
+from apps.core.async_views import AsyncAPIViewMixin
+from apps.core.renderers import EventStreamRenderer, FastJSONRenderer, PrometheusRenderer
 
 class APIRootView(APIView):
     """
@@ -34,6 +44,13 @@ class APIRootView(APIView):
                     'update': '/api/projects/{id}/',
                     'delete': '/api/projects/{id}/',
                 },
+                'webhooks': {
+                    'list': '/api/webhooks/',
+                    'create': '/api/webhooks/',
+                    'detail': '/api/webhooks/{id}/',
+                },
+                'events': '/api/events/',
+                'metrics': '/api/metrics/',
                 'docs': {
                     'swagger': '/swagger/',
                     'redoc': '/redoc/',
@@ -41,4 +58,58 @@ class APIRootView(APIView):
             },
             'usage': 'Use the appropriate endpoints with authentication token',
             'note': 'Most endpoints require authentication. Include "Authorization: Token <your-token>" header'
-        })
\ No newline at end of file
+        })
+
+
+class EventStreamView(AsyncAPIViewMixin, APIView):
+    """
+    The user's change feed as Server-Sent Events: `task.created`,
+    `task.updated`, `task.toggled`, `task.deleted` and the `project.*`
+    equivalents, each with the ids of the objects written.
+
+    Served by the ASGI entry point only: a WSGI worker would hold a thread
+    per open stream.
+    """
+    permission_classes = [IsAuthenticated]
+    # Browsers' EventSource can't send an Authorization header: it relies on the session.
+    authentication_classes = [StrictTokenAuthentication, SessionAuthentication]
+    renderer_classes = [EventStreamRenderer, FastJSONRenderer]
+    
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('Last-Event-ID', openapi.IN_HEADER, type=openapi.TYPE_STRING,
+                              description="Resume after this event id (sent by EventSource on reconnect)"),
+            openapi.Parameter('last_event_id', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="Same as the Last-Event-ID header"),
+        ],
+        responses={200: 'text/event-stream', 501: 'Not served by the ASGI entry point'}
+    )
+    async def get(self, request, format=None):
+        if not isinstance(request._request, ASGIRequest):
+            return Response(
+                {"error": "The event stream is only served through the ASGI application (taskmanager.asgi)."},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        last_event_id = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+        response = StreamingHttpResponse(
+            events.event_stream(request.user.pk, last_event_id), content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class MetricsView(APIView):
+    """
+    Request counts, latency histograms, status codes, database queries and
+    cache hit ratios per route, summed over every worker process on the
+    host, in the Prometheus text format. Staff only: scrape it with a staff
+    user's token (`authorization: {type: Token, credentials: ...}`).
+    """
+    permission_classes = [IsAdminUser]
+    renderer_classes = [PrometheusRenderer]
+    
+    @swagger_auto_schema(responses={200: 'text/plain; version=0.0.4'})
+    def get(self, request, format=None):
+        return Response(prometheus.store.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
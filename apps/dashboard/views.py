@@ -5,21 +5,20 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 import json
 from apps.tasks.models import Task
-from apps.projects.models import Project
+from apps.tasks.stats import get_summary
+
+# Tasks shown on the dashboard; the rest are reached through the API.
+DASHBOARD_TASK_LIMIT = 50
 
 @login_required
 def dashboard(request):
     """Simple user dashboard for task management"""
-    tasks = Task.objects.filter(user=request.user)
-    projects = Project.objects.filter(user=request.user)
+    summary = get_summary(request.user)
     
-    context = {
-        'tasks': tasks,
-        'projects': projects,
-        'total_tasks': tasks.count(),
-        'completed_tasks': tasks.filter(status='completed').count(),
-        'pending_tasks': tasks.filter(status='pending').count(),
-    }
+    context = dict(
+        summary,
+        tasks=Task.objects.filter(user=request.user).order_by('-created_at')[:DASHBOARD_TASK_LIMIT],
+    )
     return render(request, 'dashboard/home.html', context)
 
 @csrf_exempt
@@ -21,6 +21,7 @@ class ProjectAdmin(admin.ModelAdmin):
     
     readonly_fields = ('created_at', 'updated_at', 'task_count_display', 'completed_tasks_display')
     raw_id_fields = ('user',)
+    list_select_related = ('user',)
     list_per_page = 25
     
     def user_email(self, obj):
@@ -29,20 +30,22 @@ class ProjectAdmin(admin.ModelAdmin):
     user_email.admin_order_field = 'user__email'
     
     def task_count(self, obj):
-        return obj.tasks.count()
+        return obj.task_count
     task_count.short_description = 'Total Tasks'
+    task_count.admin_order_field = 'task_count'
     
     def completed_tasks_count(self, obj):
-        return obj.tasks.filter(status='completed').count()
+        return obj.completed_count
     completed_tasks_count.short_description = 'Completed'
+    completed_tasks_count.admin_order_field = 'completed_count'
     
     def task_count_display(self, obj):
-        return f"{obj.tasks.count()} total tasks"
+        return f"{obj.task_count} total tasks"
     task_count_display.short_description = 'Task Count'
     
     def completed_tasks_display(self, obj):
-        completed = obj.tasks.filter(status='completed').count()
-        total = obj.tasks.count()
+        completed = obj.completed_count
+        total = obj.task_count
         if total > 0:
             percentage = (completed / total) * 100
             return f"{completed}/{total} tasks completed ({percentage:.1f}%)"
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from apps.core.response_cache import invalidate_users
+from apps.projects.models import Project
+
+
+class Command(BaseCommand):
+    help = "Find projects whose stored task counters drifted from their tasks and fix them."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--dry-run', action='store_true', help="Only report the drifted projects.")
+
+    def handle(self, *args, **options):
+        projects = Project.objects.using(options['database'])
+        with transaction.atomic(using=options['database']):
+            drifted = list(
+                projects.drifted().order_by('pk').values_list(
+                    'pk', 'task_count', 'completed_count', 'actual_task_count', 'actual_completed_count'
+                )
+            )
+            for pk, total, completed, actual_total, actual_completed in drifted:
+                self.stdout.write('Project %d: %d/%d stored, %d/%d counted' % (
+                    pk, completed, total, actual_completed, actual_total))
+            if drifted and not options['dry_run']:
+                fixed = projects.filter(pk__in=[row[0] for row in drifted])
+                fixed.recount_tasks()
+                invalidate_users(set(fixed.values_list('user_id', flat=True)), using=options['database'])
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('All project counters are correct.'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING('%d projects have drifted counters.' % len(drifted)))
+        else:
+            self.stdout.write(self.style.SUCCESS('Fixed the counters of %d projects.' % len(drifted)))
@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-18 06:08
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_tasks(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    Task = apps.get_model('tasks', 'Task')
+    counts = (
+        Task.objects.filter(project=models.OuterRef('pk'))
+        .order_by()
+        .values('project')
+        .annotate(
+            total=models.Count('id'),
+            completed=models.Count('id', filter=models.Q(status='completed')),
+        )
+    )
+    Project.objects.using(schema_editor.connection.alias).update(
+        task_count=Coalesce(models.Subquery(counts.values('total')), 0),
+        completed_count=Coalesce(models.Subquery(counts.values('completed')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_alter_project_user_project_project_user_created_idx'),
+        ('tasks', '0004_task_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_tasks, migrations.RunPython.noop),
+    ]
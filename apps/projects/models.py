@@ -1,23 +1,81 @@
 from django.db import models
 from django.conf import settings
+from django.db.models.functions import Coalesce
+
+class ProjectQuerySet(models.QuerySet):
+    def _task_counts(self):
+        """Total and completed task counts of `OuterRef('pk')`, from one conditional aggregate."""
+        Task = self.model._meta.get_field('tasks').related_model
+        counts = (
+            Task.objects.filter(project=models.OuterRef('pk'))
+            .order_by()
+            .values('project')
+            .annotate(
+                total=models.Count('id'),
+                completed=models.Count('id', filter=models.Q(status='completed')),
+            )
+        )
+        return (
+            Coalesce(models.Subquery(counts.values('total')), 0),
+            Coalesce(models.Subquery(counts.values('completed')), 0),
+        )
+    
+    def counted_tasks(self):
+        """Annotate `actual_task_count` and `actual_completed_count` from the task table."""
+        total, completed = self._task_counts()
+        return self.annotate(actual_task_count=total, actual_completed_count=completed)
+    
+    def drifted(self):
+        """Projects whose stored counters disagree with their tasks."""
+        return self.counted_tasks().exclude(
+            task_count=models.F('actual_task_count'),
+            completed_count=models.F('actual_completed_count'),
+        )
+    
+    def recount_tasks(self):
+        """Overwrite the counters of every project in the queryset with exact counts."""
+        total, completed = self._task_counts()
+        return self.update(task_count=total, completed_count=completed)
+    
+    def apply_task_deltas(self, deltas):
+        """
+        Add `{project_id: (total, completed)}` deltas to the counters, with
+        one UPDATE per distinct delta. Projects are updated in id order so
+        concurrent writers lock rows in the same order.
+        """
+        by_delta = {}
+        for project_id in sorted(project_id for project_id in deltas if project_id is not None):
+            if deltas[project_id] != (0, 0):
+                by_delta.setdefault(deltas[project_id], []).append(project_id)
+        for (total, completed), project_ids in by_delta.items():
+            changes = {}
+            if total:
+                changes['task_count'] = models.F('task_count') + total
+            if completed:
+                changes['completed_count'] = models.F('completed_count') + completed
+            self.filter(pk__in=project_ids).update(**changes)
+
 
 class Project(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='projects')
+    # Covered by `project_user_created_idx`.
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='projects', db_index=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized from the project's tasks and kept in step by every Task
+    # write path (see `apps.tasks.models.TaskQuerySet`); repaired with
+    # `manage.py reconcile_project_counts` if they ever drift.
+    task_count = models.IntegerField(default=0, editable=False)
+    completed_count = models.IntegerField(default=0, editable=False)
+    
+    objects = ProjectQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id'], name='project_user_created_idx'),
+        ]
     
     def __str__(self):
         return self.name
-    
-    @property
-    def task_count(self):
-        return self.tasks.count()
-    
-    @property
-    def completed_tasks(self):
-        return self.tasks.filter(status='completed').count()
\ No newline at end of file
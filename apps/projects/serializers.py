@@ -1,14 +1,18 @@
 from rest_framework import serializers
+from apps.core.fieldsets import FieldsetSerializerMixin
+from apps.core.serialization import CompiledRepresentationMixin
 from .models import Project
+from apps.tasks.models import Task
+from apps.tasks.pagination import ProjectTaskPagination
 from apps.tasks.serializers import TaskSerializer
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(FieldsetSerializerMixin, CompiledRepresentationMixin, serializers.ModelSerializer):
     task_count = serializers.ReadOnlyField()
-    completed_tasks = serializers.ReadOnlyField()
+    completed_tasks = serializers.ReadOnlyField(source='completed_count')
     
     class Meta:
         model = Project
-        fields = '__all__'
+        fields = ('id', 'task_count', 'completed_tasks', 'name', 'description', 'created_at', 'updated_at', 'user')
         read_only_fields = ('user', 'created_at', 'updated_at', 'task_count', 'completed_tasks')
     
     def create(self, validated_data):
@@ -16,7 +20,15 @@ class ProjectSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 class ProjectDetailSerializer(ProjectSerializer):
-    tasks = TaskSerializer(many=True, read_only=True)
+    """
+    Project with a bounded slice of its tasks.
+    
+    Only `tasks_page_size` tasks (20 by default, 100 at most) are embedded,
+    optionally filtered by `tasks_status`; `tasks_next` links to the
+    following slice via `tasks_cursor`.
+    """
+    tasks = serializers.SerializerMethodField()
+    tasks_next = serializers.SerializerMethodField()
     
     class Meta(ProjectSerializer.Meta):
         # `ProjectSerializer.Meta.fields` may be a string ('__all__') or an
@@ -25,4 +37,29 @@ class ProjectDetailSerializer(ProjectSerializer):
         if isinstance(base, str):
             fields = base
         else:
-            fields = list(base) + ['tasks']
\ No newline at end of file
+            fields = list(base) + ['tasks', 'tasks_next']
+    
+    def get_task_paginator(self, instance):
+        if getattr(self, '_task_paginator', (None, None))[0] is not instance:
+            request = self.context['request']
+            queryset = instance.tasks.all()
+            status = request.query_params.get('tasks_status')
+            if status:
+                valid_statuses = [choice[0] for choice in Task.STATUS_CHOICES]
+                if status not in valid_statuses:
+                    raise serializers.ValidationError({
+                        'tasks_status': f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+                    })
+                queryset = queryset.filter(status=status)
+            paginator = ProjectTaskPagination()
+            # Read as rows of the serialized columns, not Task instances
+            paginator.paginate_queryset(TaskSerializer(context=self.context).rows(queryset), request)
+            self._task_paginator = (instance, paginator)
+        return self._task_paginator[1]
+    
+    def get_tasks(self, instance):
+        paginator = self.get_task_paginator(instance)
+        return TaskSerializer(paginator.page, many=True, context=self.context).data
+    
+    def get_tasks_next(self, instance):
+        return self.get_task_paginator(instance).get_next_link()
@@ -1,19 +1,28 @@
-from rest_framework import generics, permissions
+from django.db.models import F, Max, OuterRef, Subquery
+from rest_framework import generics, permissions, filters
+from apps.core.conditional import ConditionalRequestMixin, make_etag, query_signature
+from apps.core.fieldsets import FIELDSET_PARAMS, SparseFieldsetMixin
+from apps.core.response_cache import ResponseCacheMixin
+from apps.tasks.models import Task
 from .models import Project
 from .serializers import ProjectSerializer, ProjectDetailSerializer
 from apps.accounts.permissions import IsOwner
 
-class ProjectListCreateView(generics.ListCreateAPIView):
+class ProjectListCreateView(ResponseCacheMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['name', 'created_at', 'task_count', 'completed_tasks']
     
     def get_queryset(self):
-        return Project.objects.filter(user=self.request.user)
+        # `completed_tasks` keeps its API name for `?ordering=`.
+        queryset = Project.objects.filter(user=self.request.user).alias(completed_tasks=F('completed_count'))
+        return self.sparse_queryset(queryset)
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProjectDetailView(ConditionalRequestMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated, IsOwner]
     
     def get_serializer_class(self):
@@ -22,4 +31,29 @@ class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
         return ProjectSerializer
     
     def get_queryset(self):
-        return Project.objects.filter(user=self.request.user)
\ No newline at end of file
+        # Newest change among the nested tasks, for the validators
+        tasks_modified = (
+            Task.objects.filter(project=OuterRef('pk'))
+            .order_by()
+            .values('project')
+            .annotate(modified=Max('updated_at'))
+            .values('modified')
+        )
+        queryset = Project.objects.filter(user=self.request.user).annotate(tasks_modified=Subquery(tasks_modified))
+        # Ownership and the validators need these beyond the requested fields
+        return self.sparse_queryset(queryset, ('user', 'updated_at', 'task_count', 'completed_count'))
+    
+    def get_object(self):
+        if not hasattr(self, '_project'):
+            self._project = super().get_object()
+        return self._project
+    
+    def get_validators(self):
+        project = self.get_object()
+        etag = make_etag(
+            'project', project.pk, project.updated_at, project.task_count, project.completed_count,
+            project.tasks_modified,
+            query_signature(self.request, ('tasks_status', 'tasks_cursor', 'tasks_page_size') + FIELDSET_PARAMS),
+            self.request.accepted_renderer.format
+        )
+        return etag, max(filter(None, [project.updated_at, project.tasks_modified]))
@@ -0,0 +1,87 @@
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.response import Response
+from apps.core.async_views import AsyncAPIViewMixin
+from apps.core.response_cache import response_cache
+from .models import Task
+from .serializers import TaskSerializer
+from .views import TaskCompleteToggleView, TaskDetailView, TaskListCreateView
+
+# Async versions of the hot task endpoints, routed by `taskmanager.asgi_urls`
+# when the project is served through `taskmanager.asgi`. Reads use the async
+# ORM; writes reuse the sync views in a thread, so validation and the
+# counter bookkeeping stay in one place.
+
+
+class AsyncTaskListCreateView(AsyncAPIViewMixin, TaskListCreateView):
+    
+    async def get(self, request, *args, **kwargs):
+        key = None
+        if self.is_cacheable(request):
+            key = response_cache.key(request, await response_cache.aget_version(request.user.pk))
+            entry = await response_cache.aget(key)
+            if entry is not None:
+                return self.cached_response(request, entry)
+        
+        # django-filter validates `project` against the database
+        self.filtered_queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        response = await self.aevaluate_preconditions(request)
+        if response is None:
+            response = await self.alist(self.filtered_queryset)
+        return self.store(key, response) if key else response
+    
+    async def post(self, request, *args, **kwargs):
+        return await sync_to_async(super().post)(request, *args, **kwargs)
+    
+    async def aget_validators(self):
+        queryset, aggregates = self.get_validator_aggregates(self.filtered_queryset)
+        return self.validators_from_state(await queryset.aaggregate(**aggregates))
+    
+    async def alist(self, queryset):
+        queryset = self.get_rows(queryset)
+        if self.paginator is None:
+            rows = [row async for row in queryset]
+            return Response(self.get_serializer(rows, many=True).data)
+        page = await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+
+class AsyncTaskDetailView(AsyncAPIViewMixin, TaskDetailView):
+    
+    async def get(self, request, *args, **kwargs):
+        self._task = await self.aget_object()
+        response = await self.aevaluate_preconditions(request)
+        if response is None:
+            response = Response(self.get_serializer(self._task).data)
+        return response
+    
+    async def aget_validators(self):
+        # The task is already loaded
+        return self.get_validators()
+    
+    async def put(self, request, *args, **kwargs):
+        return await sync_to_async(super().put)(request, *args, **kwargs)
+    
+    async def patch(self, request, *args, **kwargs):
+        return await sync_to_async(super().patch)(request, *args, **kwargs)
+    
+    async def delete(self, request, *args, **kwargs):
+        return await sync_to_async(super().delete)(request, *args, **kwargs)
+
+
+class AsyncTaskCompleteToggleView(AsyncAPIViewMixin, TaskCompleteToggleView):
+    
+    async def post(self, request, pk):
+        try:
+            task = await Task.objects.select_related('user', 'project').aget(pk=pk, user=request.user)
+        except Task.DoesNotExist:
+            return Response({"error": "Task not found"}, status=status.HTTP_404_NOT_FOUND)
+        
+        message = self.toggle(task)
+        await task.asave()
+        
+        serializer = TaskSerializer(task, context={'request': request})
+        return Response({
+            "message": message,
+            "task": serializer.data
+        })
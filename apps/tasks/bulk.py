@@ -0,0 +1,122 @@
+from django.utils import timezone
+
+from apps.projects.models import Project
+from .models import Task
+from .serializers import TaskSerializer
+
+# Upper bound on create + update + delete items in one bulk request.
+MAX_BULK_ITEMS = 1000
+BATCH_SIZE = 500
+
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def user_projects(user, items):
+    """Load, in one query, the user's projects referenced by `items` ({id: Project})."""
+    ids = {
+        _as_id(item.get('project'))
+        for item in items
+        if isinstance(item, dict) and item.get('project') is not None
+    }
+    ids.discard(None)
+    if not ids:
+        return {}
+    return {project.id: project for project in Project.objects.filter(user=user, id__in=ids)}
+
+
+def create_tasks(user, items, context):
+    """
+    Validate `items` with `TaskSerializer` and insert the valid ones with a
+    single `bulk_create`. Returns one result per item, in order.
+    """
+    now = timezone.now()
+    results = []
+    tasks = []
+    for index, item in enumerate(items):
+        serializer = TaskSerializer(data=item, context=context)
+        if not serializer.is_valid():
+            results.append({'index': index, 'status': 400, 'errors': serializer.errors})
+            continue
+        task = Task(user=user, **serializer.validated_data)
+        # bulk_create bypasses Task.save()
+        task.sync_completed_at(now)
+        tasks.append(task)
+        results.append({'index': index, 'status': 201, 'task': task})
+    Task.objects.bulk_create(tasks, batch_size=BATCH_SIZE)
+    return results
+
+
+def update_tasks(user, items, context):
+    """
+    Apply partial updates (`{"id": ..., <fields>}`) through `TaskSerializer`
+    validation, so completed tasks stay locked, then write every change with
+    one `bulk_update`. Returns one result per item, in order.
+    """
+    ids = {_as_id(item.get('id')) for item in items if isinstance(item, dict)}
+    ids.discard(None)
+    existing = {
+        task.id: task
+        for task in Task.objects.filter(user=user, id__in=ids).select_related('project')
+    }
+
+    now = timezone.now()
+    results = []
+    changed = {}
+    fields = {'updated_at', 'completed_at'}
+    for item in items:
+        task_id = _as_id(item.get('id')) if isinstance(item, dict) else None
+        if task_id is None:
+            results.append({'id': None, 'status': 400, 'errors': {'id': ['This field is required.']}})
+            continue
+        if task_id in changed:
+            results.append({'id': task_id, 'status': 400, 'errors': {'id': ['Duplicate update for this task.']}})
+            continue
+        task = existing.get(task_id)
+        if task is None:
+            results.append({'id': task_id, 'status': 404, 'errors': {'detail': 'Task not found'}})
+            continue
+
+        data = {key: value for key, value in item.items() if key != 'id'}
+        serializer = TaskSerializer(task, data=data, partial=True, context=context)
+        if not serializer.is_valid():
+            results.append({'id': task_id, 'status': 400, 'errors': serializer.errors})
+            continue
+        for attr, value in serializer.validated_data.items():
+            setattr(task, attr, value)
+            fields.add(attr)
+        task.user = user
+        task.sync_completed_at(now)
+        # bulk_update does not apply auto_now
+        task.updated_at = now
+        changed[task_id] = task
+        results.append({'id': task_id, 'status': 200, 'task': task})
+
+    if changed:
+        Task.objects.bulk_update(changed.values(), sorted(fields), batch_size=BATCH_SIZE)
+    return results
+
+
+def delete_tasks(user, ids):
+    """Delete the user's tasks among `ids` in one statement. Returns one result per id."""
+    wanted = {_as_id(task_id) for task_id in ids}
+    wanted.discard(None)
+    found = set(Task.objects.filter(user=user, id__in=wanted).values_list('id', flat=True))
+    if found:
+        Task.objects.filter(user=user, id__in=found).delete()
+
+    results = []
+    for task_id in ids:
+        task_id = _as_id(task_id)
+        if task_id is None:
+            results.append({'id': None, 'status': 400, 'errors': {'id': ['A valid integer is required.']}})
+        elif task_id in found:
+            found.discard(task_id)
+            results.append({'id': task_id, 'status': 204})
+        else:
+            results.append({'id': task_id, 'status': 404, 'errors': {'detail': 'Task not found'}})
+    return results
@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from rest_framework.renderers import BaseRenderer
+
+# Columns of an export, in order, and the queryset paths they are read from.
+EXPORT_FIELDS = (
+    ('id', 'id'),
+    ('title', 'title'),
+    ('description', 'description'),
+    ('status', 'status'),
+    ('priority', 'priority'),
+    ('due_date', 'due_date'),
+    ('project', 'project_id'),
+    ('project_name', 'project__name'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+    ('completed_at', 'completed_at'),
+)
+# Rows fetched per round trip; on PostgreSQL this is a server-side cursor.
+CHUNK_SIZE = 2000
+# Bytes buffered before a piece of the body is handed to the server.
+FLUSH_SIZE = 64 * 1024
+
+
+def _datetime(value):
+    """Format like DRF's DateTimeField (ISO 8601, UTC as `Z`)."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(dt_timezone.utc)
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def export_rows(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Yield export rows as tuples in `EXPORT_FIELDS` order, without building
+    model instances and without holding more than `chunk_size` rows.
+    """
+    paths = [path for name, path in EXPORT_FIELDS]
+    for row in queryset.values_list(*paths).iterator(chunk_size=chunk_size):
+        yield tuple(_datetime(value) if isinstance(value, datetime) else value for value in row)
+
+
+def stream_ndjson(rows):
+    names = [name for name, path in EXPORT_FIELDS]
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    buffer = []
+    size = 0
+    for row in rows:
+        line = encoder.encode(dict(zip(names, row))) + '\n'
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_SIZE:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def stream_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, path in EXPORT_FIELDS])
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= FLUSH_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Selects NDJSON exports (`?format=ndjson`); error bodies are one JSON line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+    stream = staticmethod(stream_ndjson)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return (json.dumps(data, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+class CSVRenderer(NDJSONRenderer):
+    """Selects CSV exports (`?format=csv`)."""
+    media_type = 'text/csv'
+    format = 'csv'
+    stream = staticmethod(stream_csv)
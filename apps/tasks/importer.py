@@ -0,0 +1,165 @@
+import codecs
+import csv
+import json
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
+
+from apps.projects.models import Project
+from .models import Task
+from .serializers import TaskSerializer
+
+BATCH_SIZE = 1000
+# Only the first errors are kept in the report; the rest are just counted.
+MAX_REPORTED_ERRORS = 100
+FORMATS = ('ndjson', 'csv')
+
+
+class ImportFormatError(Exception):
+    """The input cannot be read any further (e.g. it is not valid UTF-8)."""
+
+
+def decode_lines(chunks, encoding='utf-8'):
+    """Decode an iterable of byte lines/chunks incrementally, dropping a BOM."""
+    lines = codecs.iterdecode(chunks, encoding)
+    first = True
+    while True:
+        try:
+            line = next(lines)
+        except StopIteration:
+            return
+        except UnicodeDecodeError as exc:
+            raise ImportFormatError(f'Input is not valid {encoding}: {exc}')
+        if first:
+            line = line.lstrip('\ufeff')
+            first = False
+        yield line
+
+
+def parse_ndjson(lines):
+    """Yield `(line_number, row)` for every non-blank line; bad JSON yields the error instead."""
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            row = ValidationError({'non_field_errors': [f'Invalid JSON: {exc}']})
+        else:
+            if not isinstance(row, dict):
+                row = ValidationError({'non_field_errors': ['Expected a JSON object.']})
+        yield number, row
+
+
+def parse_csv(lines):
+    """
+    Yield `(record_number, row)` for every CSV record after the header.
+    Empty cells count as missing, so optional columns fall back to defaults.
+    """
+    reader = csv.DictReader(lines)
+    number = 0
+    while True:
+        number += 1
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            yield number, ValidationError({'non_field_errors': [f'Invalid CSV: {exc}']})
+            continue
+        yield number, {key: value for key, value in record.items() if key and value not in ('', None)}
+
+
+def parse(lines, format):
+    if format == 'csv':
+        return parse_csv(lines)
+    return parse_ndjson(lines)
+
+
+def guess_format(name='', content_type=''):
+    if content_type.split(';')[0].strip() in ('text/csv', 'application/csv') or name.lower().endswith('.csv'):
+        return 'csv'
+    return 'ndjson'
+
+
+class TaskImporter:
+    """
+    Validate rows with the `TaskSerializer` rules and insert them for `user`
+    with one `bulk_create` per batch, each batch in its own transaction.
+
+    Projects are referenced by name (`project_name`, or `project`) and
+    looked up once per distinct name; unknown names create the project.
+    `on_batch(report)` is called after every flushed batch.
+    """
+
+    def __init__(self, user, batch_size=BATCH_SIZE, on_batch=None):
+        self.user = user
+        self.batch_size = batch_size
+        self.on_batch = on_batch
+        self.projects = {}
+        # One serializer validates every row: its fields are only built once.
+        self.serializer = TaskSerializer()
+        self.report = {'processed': 0, 'imported': 0, 'failed': 0, 'projects_created': 0, 'errors': []}
+        self._pending = []
+        self.now = timezone.now()
+
+    def run(self, rows):
+        try:
+            for number, row in rows:
+                self.add(number, row)
+        finally:
+            self.flush()
+        return self.report
+
+    def add(self, number, row):
+        self.report['processed'] += 1
+        try:
+            if isinstance(row, ValidationError):
+                raise row
+            task = self.build(row)
+        except ValidationError as exc:
+            self.fail(number, as_serializer_error(exc))
+            return
+        self._pending.append(task)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def build(self, row):
+        row = dict(row)
+        project_name = row.pop('project_name', None) or row.pop('project', None)
+        row.pop('project', None)
+        data = self.serializer.run_validation(row)
+        task = Task(user=self.user, **data)
+        project_name = str(project_name).strip() if project_name is not None else ''
+        if len(project_name) > Project._meta.get_field('name').max_length:
+            raise ValidationError({'project_name': ['Ensure this field has no more than 200 characters.']})
+        if project_name:
+            task.project = self.project(project_name)
+        task.sync_completed_at(self.now)
+        return task
+
+    def project(self, name):
+        if name not in self.projects:
+            project = Project.objects.filter(user=self.user, name=name).order_by('created_at', 'id').first()
+            if project is None:
+                project = Project.objects.create(user=self.user, name=name)
+                self.report['projects_created'] += 1
+            self.projects[name] = project
+        return self.projects[name]
+
+    def fail(self, number, errors):
+        self.report['failed'] += 1
+        if len(self.report['errors']) < MAX_REPORTED_ERRORS:
+            self.report['errors'].append({'row': number, 'errors': errors})
+
+    def flush(self):
+        if not self._pending:
+            return
+        with transaction.atomic():
+            Task.objects.bulk_create(self._pending)
+        self.report['imported'] += len(self._pending)
+        self._pending = []
+        if self.on_batch is not None:
+            self.on_batch(self.report)
@@ -0,0 +1,100 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.tasks.models import Task
+from apps.tasks.reminders import ReminderScheduler, reminder_settings
+
+SEED_BATCH = 50000
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed millions of tasks and time the reminder scheduler: reminders/sec while a burst "
+        "of tasks enters the window and the cost of an idle tick, against a naive scan of every "
+        "task. The data is created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1000000, help="Tasks to seed.")
+        parser.add_argument('--due', type=int, default=20000,
+                            help="Of those, open tasks due within the reminder window.")
+        parser.add_argument('--users', type=int, default=1000, help="Owners the tasks are spread over.")
+
+    def handle(self, *args, **options):
+        if options['tasks'] < 1 or options['users'] < 1 or not 0 <= options['due'] <= options['tasks']:
+            raise CommandError('--tasks and --users must be positive and --due at most --tasks.')
+        scheduler = ReminderScheduler.from_settings()
+        now = timezone.now()
+        with transaction.atomic():
+            started = time.perf_counter()
+            self.seed(options, now, scheduler.window)
+            self.stdout.write('Seeded %d tasks in %.1f s' % (options['tasks'], time.perf_counter() - started))
+
+            started = time.perf_counter()
+            naive = self.naive_scan(now, scheduler)
+            naive_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            sent = scheduler.run_pending(now)
+            burst_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            idle = scheduler.run_pending(now)
+            idle_seconds = time.perf_counter() - started
+
+            if connection.vendor == 'sqlite':
+                sql, params = scheduler.due(now).values_list('id')[:scheduler.batch_size].query.sql_with_params()
+                with connection.cursor() as cursor:
+                    cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+                    plan = [row[-1] for row in cursor.fetchall()]
+            else:
+                plan = []
+            transaction.set_rollback(True)
+
+        if sent != naive or idle:
+            raise CommandError(f'The scheduler sent {sent} (+{idle}) reminders; the scan found {naive} due tasks.')
+        self.stdout.write('Window %d min, batches of %d' % (
+            reminder_settings()['WINDOW_MINUTES'], scheduler.batch_size))
+        self.stdout.write('naive scan     %8.3f s per tick (every task read)' % naive_seconds)
+        self.stdout.write('burst          %8d reminders in %.3f s: %.0f reminders/s' % (
+            sent, burst_seconds, sent / burst_seconds if burst_seconds else 0))
+        self.stdout.write('idle tick      %8.3f ms' % (idle_seconds * 1000))
+        for line in plan:
+            self.stdout.write('plan: ' + line)
+
+    def naive_scan(self, now, scheduler):
+        """What a cron job reading every task would find."""
+        low, high = now - scheduler.lookback, now + scheduler.window
+        rows = Task.objects.order_by().values_list('status', 'due_date').iterator(chunk_size=10000)
+        return sum(1 for status, due_date in rows if status != 'completed' and due_date and low < due_date <= high)
+
+    def seed(self, options, now, window):
+        rng = random.Random(0)
+        users = User.objects.bulk_create(
+            User(email=f'reminders-benchmark-{i}@example.com', name=f'Benchmark {i}')
+            for i in range(options['users'])
+        )
+        user_ids = [user.pk for user in users]
+        window_seconds = int(window.total_seconds())
+        year = 365 * 24 * 3600
+        remaining_due = options['due']
+        for start in range(0, options['tasks'], SEED_BATCH):
+            tasks = []
+            for i in range(start, min(start + SEED_BATCH, options['tasks'])):
+                if remaining_due:
+                    remaining_due -= 1
+                    status, due_date = 'pending', now + timedelta(seconds=rng.randint(1, window_seconds))
+                else:
+                    status = ('pending', 'in_progress', 'completed')[i % 3]
+                    # Outside the window: spread over a year either side, some without a due date.
+                    offset = rng.randint(window_seconds + 1, year) * rng.choice((-1, 1))
+                    due_date = None if i % 10 == 0 else now + timedelta(seconds=offset)
+                tasks.append(Task(title=f'Task {i}', user_id=user_ids[i % len(user_ids)], status=status,
+                                  due_date=due_date, completed_at=now if status == 'completed' else None))
+            Task.objects.bulk_create(tasks, batch_size=5000)
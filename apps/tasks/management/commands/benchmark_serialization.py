@@ -0,0 +1,92 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.accounts.models import User
+from apps.core.renderers import FastJSONRenderer
+from apps.core.serialization import uncompiled
+from apps.projects.models import Project
+from apps.projects.serializers import ProjectSerializer
+from apps.tasks.models import Task
+from apps.tasks.serializers import TaskSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark list serialization: DRF's stock serializer and JSONRenderer "
+        "against the compiled serializers and FastJSONRenderer, on in-memory rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help="Objects per list.")
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per variant; the best is kept.")
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['repeat'] < 1:
+            raise CommandError('--rows and --repeat must be positive.')
+        tasks, projects = self.build_rows(options['rows'])
+        for label, serializer_class, rows in [
+            ('Task', TaskSerializer, tasks),
+            ('Project', ProjectSerializer, projects),
+        ]:
+            stock = self.measure(uncompiled(serializer_class), JSONRenderer(), rows, options['repeat'])
+            fast = self.measure(serializer_class, FastJSONRenderer(), rows, options['repeat'])
+            if stock['body'] != fast['body']:
+                raise CommandError('%s output differs between the stock and compiled paths.' % label)
+            self.stdout.write(
+                '%-8s %d rows  stock %7.2f ms (serialize %6.2f + render %6.2f)  '
+                'fast %7.2f ms (serialize %6.2f + render %6.2f)  %.1fx' % (
+                    label, len(rows),
+                    stock['total'] * 1000, stock['serialize'] * 1000, stock['render'] * 1000,
+                    fast['total'] * 1000, fast['serialize'] * 1000, fast['render'] * 1000,
+                    stock['total'] / fast['total'],
+                )
+            )
+
+    def measure(self, serializer_class, renderer, rows, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = serializer_class(rows, many=True).data
+            serialized = time.perf_counter()
+            body = renderer.render({'count': len(rows), 'next': None, 'previous': None, 'results': data})
+            rendered = time.perf_counter()
+            run = {
+                'serialize': serialized - started,
+                'render': rendered - serialized,
+                'total': rendered - started,
+                'body': body,
+            }
+            if best is None or run['total'] < best['total']:
+                best = run
+        return best
+
+    def build_rows(self, count):
+        """Unsaved instances shaped like a `select_related('user', 'project')` page."""
+        now = timezone.now()
+        user = User(id=1, email='bench@example.com', name='Bench')
+        projects = [
+            Project(id=i, user=user, name=f'Project {i}', description='Planning – Q3 ✓',
+                    task_count=i * 3, completed_count=i, created_at=now, updated_at=now)
+            for i in range(1, count + 1)
+        ]
+        tasks = []
+        for i in range(1, count + 1):
+            completed = i % 3 == 0
+            tasks.append(Task(
+                id=i,
+                user=user,
+                project=projects[i % 10] if i % 4 else None,
+                title=f'Task {i} – naïve “quotes”',
+                description='Line one\nLine two' if i % 2 else '',
+                status='completed' if completed else ('in_progress' if i % 3 == 1 else 'pending'),
+                priority=('low', 'medium', 'high')[i % 3],
+                due_date=now + timedelta(days=i) if i % 5 else None,
+                created_at=now - timedelta(seconds=i, microseconds=i),
+                updated_at=now,
+                completed_at=now if completed else None,
+            ))
+        return tasks, projects
@@ -0,0 +1,103 @@
+import gc
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.core.renderers import FastJSONRenderer
+from apps.projects.models import Project
+from apps.tasks.models import Task
+from apps.tasks.serializers import TaskSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare reading a task list as model instances (select_related) with the "
+        "values_list rows the list views use: rows/sec and retained memory per row. "
+        "The benchmark data is created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help="Tasks to read.")
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per variant; the best is kept.")
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['repeat'] < 1:
+            raise CommandError('--rows and --repeat must be positive.')
+        with transaction.atomic():
+            user = self.build_rows(options['rows'])
+            queryset = Task.objects.filter(user=user).select_related('user', 'project')
+            results = {
+                'instances': self.measure(lambda: list(queryset.all()), options['repeat']),
+                'rows': self.measure(lambda: list(TaskSerializer().rows(queryset)), options['repeat']),
+            }
+            transaction.set_rollback(True)
+
+        if results['instances'].pop('body') != results['rows'].pop('body'):
+            raise CommandError('The rows and the model instances serialize differently.')
+        for name, result in results.items():
+            self.stdout.write(
+                '%-9s %d rows  fetch %9.0f rows/s  fetch+serialize %9.0f rows/s  %6.0f bytes/row' % (
+                    name, options['rows'], result['fetch_rate'], result['total_rate'], result['bytes_per_row'])
+            )
+        instances, rows = results['instances'], results['rows']
+        self.stdout.write('rows: %.1fx fetch, %.1fx fetch+serialize, %.0f%% of the memory per row' % (
+            rows['fetch_rate'] / instances['fetch_rate'],
+            rows['total_rate'] / instances['total_rate'],
+            100 * rows['bytes_per_row'] / instances['bytes_per_row'],
+        ))
+
+    def measure(self, fetch, repeat):
+        renderer = FastJSONRenderer()
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            objects = fetch()
+            fetched = time.perf_counter()
+            body = renderer.render(TaskSerializer(objects, many=True).data)
+            done = time.perf_counter()
+            if best is None or done - started < best[1] - best[0]:
+                best = (started, done, fetched, body)
+        started, done, fetched, body = best
+
+        # Memory is measured separately: tracing slows allocation down.
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            objects = fetch()
+            retained = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        count = len(objects)
+        return {
+            'fetch_rate': count / (fetched - started),
+            'total_rate': count / (done - started),
+            'bytes_per_row': retained / count,
+            'body': body,
+        }
+
+    def build_rows(self, count):
+        now = timezone.now()
+        user = User.objects.create_user(email='rows-benchmark@example.com', name='Rows Benchmark', password=None)
+        projects = Project.objects.bulk_create(
+            Project(user=user, name=f'Project {i}', description='Planning – Q3') for i in range(10)
+        )
+        Task.objects.bulk_create(
+            Task(
+                user=user,
+                project=projects[i % 10] if i % 4 else None,
+                title=f'Task {i} – naïve “quotes”',
+                description='Line one\nLine two' if i % 2 else '',
+                status=('pending', 'in_progress', 'completed')[i % 3],
+                completed_at=now if i % 3 == 2 else None,
+                priority=('low', 'medium', 'high')[i % 3],
+                due_date=now + timedelta(days=i) if i % 5 else None,
+            )
+            for i in range(count)
+        )
+        return user
@@ -0,0 +1,55 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks import importer
+
+
+class Command(BaseCommand):
+    help = "Import tasks for a user from an NDJSON or CSV file, streaming it in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for standard input.")
+        parser.add_argument('--user', required=True, help="Email of the user who will own the tasks.")
+        parser.add_argument('--format', choices=importer.FORMATS,
+                            help="Input format; guessed from the file extension by default.")
+        parser.add_argument('--batch-size', type=int, default=importer.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(email=options['user'])
+        except User.DoesNotExist:
+            raise CommandError('No user with email %s.' % options['user'])
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        path = options['path']
+        format = options['format'] or importer.guess_format(name=path)
+        task_importer = importer.TaskImporter(user, batch_size=options['batch_size'], on_batch=self.progress)
+        try:
+            stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        except OSError as exc:
+            raise CommandError(exc)
+        try:
+            task_importer.run(importer.parse(importer.decode_lines(stream), format))
+        except importer.ImportFormatError as exc:
+            raise CommandError('%s (%d rows imported before the error).' % (exc, task_importer.report['imported']))
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        report = task_importer.report
+        for error in report['errors']:
+            self.stderr.write('Row %d: %s' % (error['row'], error['errors']))
+        if report['failed'] > len(report['errors']):
+            self.stderr.write('... and %d more invalid rows.' % (report['failed'] - len(report['errors'])))
+        self.stdout.write(self.style.SUCCESS(
+            'Imported %d of %d rows (%d invalid, %d projects created).' % (
+                report['imported'], report['processed'], report['failed'], report['projects_created'])
+        ))
+
+    def progress(self, report):
+        self.stdout.write('%d rows processed, %d imported, %d invalid' % (
+            report['processed'], report['imported'], report['failed']))
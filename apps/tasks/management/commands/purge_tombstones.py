@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.tasks.models import Tombstone
+from apps.tasks.sync import sync_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the tombstones of deleted tasks and projects that are older than "
+        "SYNC['TOMBSTONE_RETENTION_DAYS']. Run it daily, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        deleted, _ = Tombstone.objects.using(options['database']).expired().delete()
+        self.stdout.write(self.style.SUCCESS('Deleted %d tombstones older than %d days.' % (
+            deleted, sync_settings()['TOMBSTONE_RETENTION_DAYS'])))
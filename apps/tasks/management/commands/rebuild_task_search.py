@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from apps.tasks import search
+
+
+class Command(BaseCommand):
+    help = "Re-create the SQLite full-text triggers and repopulate the task search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            # The PostgreSQL GIN index is maintained by the database itself.
+            self.stdout.write('Nothing to rebuild on %s.' % connection.vendor)
+            return
+        if not search.supports_full_text(connection):
+            raise CommandError('This SQLite build has no FTS5 support.')
+
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            for statement in search.SQLITE_CREATE + search.SQLITE_TRIGGERS + search.SQLITE_POPULATE:
+                cursor.execute(statement)
+            cursor.execute('SELECT COUNT(*) FROM tasks_task')
+            count = cursor.fetchone()[0]
+        search._fts_tables.clear()
+        self.stdout.write(self.style.SUCCESS('Indexed %d tasks.' % count))
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.reminders import ReminderScheduler, reminder_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Send due-date reminders for open tasks entering REMINDERS['WINDOW_MINUTES'] "
+        "before their due date. Runs every --interval seconds until interrupted unless --once; "
+        "several instances can run side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Send what is due now, then exit.")
+        parser.add_argument('--interval', type=float, default=reminder_settings()['INTERVAL'],
+                            help="Seconds between runs.")
+
+    def handle(self, *args, **options):
+        if options['interval'] <= 0:
+            raise CommandError('--interval must be positive.')
+        scheduler = ReminderScheduler.from_settings()
+        try:
+            while True:
+                sent = scheduler.run_pending()
+                if sent or options['once']:
+                    self.stdout.write('Sent %d reminders.' % sent)
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,79 @@
+from django.db import migrations
+
+# The SQL is spelled out here rather than imported from apps.tasks.search,
+# so later changes to that module don't rewrite this migration.
+SQLITE_CREATE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tasks_task_fts USING fts5(
+        title, description, owner,
+        content='', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    "INSERT INTO tasks_task_fts(tasks_task_fts, rank) VALUES ('rank', 'bm25(1.0, 1.0, 0.0)')",
+    """CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(rowid, title, description, owner)
+        VALUES (new.id, new.title, new.description, 'u' || new.user_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_task_fts_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description, owner)
+        VALUES ('delete', old.id, old.title, old.description, 'u' || old.user_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_task_fts_au AFTER UPDATE ON tasks_task
+    WHEN old.title IS NOT new.title
+        OR old.description IS NOT new.description
+        OR old.user_id IS NOT new.user_id
+    BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description, owner)
+        VALUES ('delete', old.id, old.title, old.description, 'u' || old.user_id);
+        INSERT INTO tasks_task_fts(rowid, title, description, owner)
+        VALUES (new.id, new.title, new.description, 'u' || new.user_id);
+    END""",
+    "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('delete-all')",
+    """INSERT INTO tasks_task_fts(rowid, title, description, owner)
+        SELECT id, title, description, 'u' || user_id FROM tasks_task""",
+]
+
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS tasks_task_fts_ai',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_ad',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_au',
+    'DROP TABLE IF EXISTS tasks_task_fts',
+]
+
+
+def has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        return 'ENABLE_FTS5' in {row[0] for row in cursor.fetchall()}
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    # Other engines (and SQLite builds without FTS5) keep the LIKE-based search.
+    if connection.vendor == 'sqlite' and has_fts5(connection):
+        for statement in SQLITE_CREATE:
+            schema_editor.execute(statement)
+    elif connection.vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+        Task = apps.get_model('tasks', 'Task')
+        schema_editor.add_index(Task, GinIndex(
+            SearchVector('title', 'description', config='simple'), name='task_search_idx'))
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        for statement in SQLITE_DROP:
+            schema_editor.execute(statement)
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS task_search_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_alter_task_project_alter_task_user_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
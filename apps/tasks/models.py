@@ -1,7 +1,8 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from .signals import tasks_changed
 
 
 def validate_future_date(value):
@@ -10,6 +11,147 @@ def validate_future_date(value):
         raise ValidationError("Due date must be in the future.")
 
 
+def _tally(groups, sign=1):
+    """Fold `(user_id, project_id, status, count)` groups into `{project_id: (total, completed)}` deltas."""
+    deltas = {}
+    for user_id, project_id, status, count in groups:
+        total, completed = deltas.get(project_id, (0, 0))
+        deltas[project_id] = (total + sign * count, completed + sign * count * (status == 'completed'))
+    return deltas
+
+
+def _apply(model, deltas):
+    model._meta.get_field('project').related_model.objects.apply_task_deltas(deltas)
+
+
+def _merge(*deltas):
+    merged = {}
+    for delta in deltas:
+        for project_id, (total, completed) in delta.items():
+            old_total, old_completed = merged.get(project_id, (0, 0))
+            merged[project_id] = (old_total + total, old_completed + completed)
+    return merged
+
+
+def _changed(model, user_ids, using, changes=()):
+    user_ids = frozenset(user_ids) - {None}
+    if user_ids:
+        tasks_changed.send(sender=model, user_ids=user_ids, using=using, changes=list(changes))
+
+
+def _action(old_status, new_status):
+    """'toggled' when a write completes or reopens a task, 'updated' otherwise."""
+    return 'toggled' if (old_status == 'completed') != (new_status == 'completed') else 'updated'
+
+
+def _plain(value):
+    """A model instance passed to `update()` as its primary key."""
+    return value.pk if isinstance(value, models.Model) else value
+
+
+class TaskQuerySet(models.QuerySet):
+    """
+    Keeps `Project.task_count`/`completed_count` in step and sends
+    `tasks_changed` on the set-based write paths (`update`, `delete`,
+    `bulk_create`, `bulk_update`), which never call `Task.save()`/`delete()`.
+    """
+    
+    def _groups(self):
+        """`(user_id, project_id, status, count)` for the rows of this queryset, in one grouped query."""
+        return self.order_by().values_list('user_id', 'project_id', 'status').annotate(count=models.Count('pk'))
+    
+    def _rows(self, pks):
+        return type(self)(self.model, using=self.db).filter(pk__in=pks)
+    
+    def update(self, **kwargs):
+        # Like `auto_now` on save(), so `updated_at` validators see the change.
+        kwargs.setdefault('updated_at', timezone.now())
+        user = kwargs.get('user', kwargs.get('user_id', models.NOT_PROVIDED))
+        project = kwargs.get('project', kwargs.get('project_id', models.NOT_PROVIDED))
+        status = kwargs.get('status', models.NOT_PROVIDED)
+        with transaction.atomic(using=self.db, savepoint=False):
+            # The ids of the written tasks are read first: change events name them.
+            if project is models.NOT_PROVIDED and status is models.NOT_PROVIDED and user is models.NOT_PROVIDED:
+                owners = list(self.order_by().values_list('pk', 'user_id'))
+                updated = super().update(**kwargs)
+                changes = [(user_id, 'updated', pk) for pk, user_id in owners]
+            elif any(hasattr(value, 'resolve_expression') for value in (user, project, status)):
+                # The new values are only known to the database: compare the
+                # same rows before and after.
+                owners = list(self.order_by().values_list('pk', 'user_id'))
+                rows = self._rows([pk for pk, user_id in owners])
+                before = list(rows._groups())
+                updated = super().update(**kwargs)
+                after = list(rows._groups())
+                _apply(self.model, _merge(_tally(before, -1), _tally(after)))
+                if user is not models.NOT_PROVIDED:
+                    owners += list(rows.values_list('pk', 'user_id'))
+                changes = [(user_id, 'updated', pk) for pk, user_id in dict.fromkeys(owners)]
+            else:
+                user, project, status = _plain(user), _plain(project), _plain(status)
+                rows = list(self.order_by().values_list('pk', 'user_id', 'project_id', 'status'))
+                updated = super().update(**kwargs)
+                before, after, changes = [], [], []
+                for pk, old_user_id, project_id, old_status in rows:
+                    new_user_id = old_user_id if user is models.NOT_PROVIDED else user
+                    new_status = old_status if status is models.NOT_PROVIDED else status
+                    before.append((old_user_id, project_id, old_status, 1))
+                    after.append((new_user_id, project_id if project is models.NOT_PROVIDED else project, new_status, 1))
+                    changes.append((old_user_id, _action(old_status, new_status), pk))
+                    if new_user_id != old_user_id:
+                        changes.append((new_user_id, _action(old_status, new_status), pk))
+                _apply(self.model, _merge(_tally(before, -1), _tally(after)))
+            _changed(self.model, {change[0] for change in changes}, self.db, changes)
+        return updated
+    
+    def delete(self):
+        with transaction.atomic(using=self.db, savepoint=False):
+            # One row per task: the deleted ids are needed for the tombstones.
+            rows = list(self.order_by().values_list('pk', 'user_id', 'project_id', 'status'))
+            result = super().delete()
+            _apply(self.model, _tally(((user_id, project_id, status, 1) for pk, user_id, project_id, status in rows), -1))
+            Tombstone.objects.record(Tombstone.TASK, [(pk, user_id) for pk, user_id, project_id, status in rows],
+                                     using=self.db)
+            _changed(self.model, {row[1] for row in rows}, self.db,
+                     [(user_id, 'deleted', pk) for pk, user_id, project_id, status in rows])
+        return result
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            created = super().bulk_create(objs, *args, **kwargs)
+            if kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts'):
+                # Which rows were really inserted is unknown: count again.
+                project_ids = {task.project_id for task in created} - {None}
+                projects = self.model._meta.get_field('project').related_model.objects
+                projects.filter(pk__in=project_ids).recount_tasks()
+            else:
+                _apply(self.model, _tally((task.user_id, task.project_id, task.status, 1) for task in created))
+            _changed(self.model, {task.user_id for task in created}, self.db,
+                     [(task.user_id, 'created', task.pk) for task in created if task.pk is not None])
+        for task in created:
+            task._counted = (task.project_id, task.status)
+        return created
+    
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            rows = self._rows([task.pk for task in objs])
+            tracked = bool({'project', 'project_id', 'status', 'user', 'user_id'} & set(fields))
+            before = list(rows._groups()) if tracked else []
+            # Plain QuerySet: its internal update() must not count again.
+            updated = models.QuerySet.bulk_update(
+                models.QuerySet(self.model, using=self.db), objs, fields, *args, **kwargs
+            )
+            if tracked:
+                _apply(self.model, _merge(_tally(before, -1), _tally(rows._groups())))
+            _changed(self.model, {group[0] for group in before} | {task.user_id for task in objs}, self.db,
+                     [(task.user_id, 'updated', task.pk) for task in objs])
+        for task in objs:
+            task._counted = (task.project_id, task.status)
+        return updated
+
+
 class Task(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -28,23 +170,172 @@ class Task(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='medium')
     due_date = models.DateTimeField(null=True, blank=True)
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='tasks')
-    project = models.ForeignKey('projects.Project', on_delete=models.SET_NULL, null=True, blank=True, related_name='tasks')
+    # Both foreign keys lead composite indexes below, so they skip their own.
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='tasks', db_index=False)
+    project = models.ForeignKey('projects.Project', on_delete=models.SET_NULL, null=True, blank=True, related_name='tasks', db_index=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)  # New field
     
+    objects = TaskQuerySet.as_manager()
+    
+    # `(project_id, status)` as last read from or written to the database,
+    # which is what the project counters currently include.
+    _counted = None
+    
     class Meta:
         ordering = ['-created_at']
+        # One index per query shape of the list, dashboard and project views:
+        # each serves its WHERE clause and its ORDER BY (including the
+        # `(created_at, id)` keyset tiebreak) without a separate sort step.
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id'], name='task_user_created_idx'),
+            models.Index(fields=['user', 'status', 'created_at', 'id'], name='task_user_status_idx'),
+            models.Index(fields=['user', 'priority', 'created_at', 'id'], name='task_user_priority_idx'),
+            models.Index(fields=['user', 'due_date', 'created_at', 'id'], name='task_user_due_idx'),
+            models.Index(fields=['project', 'created_at', 'id'], name='task_project_created_idx'),
+            models.Index(fields=['project', 'status', 'created_at', 'id'], name='task_project_status_idx'),
+            # Delta sync: changes since a `(updated_at, id)` cursor
+            models.Index(fields=['user', 'updated_at', 'id'], name='task_user_updated_idx'),
+            # Open work only: completed tasks pile up and are never listed by deadline.
+            models.Index(
+                fields=['user', 'due_date', 'id'],
+                condition=~models.Q(status='completed'),
+                name='task_user_open_due_idx',
+            ),
+            # Due-date reminders: open tasks entering the reminder window, for all users
+            models.Index(
+                fields=['due_date', 'id'],
+                condition=~models.Q(status='completed'),
+                name='task_open_due_idx',
+            ),
+        ]
     
     def __str__(self):
         return self.title
     
-    def save(self, *args, **kwargs):
+    def sync_completed_at(self, now=None):
+        """Keep `completed_at` in step with `status`; shared with bulk writes that skip save()."""
         # Set completed_at timestamp when task is marked as completed
         if self.status == 'completed' and not self.completed_at:
-            self.completed_at = timezone.now()
+            self.completed_at = now or timezone.now()
         # Clear completed_at if task is not completed
         elif self.status != 'completed':
             self.completed_at = None
-        super().save(*args, **kwargs)
\ No newline at end of file
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'project_id' in instance.__dict__ and 'status' in instance.__dict__:
+            instance._counted = (instance.project_id, instance.status)
+        return instance
+    
+    def _counted_state(self, using):
+        """What the counters include for this row: nothing for a new task."""
+        if self._state.adding:
+            return None
+        if self._counted is None:
+            self._counted = type(self)._base_manager.using(using).filter(pk=self.pk).values_list(
+                'project_id', 'status'
+            ).first()
+        return self._counted
+    
+    def save(self, *args, **kwargs):
+        self.sync_completed_at()
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        update_fields = kwargs.get('update_fields')
+        before = self._counted_state(using)
+        after = (self.project_id, self.status)
+        if before is not None and update_fields is not None:
+            update_fields = set(update_fields)
+            after = (
+                after[0] if {'project', 'project_id'} & update_fields else before[0],
+                after[1] if 'status' in update_fields else before[1],
+            )
+        deltas = _merge(
+            _tally([(None,) + before + (1,)], -1) if before else {},
+            _tally([(None,) + after + (1,)])
+        )
+        action = 'created' if before is None else _action(before[1], after[1])
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+            _apply(type(self), deltas)
+            _changed(type(self), [self.user_id], using, [(self.user_id, action, self.pk)])
+        self._counted = after
+    
+    def delete(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        before = self._counted_state(using) or (self.project_id, self.status)
+        pk = self.pk
+        with transaction.atomic(using=using, savepoint=False):
+            result = super().delete(*args, **kwargs)
+            _apply(type(self), _tally([(None,) + before + (1,)], -1))
+            Tombstone.objects.record(Tombstone.TASK, [(pk, self.user_id)], using=using)
+            _changed(type(self), [self.user_id], using, [(self.user_id, 'deleted', pk)])
+        self._counted = None
+        return result
+
+
+class TombstoneQuerySet(models.QuerySet):
+    
+    def record(self, kind, deleted, using=None):
+        """Add tombstones for `deleted`, `(object_id, user_id)` pairs of `kind`."""
+        now = timezone.now()
+        self.using(using or self.db).bulk_create(
+            [Tombstone(kind=kind, object_id=object_id, user_id=user_id, deleted_at=now) for object_id, user_id in deleted],
+            batch_size=1000
+        )
+    
+    def expired(self, now=None):
+        """Tombstones older than the retention period (see `apps/tasks/sync.py`)."""
+        from .sync import retention_horizon
+        return self.filter(deleted_at__lt=retention_horizon(now))
+
+
+class Tombstone(models.Model):
+    """
+    A deleted task or project, kept for the retention period so offline
+    clients syncing through `/api/tasks/changes/` learn about deletions.
+    """
+    TASK = 1
+    PROJECT = 2
+    KIND_CHOICES = [
+        (TASK, 'Task'),
+        (PROJECT, 'Project'),
+    ]
+    
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+', db_index=False)
+    kind = models.PositiveSmallIntegerField(choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+    
+    objects = TombstoneQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'deleted_at', 'id'], name='tombstone_user_deleted_idx'),
+            # Retention purges
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.get_kind_display()} {self.object_id}'
+
+
+class TaskReminder(models.Model):
+    """
+    A due-date reminder sent for a task. One per due date: moving the due
+    date re-arms the reminder (see `apps/tasks/reminders.py`).
+    """
+    # Covered by `task_reminder_unique`.
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='reminders', db_index=False)
+    due_date = models.DateTimeField()
+    sent_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'due_date'], name='task_reminder_unique'),
+        ]
+    
+    def __str__(self):
+        return f'{self.task_id} due {self.due_date}'
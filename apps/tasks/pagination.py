@@ -0,0 +1,261 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from django.core.paginator import InvalidPage, Paginator as DjangoPaginator
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class CountedPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination that reuses a row count the view already
+    computed for the same queryset (set `count`) instead of running COUNT again.
+    """
+    count = None
+
+    def django_paginator_class(self, object_list, per_page, **kwargs):
+        paginator = DjangoPaginator(object_list, per_page, **kwargs)
+        if self.count is not None:
+            paginator.count = self.count
+        return paginator
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """`paginate_queryset()` for async views, with the COUNT and page query awaited."""
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        if self.count is None:
+            self.count = await queryset.acount()
+        paginator = self.django_paginator_class(queryset, page_size)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+        self.page.object_list = [obj async for obj in self.page.object_list]
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Keyset (seek) pagination over a composite ordering.
+
+    Unlike DRF's `CursorPagination`, which filters on the first ordering
+    field and then skips ties with an OFFSET, the cursor here stores the full
+    ordering tuple (always ending with the `tiebreakers`), so every page is a
+    single indexed range scan: no COUNT(*) and no OFFSET however deep the
+    crawl. NULLs keep the backend's natural position so the ORDER BY can be
+    served straight from a composite index.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at',)
+    # Fields a client may order on; anything else falls back to `ordering`.
+    ordering_fields = ('created_at', 'due_date', 'priority')
+    # Appended to every ordering, in the direction of its first term, so the
+    # ordering is total.
+    tiebreakers = ('id',)
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        The requested page as an unevaluated, ordered and sliced queryset,
+        with one extra row to find out whether another page follows.
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+        self.nulls_largest = connections[queryset.db].features.nulls_order_largest
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor['reverse'])
+        position = self.cursor['position'] if self.cursor else None
+
+        queryset = queryset.order_by(*self._order_by(reverse))
+        if position is not None:
+            queryset = queryset.filter(self._seek(position, reverse))
+        return queryset[:self.page_size + 1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([obj async for obj in queryset])
+
+    def set_page(self, results):
+        """Turn the fetched rows (one more than a page) into the page and its links."""
+        reverse = bool(self.cursor and self.cursor['reverse'])
+        position = self.cursor['position'] if self.cursor else None
+
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the ordering applied by the view's filters as a tuple of
+        `(field, descending)` pairs, with the tiebreakers appended.
+        """
+        allowed = set(self.ordering_fields) | set(self.tiebreakers)
+        ordering = []
+        for term in queryset.query.order_by or self.ordering:
+            if not isinstance(term, str):
+                continue
+            name = term.lstrip('-')
+            if name == 'pk':
+                name = 'id'
+            if name in allowed and name not in dict(ordering):
+                ordering.append((name, term.startswith('-')))
+        if not ordering:
+            ordering = [(term.lstrip('-'), term.startswith('-')) for term in self.ordering]
+        descending = ordering[0][1]
+        for name in self.tiebreakers:
+            if name not in dict(ordering):
+                ordering.append((name, descending))
+        return tuple(ordering)
+
+    def _order_by(self, reverse):
+        return [
+            F(name).desc() if descending != reverse else F(name).asc()
+            for name, descending in self.ordering
+        ]
+
+    def _seek(self, position, reverse):
+        """
+        Build `(a, b, id) > (x, y, z)` in the page direction, expanded into
+        `a > x OR (a = x AND b > y) OR ...` so it works on every backend and
+        with nullable columns.
+        """
+        branches = []
+        equal = Q()
+        for (name, descending), value in zip(self.ordering, position):
+            beyond = self._beyond(name, descending, value, reverse)
+            if beyond is not None:
+                branches.append(equal & beyond)
+            if value is None:
+                equal &= Q(**{name + '__isnull': True})
+            else:
+                equal &= Q(**{name: value})
+        if not branches:
+            return Q(pk__in=[])
+        return reduce(or_, branches)
+
+    def _beyond(self, name, descending, value, reverse):
+        ascending = descending == reverse
+        # Are we walking towards the end of the index where the NULLs live?
+        nulls_ahead = ascending == self.nulls_largest
+        if value is None:
+            return None if nulls_ahead else Q(**{name + '__isnull': False})
+        condition = Q(**{'%s__%s' % (name, 'gt' if ascending else 'lt'): value})
+        if nulls_ahead and self.model._meta.get_field(name).null:
+            condition |= Q(**{name + '__isnull': True})
+        return condition
+
+    def _get_position_from_instance(self, instance, ordering):
+        if isinstance(instance, dict):
+            return tuple(instance[name] for name, descending in ordering)
+        return tuple(getattr(instance, name) for name, descending in ordering)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            position = self.cursor['position']
+        return self.encode_cursor({'reverse': False, 'position': position})
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            position = self.cursor['position']
+        return self.encode_cursor({'reverse': True, 'position': position})
+
+    def _signature(self):
+        return ','.join(('-' if descending else '') + name for name, descending in self.ordering)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padding = '=' * (-len(encoded) % 4)
+            payload = json.loads(urlsafe_b64decode((encoded + padding).encode('ascii')))
+            if payload['o'] != self._signature():
+                # The cursor was issued for a different ordering.
+                raise ValueError
+            values = payload['p']
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = tuple(
+                None if value is None else self.model._meta.get_field(name).to_python(value)
+                for (name, descending), value in zip(self.ordering, values)
+            )
+            reverse = bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, ValidationError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return {'reverse': reverse, 'position': position}
+
+    def encode_cursor(self, cursor):
+        payload = {
+            'o': self._signature(),
+            'p': [value.isoformat() if hasattr(value, 'isoformat') else value
+                  for value in cursor['position']],
+        }
+        if cursor['reverse']:
+            payload['r'] = 1
+        data = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        encoded = urlsafe_b64encode(data).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+class TaskCursorPagination(KeysetCursorPagination):
+    """Cursor mode for the task list, keyed on `(created_at, id)` by default."""
+    ordering = ('-created_at',)
+    ordering_fields = ('created_at', 'due_date', 'priority')
+    tiebreakers = ('created_at', 'id')
+
+
+class ProjectTaskPagination(TaskCursorPagination):
+    """Keyset slices of the tasks nested in a project detail response."""
+    cursor_query_param = 'tasks_cursor'
+    page_size = 20
+    page_size_query_param = 'tasks_page_size'
+    ordering_fields = ()
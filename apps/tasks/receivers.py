@@ -0,0 +1,71 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core import events
+from apps.core.response_cache import invalidate_users
+from apps.projects.models import Project
+from .models import Tombstone
+from .signals import tasks_changed, tasks_due
+from .stats import invalidate_summaries
+
+
+@receiver(tasks_changed)
+def invalidate_task_summaries(sender, user_ids, using, **kwargs):
+    """Drop cached summaries once the write commits, so no reader re-caches the old counts."""
+    user_ids = set(user_ids)
+    transaction.on_commit(lambda: invalidate_summaries(user_ids), using=using)
+
+
+@receiver(tasks_changed)
+def invalidate_task_responses(sender, user_ids, using, **kwargs):
+    invalidate_users(user_ids, using=using)
+
+
+@receiver([tasks_changed, tasks_due])
+def publish_task_events(sender, user_ids, using, changes=(), **kwargs):
+    """Push the written tasks to their owners' change feeds once the write commits."""
+    batches = {}
+    for user_id, action, task_id in changes:
+        batches.setdefault((user_id, f'task.{action}'), []).append(task_id)
+    if batches:
+        transaction.on_commit(lambda: publish_batches(batches), using=using)
+
+
+def publish_batches(batches):
+    for (user_id, event_type), ids in batches.items():
+        events.publish(user_id, event_type, {'ids': ids})
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_count(sender, instance, using, created=True, **kwargs):
+    if created:
+        transaction.on_commit(lambda: invalidate_summaries([instance.user_id]), using=using)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_responses(sender, instance, using, **kwargs):
+    invalidate_users([instance.user_id], using=using)
+
+
+@receiver(post_delete, sender=Project)
+def record_project_tombstone(sender, instance, using, origin=None, **kwargs):
+    # Deleting the owner deletes their tombstones too: nothing to record.
+    if isinstance(origin, Project) or getattr(origin, 'model', None) is Project:
+        Tombstone.objects.record(Tombstone.PROJECT, [(instance.pk, instance.user_id)], using=using)
+
+
+@receiver(post_save, sender=Project)
+def publish_project_saved(sender, instance, created, using, **kwargs):
+    batches = {(instance.user_id, 'project.created' if created else 'project.updated'): [instance.pk]}
+    transaction.on_commit(lambda: publish_batches(batches), using=using)
+
+
+@receiver(post_delete, sender=Project)
+def publish_project_deleted(sender, instance, using, origin=None, **kwargs):
+    # Nobody is left to tell when the owner is deleted.
+    if isinstance(origin, Project) or getattr(origin, 'model', None) is Project:
+        batches = {(instance.user_id, 'project.deleted'): [instance.pk]}
+        transaction.on_commit(lambda: publish_batches(batches), using=using)
@@ -0,0 +1,144 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import Task, TaskReminder
+from .signals import tasks_due
+
+logger = logging.getLogger(__name__)
+
+
+def reminder_settings():
+    options = getattr(settings, 'REMINDERS', {})
+    return {
+        'WINDOW_MINUTES': options.get('WINDOW_MINUTES', 60),
+        'LOOKBACK_MINUTES': options.get('LOOKBACK_MINUTES', 24 * 60),
+        'BATCH_SIZE': options.get('BATCH_SIZE', 1000),
+        'INTERVAL': options.get('INTERVAL', 30),
+        'IN_PROCESS': options.get('IN_PROCESS', False),
+    }
+
+
+class ReminderScheduler:
+    """
+    Sends a reminder when an open task comes within `window` of its due
+    date, once per due date.
+
+    Each tick walks `task_open_due_idx` (open tasks by due date) over the
+    range `(now - lookback, now + window]` only, skipping tasks already
+    reminded for their current due date, so its cost follows the tasks
+    entering the window rather than the size of the table. A changed due
+    date has no reminder yet and is picked up when it enters the window; a
+    completed task leaves the index. Tasks overdue by more than `lookback`
+    (e.g. after downtime) are not reminded.
+
+    Batches are claimed in one transaction that locks the tasks (skipping
+    those another worker holds where the database supports it), records a
+    `TaskReminder` per task and sends `tasks_due`, whose receivers push
+    the reminders to the change feed and the webhook outbox. Delivery is
+    at least once: racing workers may both claim a task, the unique
+    `(task, due_date)` row keeps a single record.
+    """
+
+    def __init__(self, window=timedelta(minutes=60), lookback=timedelta(hours=24), batch_size=1000,
+                 using=DEFAULT_DB_ALIAS):
+        self.window = window
+        self.lookback = lookback
+        self.batch_size = batch_size
+        self.using = using
+
+    @classmethod
+    def from_settings(cls, using=DEFAULT_DB_ALIAS):
+        options = reminder_settings()
+        return cls(
+            window=timedelta(minutes=options['WINDOW_MINUTES']),
+            lookback=timedelta(minutes=options['LOOKBACK_MINUTES']),
+            batch_size=options['BATCH_SIZE'],
+            using=using,
+        )
+
+    def due(self, now):
+        """Open tasks in the reminder window without a reminder for their due date."""
+        reminded = TaskReminder.objects.filter(task=OuterRef('pk'), due_date=OuterRef('due_date'))
+        return (
+            Task.objects.using(self.using)
+            .exclude(status='completed')
+            .filter(due_date__gt=now - self.lookback, due_date__lte=now + self.window)
+            .filter(~Exists(reminded))
+            .order_by('due_date', 'id')
+        )
+
+    def claim(self, now=None):
+        """Remind the next batch of due tasks; returns how many were reminded."""
+        now = now or timezone.now()
+        with transaction.atomic(using=self.using):
+            due = self.due(now)
+            if connections[self.using].features.has_select_for_update_skip_locked:
+                due = due.select_for_update(skip_locked=True)
+            rows = list(due.values_list('id', 'user_id', 'due_date')[:self.batch_size])
+            if not rows:
+                return 0
+            TaskReminder.objects.using(self.using).bulk_create(
+                [TaskReminder(task_id=task_id, due_date=due_date, sent_at=now) for task_id, user_id, due_date in rows],
+                ignore_conflicts=True,
+            )
+            tasks_due.send(
+                sender=Task,
+                user_ids={user_id for task_id, user_id, due_date in rows},
+                using=self.using,
+                changes=[(user_id, 'due', task_id) for task_id, user_id, due_date in rows],
+            )
+        return len(rows)
+
+    def run_pending(self, now=None):
+        """Claim batches until no due task is left; returns the number reminded."""
+        total = 0
+        while True:
+            claimed = self.claim(now)
+            total += claimed
+            if claimed < self.batch_size:
+                return total
+
+
+class ReminderWorker(threading.Thread):
+    """Runs the scheduler every `interval` seconds in a daemon thread of the serving process."""
+
+    def __init__(self, scheduler=None, interval=None):
+        super().__init__(name='task-reminders', daemon=True)
+        self.scheduler = scheduler or ReminderScheduler.from_settings()
+        self.interval = interval or reminder_settings()['INTERVAL']
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                self.scheduler.run_pending()
+            except Exception:
+                logger.exception('Sending task reminders failed')
+            finally:
+                close_old_connections()
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def start_worker():
+    """Start this process's `ReminderWorker` if `REMINDERS['IN_PROCESS']`; returns it."""
+    global _worker
+    if not reminder_settings()['IN_PROCESS']:
+        return None
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = ReminderWorker()
+            _worker.start()
+    return _worker
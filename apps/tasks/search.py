@@ -0,0 +1,160 @@
+import re
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+FTS_TABLE = 'tasks_task_fts'
+
+# Contentless FTS5 index over title and description, with an `owner` token
+# per row so a search only ever walks the posting lists of one user's tasks.
+# It is kept in sync by triggers, so every write path (ORM saves, queryset
+# updates, bulk inserts, raw SQL) updates it. Django rebuilds SQLite tables
+# for some schema changes, which drops these triggers: re-create them and
+# repopulate with `manage.py rebuild_task_search` if that ever happens.
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, owner,
+        content='', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    # Rank on the text columns only.
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', 'bm25(1.0, 1.0, 0.0)')",
+]
+SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, owner)
+        VALUES (new.id, new.title, new.description, 'u' || new.user_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, owner)
+        VALUES ('delete', old.id, old.title, old.description, 'u' || old.user_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON tasks_task
+    WHEN old.title IS NOT new.title
+        OR old.description IS NOT new.description
+        OR old.user_id IS NOT new.user_id
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, owner)
+        VALUES ('delete', old.id, old.title, old.description, 'u' || old.user_id);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, owner)
+        VALUES (new.id, new.title, new.description, 'u' || new.user_id);
+    END""",
+]
+SQLITE_POPULATE = [
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')",
+    f"""INSERT INTO {FTS_TABLE}(rowid, title, description, owner)
+        SELECT id, title, description, 'u' || user_id FROM tasks_task""",
+]
+SQLITE_DROP = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+POSTGRES_INDEX = 'task_search_idx'
+POSTGRES_CONFIG = 'simple'
+
+
+def search_terms(text):
+    """Split user input into word tokens; punctuation never reaches the engine."""
+    return re.findall(r'\w+', text.lower())
+
+
+def fts5_query(terms, user_id):
+    """Prefix-match every term, within the given user's tasks."""
+    phrases = ' AND '.join(f'"{term}"*' for term in terms)
+    return f'owner : "u{user_id}" AND {{title description}} : ({phrases})'
+
+
+def tsquery(terms):
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+def search_vector():
+    """The expression both the GIN index and the queries are built from."""
+    from django.contrib.postgres.search import SearchVector
+    return SearchVector('title', 'description', config=POSTGRES_CONFIG)
+
+
+def supports_full_text(connection):
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA compile_options')
+            return 'ENABLE_FTS5' in {row[0] for row in cursor.fetchall()}
+    return connection.vendor == 'postgresql'
+
+
+_fts_tables = {}
+
+
+def has_fts_table(connection):
+    """Whether the FTS5 table was created for this database (checked once)."""
+    name = connection.settings_dict['NAME']
+    if name not in _fts_tables:
+        _fts_tables[name] = FTS_TABLE in connection.introspection.table_names()
+    return _fts_tables[name]
+
+
+def search_tasks(queryset, text, user_id, rank=True):
+    """
+    Restrict a Task queryset to full-text matches of `text`.
+
+    With `rank`, best matches come first. Text without any word (only
+    punctuation) matches nothing, as LIKE on it would. Returns None when
+    the database has no full-text index, so the caller can fall back to
+    LIKE.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset.none()
+    connection = connections[queryset.db]
+
+    if connection.vendor == 'sqlite':
+        if not has_fts_table(connection):
+            return None
+        expression = fts5_query(terms, user_id)
+        # A non-correlated IN subquery runs the MATCH exactly once; joining the
+        # FTS table instead lets SQLite re-run it for every candidate row.
+        queryset = queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [expression]
+        ))
+        if rank:
+            # LIMIT/OFFSET keeps the ranked matches materialised (and
+            # auto-indexed) once rather than flattened into a per-row lookup.
+            queryset = queryset.annotate(search_rank=RawSQL(
+                f'SELECT matches.rank FROM (SELECT rowid AS id, rank FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s LIMIT -1 OFFSET 0) matches '
+                f'WHERE matches.id = "tasks_task"."id"', [expression]
+            )).order_by('search_rank', '-created_at')
+        return queryset
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        query = SearchQuery(tsquery(terms), search_type='raw', config=POSTGRES_CONFIG)
+        queryset = queryset.annotate(search_document=search_vector()).filter(search_document=query)
+        if rank:
+            queryset = queryset.annotate(
+                search_rank=SearchRank(search_vector(), query)
+            ).order_by('-search_rank', '-created_at')
+        return queryset
+
+    return None
+
+
+class TaskSearchFilter(filters.SearchFilter):
+    """
+    `?search=` backed by the full-text index (FTS5 on SQLite, GIN on
+    PostgreSQL). Results are ranked by relevance unless the request also
+    passes an explicit `ordering`. Other engines keep the LIKE search over
+    the view's `search_fields`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        if not text.strip():
+            return queryset
+        rank = not request.query_params.get(filters.OrderingFilter.ordering_param)
+        result = search_tasks(queryset, text, request.user.id, rank=rank)
+        if result is None:
+            return super().filter_queryset(request, queryset, view)
+        return result
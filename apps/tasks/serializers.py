@@ -1,10 +1,39 @@
 from rest_framework import serializers
 from django.utils import timezone
+from apps.core.fieldsets import FieldsetSerializerMixin
+from apps.core.serialization import CompiledRepresentationMixin
+from apps.projects.models import Project
 from .models import Task
 
-class TaskSerializer(serializers.ModelSerializer):
+class OwnedProjectField(serializers.PrimaryKeyRelatedField):
+    """
+    A project belonging to the requesting user.
+    
+    Bulk writers can put the user's projects in the serializer context as
+    `projects` ({id: Project}) so each item is resolved without a query.
+    """
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = self.context.get('request')
+        if request is not None and request.user.is_authenticated:
+            queryset = queryset.filter(user=request.user)
+        return queryset
+    
+    def to_internal_value(self, data):
+        projects = self.context.get('projects')
+        if projects is None:
+            return super().to_internal_value(data)
+        try:
+            return projects[int(data)]
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+
+class TaskSerializer(FieldsetSerializerMixin, CompiledRepresentationMixin, serializers.ModelSerializer):
     user_email = serializers.ReadOnlyField(source='user.email')
     project_name = serializers.ReadOnlyField(source='project.name')
+    project = OwnedProjectField(queryset=Project.objects.all(), required=False, allow_null=True)
     
     class Meta:
         model = Task
@@ -0,0 +1,16 @@
+from django.dispatch import Signal
+
+# Sent by every ORM write path of Task, including the set-based ones that
+# skip post_save/post_delete (`QuerySet.update`/`delete`, `bulk_create`,
+# `bulk_update`). Sent inside the write's transaction with:
+#   user_ids: owners of the tasks that were written
+#   using: the database alias
+#   changes: `(user_id, action, task_id)` per written task, action being
+#     'created', 'updated', 'toggled' (completed or reopened) or 'deleted'
+# Receivers that must not act on rolled-back writes use `transaction.on_commit`.
+tasks_changed = Signal()
+
+# Sent by the reminder scheduler (`apps/tasks/reminders.py`) inside the
+# transaction that records the reminders, with the same arguments as
+# `tasks_changed` and the action 'due'. No task is written.
+tasks_due = Signal()
@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from apps.projects.models import Project
+from .models import Task
+
+# Writes invalidate the summary; the timeout only bounds staleness after
+# changes made outside the ORM (raw SQL, manual database edits).
+CACHE_TIMEOUT = 60 * 60
+
+
+def summary_cache_key(user_id):
+    return f'tasks:summary:{user_id}'
+
+
+def compute_summary(user):
+    """Task counts per status in one conditional aggregate, plus the project count."""
+    counts = Task.objects.filter(user=user).aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        completed=Count('id', filter=Q(status='completed')),
+    )
+    total = counts['total']
+    return {
+        'total_tasks': total,
+        'pending_tasks': counts['pending'],
+        'in_progress_tasks': counts['in_progress'],
+        'completed_tasks': counts['completed'],
+        'completion_rate': round(counts['completed'] * 100 / total, 1) if total else 0.0,
+        'project_count': Project.objects.filter(user=user).count(),
+    }
+
+
+def get_summary(user):
+    """The user's summary, from the cache when it has not been invalidated."""
+    key = summary_cache_key(user.pk)
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_summary(user)
+        cache.set(key, summary, CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_summaries(user_ids):
+    cache.delete_many([summary_cache_key(user_id) for user_id in user_ids])
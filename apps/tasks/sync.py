@@ -0,0 +1,142 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Task, Tombstone
+
+# Delta sync: the tasks a user's client has not seen yet, and the ids of the
+# tasks and projects deleted since, read from a cursor. Both streams are
+# keyset scans in `(updated_at, id)` / `(deleted_at, id)` order over the
+# `task_user_updated_idx` and `tombstone_user_deleted_idx` indexes, so a
+# sync costs in proportion to what changed, not to the size of the list.
+
+
+def sync_settings():
+    options = getattr(settings, 'SYNC', {})
+    return {
+        'TOMBSTONE_RETENTION_DAYS': options.get('TOMBSTONE_RETENTION_DAYS', 30),
+        'SETTLE_SECONDS': options.get('SETTLE_SECONDS', 1.0),
+        'PAGE_SIZE': options.get('PAGE_SIZE', 500),
+        'MAX_PAGE_SIZE': options.get('MAX_PAGE_SIZE', 1000),
+    }
+
+
+def retention_horizon(now=None):
+    """Tombstones older than this may be purged."""
+    return (now or timezone.now()) - timedelta(days=sync_settings()['TOMBSTONE_RETENTION_DAYS'])
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class ExpiredCursor(ValueError):
+    pass
+
+
+def encode_cursor(cursor):
+    payload = {
+        key: [position[0].isoformat(), position[1]] if position else None
+        for key, position in cursor.items()
+    }
+    data = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def decode_cursor(encoded):
+    """`{'tasks': (updated_at, id) or None, 'deleted': (deleted_at, id)}`."""
+    try:
+        padding = '=' * (-len(encoded) % 4)
+        payload = json.loads(urlsafe_b64decode((encoded + padding).encode('ascii')))
+        cursor = {}
+        for key in ('tasks', 'deleted'):
+            position = payload[key]
+            if position is None:
+                cursor[key] = None
+                continue
+            moment, pk = position
+            moment = parse_datetime(moment)
+            if moment is None or moment.tzinfo is None or not isinstance(pk, int):
+                raise ValueError
+            cursor[key] = (moment, pk)
+        if cursor['deleted'] is None:
+            raise ValueError
+    except (TypeError, ValueError, KeyError, UnicodeError):
+        raise InvalidCursor
+    return cursor
+
+
+def _after(field, position):
+    """`(field, id) > position`, expanded so the composite index serves it."""
+    moment, pk = position
+    return Q(**{f'{field}__gt': moment}) | Q(**{field: moment, 'id__gt': pk})
+
+
+def changes_since(user, cursor=None, page_size=None, read=list, now=None):
+    """
+    A page of the user's changes after `cursor` (an encoded cursor, or None
+    for a first full sync), as a dict:
+
+    - `changes`: the created or updated tasks in change order, as returned
+      by `read(queryset)` (anything with `updated_at` and `id`);
+    - `deleted`: the ids of deleted `tasks` and `projects`;
+    - `cursor`: where the next call carries on;
+    - `has_more`: whether it has more to return straight away.
+
+    A first sync starts the deletions at the time of the request: nothing
+    deleted earlier is on the client. A cursor older than the tombstone
+    retention raises `ExpiredCursor`; the client has to sync from scratch.
+
+    Rows younger than `SETTLE_SECONDS` are held back for the next call, so
+    a transaction still in flight with an earlier `updated_at` can't commit
+    behind a cursor that has already moved past it.
+    """
+    options = sync_settings()
+    now = now or timezone.now()
+    page_size = page_size or options['PAGE_SIZE']
+    settled = now - timedelta(seconds=options['SETTLE_SECONDS'])
+    if cursor is None:
+        cursor = {'tasks': None, 'deleted': (settled, 0)}
+    else:
+        cursor = decode_cursor(cursor)
+        if cursor['deleted'][0] < retention_horizon(now):
+            raise ExpiredCursor
+
+    tasks = Task.objects.filter(user=user, updated_at__lt=settled)
+    if cursor['tasks'] is not None:
+        tasks = tasks.filter(_after('updated_at', cursor['tasks']))
+    changes = read(tasks.order_by('updated_at', 'id')[:page_size + 1])
+    has_more = len(changes) > page_size
+    changes = changes[:page_size]
+    if changes:
+        cursor['tasks'] = (changes[-1].updated_at, changes[-1].id)
+
+    tombstones = list(
+        Tombstone.objects.filter(user=user, deleted_at__lt=settled)
+        .filter(_after('deleted_at', cursor['deleted']))
+        .order_by('deleted_at', 'id')
+        .values_list('deleted_at', 'id', 'kind', 'object_id')[:page_size + 1]
+    )
+    if len(tombstones) > page_size:
+        has_more = True
+        tombstones = tombstones[:page_size]
+        cursor['deleted'] = tombstones[-1][:2]
+    else:
+        # Every tombstone before `settled` has been read: move up to it, so a
+        # user who deletes nothing doesn't age out of the retention.
+        cursor['deleted'] = max(cursor['deleted'], (settled, 0))
+
+    return {
+        'changes': changes,
+        'deleted': {
+            'tasks': [object_id for moment, pk, kind, object_id in tombstones if kind == Tombstone.TASK],
+            'projects': [object_id for moment, pk, kind, object_id in tombstones if kind == Tombstone.PROJECT],
+        },
+        'cursor': encode_cursor(cursor),
+        'has_more': has_more,
+    }
@@ -3,6 +3,11 @@ from . import views
 
 urlpatterns = [
     path('', views.TaskListCreateView.as_view(), name='task-list'),
+    path('bulk/', views.TaskBulkView.as_view(), name='task-bulk'),
+    path('changes/', views.TaskChangesView.as_view(), name='task-changes'),
+    path('export/', views.TaskExportView.as_view(), name='task-export'),
+    path('import/', views.TaskImportView.as_view(), name='task-import'),
+    path('stats/', views.TaskStatsView.as_view(), name='task-stats'),
     path('<int:pk>/', views.TaskDetailView.as_view(), name='task-detail'),
     path('<int:pk>/toggle-complete/', views.TaskCompleteToggleView.as_view(), name='task-toggle-complete'),
 ]
\ No newline at end of file
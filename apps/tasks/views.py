@@ -1,27 +1,62 @@
 from rest_framework import generics, permissions, filters, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.authentication import TokenAuthentication
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.http import StreamingHttpResponse
 from django.utils import timezone
-from drf_yasg.utils import swagger_auto_schema
+from drf_yasg.utils import no_body, swagger_auto_schema
 from drf_yasg import openapi
 from apps.accounts.authentication import StrictTokenAuthentication
+from apps.core.conditional import ConditionalGetMixin, ConditionalRequestMixin, make_etag, query_signature
+from apps.core.fieldsets import FIELDSET_PARAMS, SparseFieldsetMixin
+from apps.core.response_cache import ResponseCacheMixin
 from .models import Task
 from .serializers import TaskSerializer
 from .permissions import IsOwner
+from .pagination import CountedPageNumberPagination, KeysetCursorPagination, TaskCursorPagination
+from .search import TaskSearchFilter
+from . import bulk, export, importer, stats, sync
 
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskListCreateView(ResponseCacheMixin, ConditionalGetMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
     authentication_classes = [StrictTokenAuthentication]  # Force strict token authentication only
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TaskSearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'priority', 'project']
+    # Only used on databases without a full-text index (see apps/tasks/search.py)
     search_fields = ['title', 'description']
     ordering_fields = ['due_date', 'created_at', 'priority']
+    pagination_class = CountedPageNumberPagination
+    cursor_pagination_class = TaskCursorPagination
+    
+    @property
+    def paginator(self):
+        """
+        Page-number pagination by default; `?pagination=cursor` (or any
+        `?cursor=` value) switches to keyset pagination, which never runs a
+        COUNT query and stays fast however deep the client pages.
+        """
+        if not hasattr(self, '_paginator'):
+            request = getattr(self, 'request', None)
+            if request is not None and (
+                request.query_params.get('pagination') == 'cursor'
+                or TaskCursorPagination.cursor_query_param in request.query_params
+            ):
+                self._paginator = self.cursor_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
     
     @swagger_auto_schema(
-        operation_description="List all tasks for the authenticated user or create a new task",
+        operation_description="List all tasks for the authenticated user or create a new task. "
+                              "Pass `pagination=cursor` for keyset pagination (no total count), and "
+                              "`fields=id,title` or `exclude=description` to return only some fields.",
         security=[{'Token': []}],
         responses={
             200: TaskSerializer(many=True),
@@ -46,19 +81,232 @@ class TaskListCreateView(generics.ListCreateAPIView):
         return super().post(request, *args, **kwargs)
     
     def get_queryset(self):
-        # Only return tasks belonging to the current user
-        return Task.objects.filter(user=self.request.user)
+        # Only return tasks belonging to the current user, joining the rows
+        # behind `user_email` and `project_name` instead of loading them per task
+        return Task.objects.filter(user=self.request.user).select_related('user', 'project')
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+    
+    def list(self, request, *args, **kwargs):
+        rows = self.get_rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(rows, many=True).data)
+    
+    def get_rows(self, queryset):
+        # Lists are read as tuples of just the serialized columns (user email
+        # and project name joined in); model instances are only built for writes
+        columns = ()
+        if isinstance(self.paginator, KeysetCursorPagination):
+            # The cursor is taken from the ordering columns of the last row
+            columns = self.paginator.ordering_fields + self.paginator.tiebreakers
+        return self.get_serializer().rows(queryset, *columns)
+    
+    def get_validators(self):
+        queryset, aggregates = self.get_validator_aggregates(self.filter_queryset(self.get_queryset()))
+        return self.validators_from_state(queryset.aggregate(**aggregates))
+    
+    def get_validator_aggregates(self, queryset):
+        """The queryset and aggregates the list validators are computed from."""
+        if isinstance(self.paginator, TaskCursorPagination):
+            # Only the requested window matters: a bounded aggregate over the
+            # page's rows, and still no COUNT over the whole list. The id sum
+            # moves whenever a row leaves or enters the window.
+            window = self.cursor_pagination_class().get_page_queryset(queryset, self.request, self)
+            return window, {
+                'ids': Sum('id'),
+                'modified': Max('updated_at'),
+                'project_modified': Max('project__updated_at'),
+            }
+        return queryset, {
+            'count': Count('id'),
+            'modified': Max('updated_at'),
+            'project_modified': Max('project__updated_at'),
+        }
+    
+    def validators_from_state(self, state):
+        if 'count' in state and self.paginator is not None:
+            # The page count is in the body anyway; the paginator reuses it.
+            self.paginator.count = state['count']
+        modified = max(filter(None, [state['modified'], state['project_modified']]), default=None)
+        etag = make_etag(
+            'tasks', self.request.user.pk, sorted(state.items()),
+            query_signature(self.request), self.request.accepted_renderer.format
+        )
+        return etag, modified
+
+class TaskExportView(generics.GenericAPIView):
+    """
+    Stream every task of the user matching the list filters as NDJSON
+    (default) or CSV. Rows are read in chunks and written as they arrive,
+    so memory stays flat and the first bytes go out straight away.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [StrictTokenAuthentication]  # Force strict token authentication only
+    renderer_classes = [export.NDJSONRenderer, export.CSVRenderer]
+    filter_backends = [DjangoFilterBackend, TaskSearchFilter, filters.OrderingFilter]
+    filterset_fields = ['status', 'priority', 'project']
+    search_fields = ['title', 'description']
+    ordering_fields = ['due_date', 'created_at', 'priority']
+    pagination_class = None
+    
+    @swagger_auto_schema(
+        operation_description="Export all matching tasks. Accepts the task list filters "
+                              "(`status`, `priority`, `project`, `search`, `ordering`); "
+                              "`format=csv` or `Accept: text/csv` selects CSV, NDJSON otherwise.",
+        security=[{'Token': []}],
+        responses={
+            200: 'Streamed NDJSON or CSV',
+            400: 'Bad request - Invalid filter',
+            401: 'Unauthorized - Invalid or missing token'
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(export.export_rows(queryset)),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}'
+        )
+        response['Content-Disposition'] = f'attachment; filename="tasks.{renderer.format}"'
+        return response
+    
+    def get_queryset(self):
+        return Task.objects.filter(user=self.request.user)
 
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskImportView(generics.GenericAPIView):
+    """
+    Import tasks from NDJSON or CSV, sent either as the raw request body
+    (`Content-Type: application/x-ndjson` or `text/csv`) or as a multipart
+    `file` upload. The body is parsed line by line and inserted in batches.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [StrictTokenAuthentication]  # Force strict token authentication only
+    # Raw bodies are read from the stream directly, never through a parser.
+    parser_classes = [MultiPartParser]
+    
+    @swagger_auto_schema(
+        operation_description="Import tasks from an NDJSON or CSV body (or a multipart `file`). "
+                              "Rows use the task fields plus `project_name`; unknown project names "
+                              "create the project. `batch_size` sets the rows per INSERT.",
+        security=[{'Token': []}],
+        request_body=no_body,
+        responses={
+            200: 'Import report (processed, imported, failed, projects_created, errors)',
+            400: 'Bad request - No file or invalid batch size',
+            401: 'Unauthorized - Invalid or missing token'
+        }
+    )
+    def post(self, request):
+        try:
+            batch_size = int(request.query_params.get('batch_size', importer.BATCH_SIZE))
+        except ValueError:
+            batch_size = 0
+        if not 0 < batch_size <= importer.BATCH_SIZE * 10:
+            return Response({"error": f"batch_size must be between 1 and {importer.BATCH_SIZE * 10}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        content_type = request.content_type or ''
+        if content_type.startswith('multipart/'):
+            upload = request.FILES.get('file')
+            if upload is None:
+                return Response({"error": "Upload the data as 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+            chunks, format = upload, importer.guess_format(upload.name, upload.content_type)
+        else:
+            chunks, format = request.stream, importer.guess_format(content_type=content_type)
+        if chunks is None:
+            return Response({"error": "Empty request body."}, status=status.HTTP_400_BAD_REQUEST)
+        
+        task_importer = importer.TaskImporter(request.user, batch_size=batch_size)
+        try:
+            task_importer.run(importer.parse(importer.decode_lines(chunks), format))
+        except importer.ImportFormatError as exc:
+            # Batches before the unreadable input are already saved.
+            return Response(dict(task_importer.report, error=str(exc)), status=status.HTTP_400_BAD_REQUEST)
+        return Response(task_importer.report, status=status.HTTP_200_OK)
+
+class TaskChangesView(SparseFieldsetMixin, generics.GenericAPIView):
+    """
+    Delta sync for offline clients: the tasks created or updated since a
+    cursor and the ids of the tasks and projects deleted since, so a sync
+    transfers what changed instead of the whole list.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [StrictTokenAuthentication]  # Force strict token authentication only
+    
+    @swagger_auto_schema(
+        operation_description="Changes since `cursor` (omit it for a first, full sync): `changes` holds "
+                              "created or updated tasks, `deleted` the ids of deleted `tasks` and `projects` "
+                              "(clear `project` on tasks of a deleted project). Store the returned `cursor` "
+                              "and call again straight away while `has_more` is true. 410 means the cursor "
+                              "outlived the tombstone retention: sync again without it. Accepts `page_size` "
+                              "and `fields`/`exclude`.",
+        security=[{'Token': []}],
+        manual_parameters=[
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+        responses={
+            200: 'Changes (changes, deleted, cursor, has_more)',
+            400: 'Bad request - Invalid cursor or page size',
+            401: 'Unauthorized - Invalid or missing token',
+            410: 'Cursor expired - sync again without a cursor'
+        }
+    )
+    def get(self, request):
+        options = sync.sync_settings()
+        try:
+            page_size = int(request.query_params.get('page_size', options['PAGE_SIZE']))
+        except ValueError:
+            page_size = 0
+        if not 0 < page_size <= options['MAX_PAGE_SIZE']:
+            return Response({"error": f"page_size must be between 1 and {options['MAX_PAGE_SIZE']}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = self.get_serializer()
+        try:
+            result = sync.changes_since(
+                request.user, request.query_params.get('cursor') or None, page_size,
+                read=lambda queryset: list(serializer.rows(queryset, 'updated_at', 'id'))
+            )
+        except sync.InvalidCursor:
+            return Response({"error": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+        except sync.ExpiredCursor:
+            return Response({"error": "Cursor expired. Sync again without a cursor."}, status=status.HTTP_410_GONE)
+        result['changes'] = self.get_serializer(result['changes'], many=True).data
+        return Response(result)
+
+class TaskStatsView(generics.GenericAPIView):
+    """
+    Task counts per status for the current user, served from a per-user
+    cache that every task write invalidates.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [StrictTokenAuthentication]  # Force strict token authentication only
+    
+    @swagger_auto_schema(
+        operation_description="Task summary for the dashboard: total, pending, in progress and "
+                              "completed tasks, completion rate and project count",
+        security=[{'Token': []}],
+        responses={
+            200: 'Task summary',
+            401: 'Unauthorized - Invalid or missing token'
+        }
+    )
+    def get(self, request):
+        return Response(stats.get_summary(request.user))
+
+class TaskDetailView(ConditionalRequestMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwner]  # Add IsOwner permission
     authentication_classes = [StrictTokenAuthentication]  # Force strict token authentication only
     
     @swagger_auto_schema(
-        operation_description="Get task details",
+        operation_description="Get task details. `fields=id,title` or `exclude=description` "
+                              "return only some fields.",
         security=[{'Token': []}],
         responses={
             200: TaskSerializer,
@@ -111,7 +359,27 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
     
     def get_queryset(self):
         # Only return tasks belonging to the current user
-        return Task.objects.filter(user=self.request.user)
+        queryset = Task.objects.filter(user=self.request.user).select_related('user', 'project')
+        # Ownership and the validators need these beyond the requested fields
+        return self.sparse_queryset(queryset, ('user', 'project', 'updated_at'), {'project': ('updated_at',)})
+    
+    def get_object(self):
+        # `update` looks the task up before delegating to the mixin, which
+        # looks it up again; fetch it once per request
+        if not hasattr(self, '_task'):
+            self._task = super().get_object()
+        return self._task
+    
+    def get_validators(self):
+        task = self.get_object()
+        # Without `project_name` in the fields the project isn't loaded, nor part of the response
+        project = task.project if Task.project.is_cached(task) else None
+        project_modified = project.updated_at if project else None
+        etag = make_etag(
+            'task', task.pk, task.updated_at, task.project_id, project_modified,
+            query_signature(self.request, FIELDSET_PARAMS), self.request.accepted_renderer.format
+        )
+        return etag, max(filter(None, [task.updated_at, project_modified]))
     
     def update(self, request, *args, **kwargs):
         task = self.get_object()
@@ -168,24 +436,97 @@ class TaskCompleteToggleView(generics.GenericAPIView):
     )
     def post(self, request, pk):
         try:
-            task = Task.objects.get(pk=pk, user=request.user)
+            task = Task.objects.select_related('user', 'project').get(pk=pk, user=request.user)
         except Task.DoesNotExist:
             return Response({"error": "Task not found"}, status=status.HTTP_404_NOT_FOUND)
         
-        # Toggle status
-        if task.status == 'completed':
-            task.status = 'pending'
-            task.completed_at = None
-            message = "Task marked as incomplete"
-        else:
-            task.status = 'completed'
-            task.completed_at = timezone.now()
-            message = "Task marked as complete"
-        
+        message = self.toggle(task)
         task.save()
         
         serializer = TaskSerializer(task, context={'request': request})
         return Response({
             "message": message,
             "task": serializer.data
-        })
\ No newline at end of file
+        })
+    
+    def toggle(self, task):
+        """Flip the task between completed and pending; returns the response message."""
+        if task.status == 'completed':
+            task.status = 'pending'
+            task.completed_at = None
+            return "Task marked as incomplete"
+        task.status = 'completed'
+        task.completed_at = timezone.now()
+        return "Task marked as complete"
+
+class TaskBulkView(generics.GenericAPIView):
+    """
+    Create, update and delete many tasks in one request and one transaction.
+    Items are validated like their single-task counterparts; invalid items
+    are reported and skipped while the rest are written set-based.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [StrictTokenAuthentication]  # Force strict token authentication only
+    
+    @swagger_auto_schema(
+        operation_description=(
+            "Bulk create/update/delete tasks. Body: `{\"create\": [task, ...], "
+            "\"update\": [{\"id\": 1, <fields>}, ...], \"delete\": [id, ...]}` "
+            f"with at most {bulk.MAX_BULK_ITEMS} items in total. Responds 200 when every item "
+            "succeeded, 207 with per-item results otherwise."
+        ),
+        security=[{'Token': []}],
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'create': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT)),
+                'update': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT)),
+                'delete': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)),
+            }
+        ),
+        responses={
+            200: 'All items succeeded',
+            207: 'Some items failed - see per-item results',
+            400: 'Bad request - Malformed body or too many items',
+            401: 'Unauthorized - Invalid or missing token'
+        }
+    )
+    def post(self, request):
+        if not isinstance(request.data, dict):
+            return Response({"error": "Expected an object with create, update and/or delete lists."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        operations = {}
+        for key in ('create', 'update', 'delete'):
+            value = request.data.get(key, [])
+            if not isinstance(value, list):
+                return Response({"error": f"'{key}' must be a list."}, status=status.HTTP_400_BAD_REQUEST)
+            operations[key] = value
+        if sum(len(items) for items in operations.values()) > bulk.MAX_BULK_ITEMS:
+            return Response({"error": f"At most {bulk.MAX_BULK_ITEMS} items per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        context = self.get_serializer_context()
+        context['projects'] = bulk.user_projects(request.user, operations['create'] + operations['update'])
+        with transaction.atomic():
+            results = {
+                'create': bulk.create_tasks(request.user, operations['create'], context),
+                'update': bulk.update_tasks(request.user, operations['update'], context),
+                'delete': bulk.delete_tasks(request.user, operations['delete']),
+            }
+        
+        failed = False
+        for key, items in results.items():
+            for result in items:
+                if 'task' in result:
+                    result['task'] = TaskSerializer(result['task'], context=context).data
+                failed = failed or result['status'] >= 400
+        summary = {
+            'created': sum(result['status'] == 201 for result in results['create']),
+            'updated': sum(result['status'] == 200 for result in results['update']),
+            'deleted': sum(result['status'] == 204 for result in results['delete']),
+        }
+        return Response(
+            dict(summary, results=results),
+            status=status.HTTP_207_MULTI_STATUS if failed else status.HTTP_200_OK
+        )
@@ -0,0 +1,33 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Webhook, WebhookEvent
+
+@admin.register(Webhook)
+class WebhookAdmin(admin.ModelAdmin):
+    """Admin configuration for Webhook model"""
+    
+    list_display = ('url', 'user', 'is_active', 'created_at')
+    list_filter = ('is_active', 'created_at')
+    search_fields = ('url', 'user__email')
+    readonly_fields = ('secret', 'created_at', 'updated_at')
+    raw_id_fields = ('user',)
+    list_select_related = ('user',)
+    list_per_page = 25
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    """Admin configuration for the webhook outbox"""
+    
+    list_display = ('event', 'task_id', 'webhook', 'status', 'attempts', 'next_attempt_at', 'last_error')
+    list_filter = ('status', 'event')
+    search_fields = ('webhook__url',)
+    raw_id_fields = ('webhook',)
+    list_select_related = ('webhook',)
+    list_per_page = 25
+    
+    actions = ['retry_now']
+    
+    def retry_now(self, request, queryset):
+        updated = queryset.update(status=WebhookEvent.PENDING, attempts=0, next_attempt_at=timezone.now())
+        self.message_user(request, f'{updated} events queued for delivery.')
+    retry_now.short_description = "Retry selected events now"
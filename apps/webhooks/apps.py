@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+class WebhooksConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.webhooks'
+
+    def ready(self):
+        from . import receivers  # noqa: F401
@@ -0,0 +1,244 @@
+import hashlib
+import hmac
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+import urllib3
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.renderers import FastJSONRenderer
+from apps.tasks.models import Task
+from apps.tasks.serializers import TaskSerializer
+from .models import WebhookEvent
+from .validators import UnsafeURL, check_url
+
+DeliveryResult = namedtuple('DeliveryResult', 'claimed delivered requests retrying failed')
+
+USER_AGENT = 'task-management-api-webhooks/1.0'
+
+
+def coalesce(events):
+    """The one event that stands for consecutive changes (or due reminders) of a task."""
+    if events[-1] == 'task.deleted':
+        return 'task.deleted'
+    if events[0] == 'task.created':
+        return 'task.created'
+    if events.count('task.toggled') % 2:
+        # Completed or reopened, whatever else changed: integrations watch for it.
+        return 'task.toggled'
+    if events[-1] == 'task.toggled':
+        # Completed and reopened again (or the reverse): only an update is left.
+        return 'task.updated'
+    return events[-1]
+
+
+def sign(secret, timestamp, body):
+    """`X-Webhook-Signature`: HMAC-SHA256 of `<timestamp>.<body>` with the webhook's secret."""
+    digest = hmac.new(secret.encode(), f'{timestamp}.'.encode() + body, hashlib.sha256).hexdigest()
+    return f'sha256={digest}'
+
+
+class WebhookDeliverer:
+    """
+    Delivers the webhook outbox.
+
+    Each `deliver()` claims up to `claim_size` due events (leasing them for
+    `lease` seconds, so concurrent workers skip them), coalesces the events
+    of the same task into one carrying the task's current state, and POSTs
+    them to each webhook in batches of `batch_size`. Requests run on
+    `concurrency` threads sharing one pooled HTTP client; the database is
+    only used from the calling thread.
+
+    Failed batches are retried with exponential backoff (`backoff` seconds
+    doubling up to `max_backoff`, plus up to `jitter` of it at random) and
+    left as `failed` after `max_attempts`.
+
+    Unless `allow_private_hosts`, a URL whose host resolves to a loopback,
+    link-local, private or reserved address fails like an unreachable one,
+    and requests connect to the address that was checked. Redirects are
+    never followed.
+    """
+
+    def __init__(self, batch_size=100, claim_size=1000, concurrency=8, timeout=5.0, max_attempts=8,
+                 backoff=30, max_backoff=3600, jitter=0.1, lease=300, allow_private_hosts=False):
+        self.batch_size = batch_size
+        self.claim_size = claim_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.lease = lease
+        self.allow_private_hosts = allow_private_hosts
+        self.http = urllib3.PoolManager(
+            num_pools=100, maxsize=concurrency, block=True, retries=False, timeout=urllib3.Timeout(total=timeout)
+        )
+        self.executor = ThreadPoolExecutor(concurrency, thread_name_prefix='webhooks')
+        self.renderer = FastJSONRenderer()
+
+    @classmethod
+    def from_settings(cls):
+        options = getattr(settings, 'WEBHOOKS', {})
+        return cls(
+            batch_size=options.get('BATCH_SIZE', 100),
+            claim_size=options.get('CLAIM_SIZE', 1000),
+            concurrency=options.get('CONCURRENCY', 8),
+            timeout=options.get('TIMEOUT', 5.0),
+            max_attempts=options.get('MAX_ATTEMPTS', 8),
+            backoff=options.get('BACKOFF', 30),
+            max_backoff=options.get('MAX_BACKOFF', 3600),
+            jitter=options.get('JITTER', 0.1),
+            lease=options.get('LEASE', 300),
+            allow_private_hosts=options.get('ALLOW_PRIVATE_HOSTS', False),
+        )
+
+    def close(self):
+        self.executor.shutdown()
+        self.http.clear()
+
+    def deliver(self, now=None):
+        """Deliver one claim of due events."""
+        now = now or timezone.now()
+        events = self.claim(now)
+        if not events:
+            return DeliveryResult(0, 0, 0, 0, 0)
+
+        # Coalesce per (webhook, task): the newest row stands for the others
+        # and inherits their attempts. Due reminders are sent once, so they
+        # are never folded into a change of the task (nor it into them).
+        groups = {}
+        for event in events:
+            groups.setdefault((event.webhook_id, event.task_id, event.event == 'task.due'), []).append(event)
+        done = []
+        pending = []
+        for group in groups.values():
+            latest = group[-1]
+            latest.event = coalesce([event.event for event in group])
+            latest.attempts = max(event.attempts for event in group)
+            done.extend(event.pk for event in group[:-1])
+            if latest.webhook.is_active:
+                pending.append(latest)
+            else:
+                done.append(latest.pk)
+
+        tasks = self.task_data([event.task_id for event in pending if event.event != 'task.deleted'])
+        batches = {}
+        for event in pending:
+            if event.event != 'task.deleted' and event.task_id not in tasks:
+                # Deleted since: its own deletion event follows.
+                done.append(event.pk)
+                continue
+            batches.setdefault(event.webhook_id, []).append(event)
+        requests = [
+            (batch[0].webhook, batch[i:i + self.batch_size])
+            for batch in batches.values()
+            for i in range(0, len(batch), self.batch_size)
+        ]
+        bodies = [self.body(batch, tasks) for webhook, batch in requests]
+        errors = list(self.executor.map(self.send, [webhook for webhook, batch in requests], bodies))
+
+        delivered, retrying, failed = 0, [], []
+        for (webhook, batch), error in zip(requests, errors):
+            if error is None:
+                done.extend(event.pk for event in batch)
+                delivered += len(batch)
+                continue
+            for event in batch:
+                event.attempts += 1
+                event.last_error = error
+                if event.attempts >= self.max_attempts:
+                    event.status = WebhookEvent.FAILED
+                    failed.append(event)
+                else:
+                    event.next_attempt_at = now + timedelta(seconds=self.retry_delay(event.attempts))
+                    retrying.append(event)
+        with transaction.atomic():
+            WebhookEvent.objects.filter(pk__in=done).delete()
+            WebhookEvent.objects.bulk_update(
+                retrying + failed, ['event', 'attempts', 'last_error', 'status', 'next_attempt_at']
+            )
+        return DeliveryResult(len(events), delivered, len(requests), len(retrying), len(failed))
+
+    def claim(self, now):
+        """Lease the oldest due events to this worker."""
+        with transaction.atomic():
+            due = WebhookEvent.objects.due(now).order_by('next_attempt_at', 'id')
+            if connection.features.has_select_for_update_skip_locked:
+                due = due.select_for_update(skip_locked=True)
+            ids = list(due.values_list('id', flat=True)[:self.claim_size])
+            if not ids:
+                return []
+            WebhookEvent.objects.filter(pk__in=ids).update(next_attempt_at=now + timedelta(seconds=self.lease))
+        return list(WebhookEvent.objects.filter(pk__in=ids).select_related('webhook').order_by('id'))
+
+    def task_data(self, task_ids):
+        """`{task_id: representation}` of the tasks that still exist."""
+        if not task_ids:
+            return {}
+        serializer = TaskSerializer()
+        rows = serializer.rows(Task.objects.filter(pk__in=task_ids))
+        return {task['id']: task for task in TaskSerializer(rows, many=True).data}
+
+    def body(self, batch, tasks):
+        return self.renderer.render({
+            'events': [
+                {
+                    'id': event.pk,
+                    'type': event.event,
+                    'created_at': event.created_at,
+                    'task': {'id': event.task_id} if event.event == 'task.deleted' else tasks[event.task_id],
+                }
+                for event in batch
+            ]
+        })
+
+    def send(self, webhook, body):
+        """POST one batch; the error message, or None once delivered."""
+        timestamp = str(int(time.time()))
+        headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': USER_AGENT,
+            'X-Webhook-Id': str(webhook.pk),
+            'X-Webhook-Timestamp': timestamp,
+            'X-Webhook-Signature': sign(webhook.secret, timestamp, body),
+        }
+        try:
+            response = self.post(webhook.url, body, headers)
+        except UnsafeURL as exc:
+            return str(exc)
+        except urllib3.exceptions.HTTPError as exc:
+            return f'{type(exc).__name__}: {exc}'
+        if 200 <= response.status < 300:
+            return None
+        return f'HTTP {response.status}'
+
+    def post(self, url, body, headers):
+        """
+        POST without following redirects, which could lead to an internal host.
+        Unless `allow_private_hosts`, the host is checked again (it may resolve
+        elsewhere than at registration) and the request goes to the address
+        checked, under the URL's host name for the `Host` header and TLS.
+        """
+        if self.allow_private_hosts:
+            return self.http.request('POST', url, body=body, headers=headers, redirect=False)
+        address = check_url(url)
+        parts = urlsplit(url)
+        pool_kwargs = None
+        if parts.scheme == 'https':
+            pool_kwargs = {'server_hostname': parts.hostname, 'assert_hostname': parts.hostname}
+        pool = self.http.connection_from_host(
+            address, parts.port or (443 if parts.scheme == 'https' else 80), parts.scheme, pool_kwargs=pool_kwargs
+        )
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        return pool.urlopen('POST', path, body=body, redirect=False,
+                            headers={**headers, 'Host': parts.netloc.rpartition('@')[2]})
+
+    def retry_delay(self, attempts):
+        delay = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+        return delay * (1 + self.jitter * random.random())
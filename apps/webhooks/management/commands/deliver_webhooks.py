@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.webhooks.delivery import WebhookDeliverer
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver the webhook outbox: claim due events, coalesce them per task and POST "
+        "them in batches, retrying failures with backoff. Runs until interrupted unless --once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Deliver what is due now, then exit.")
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help="Seconds to wait when nothing is due.")
+
+    def handle(self, *args, **options):
+        if options['interval'] <= 0:
+            raise CommandError('--interval must be positive.')
+        deliverer = WebhookDeliverer.from_settings()
+        try:
+            while True:
+                result = deliverer.deliver()
+                if result.claimed:
+                    self.stdout.write(
+                        f'{result.claimed} events: {result.delivered} delivered in {result.requests} requests, '
+                        f'{result.retrying} to retry, {result.failed} failed'
+                    )
+                if options['once']:
+                    # Everything due fits in one claim unless the backlog is larger.
+                    if result.claimed < deliverer.claim_size:
+                        return
+                elif not result.claimed:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            deliverer.close()
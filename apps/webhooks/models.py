@@ -0,0 +1,70 @@
+import secrets
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+def generate_secret():
+    return secrets.token_hex(32)
+
+
+class Webhook(models.Model):
+    """An endpoint notified of every change to its owner's tasks."""
+    # Covered by `webhook_user_active_idx`.
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='webhooks', db_index=False)
+    url = models.URLField(max_length=500)
+    # Signs each delivery (`X-Webhook-Signature`)
+    secret = models.CharField(max_length=64, default=generate_secret, editable=False)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'is_active'], name='webhook_user_active_idx'),
+        ]
+    
+    def __str__(self):
+        return self.url
+
+
+class WebhookEventQuerySet(models.QuerySet):
+    def due(self, now=None):
+        return self.filter(status=WebhookEvent.PENDING, next_attempt_at__lte=now or timezone.now())
+
+
+class WebhookEvent(models.Model):
+    """
+    Outbox row: one task change still to be delivered to one webhook.
+    Written in the transaction of the change and deleted once delivered;
+    rows that ran out of attempts stay behind as `failed`.
+    """
+    PENDING = 'pending'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (FAILED, 'Failed'),
+    ]
+    
+    webhook = models.ForeignKey(Webhook, on_delete=models.CASCADE, related_name='events')
+    # Not a foreign key: deletions are delivered after the task is gone.
+    task_id = models.BigIntegerField()
+    event = models.CharField(max_length=20)
+    created_at = models.DateTimeField(default=timezone.now)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    
+    objects = WebhookEventQuerySet.as_manager()
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='webhook_event_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.event} {self.task_id}'
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from .models import Webhook, WebhookEvent
+
+
+def targets_cache_key(user_id):
+    return f'webhooks:targets:{user_id}'
+
+
+def webhook_targets(user_ids, using=DEFAULT_DB_ALIAS):
+    """
+    `{user_id: [webhook ids]}` of the users' active webhooks. Cached, so
+    writes by users without webhooks (nearly all of them) cost no query.
+    """
+    keys = {targets_cache_key(user_id): user_id for user_id in user_ids if user_id is not None}
+    cached = cache.get_many(keys)
+    targets = {keys[key]: webhook_ids for key, webhook_ids in cached.items()}
+    missing = [user_id for key, user_id in keys.items() if key not in cached]
+    if missing:
+        found = {user_id: [] for user_id in missing}
+        rows = Webhook.objects.using(using).filter(user_id__in=missing, is_active=True).values_list('user_id', 'id')
+        for user_id, webhook_id in rows.order_by('id'):
+            found[user_id].append(webhook_id)
+        cache.set_many(
+            {targets_cache_key(user_id): webhook_ids for user_id, webhook_ids in found.items()},
+            getattr(settings, 'WEBHOOKS', {}).get('TARGETS_CACHE_TIMEOUT', 300)
+        )
+        targets.update(found)
+    return targets
+
+
+def invalidate_targets(user_ids, using=DEFAULT_DB_ALIAS):
+    """Drop the cached targets now and again on commit, like `invalidate_users`."""
+    keys = [targets_cache_key(user_id) for user_id in set(user_ids)]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys), using=using)
+
+
+def enqueue(changes, using=DEFAULT_DB_ALIAS):
+    """Write outbox rows for `(user_id, action, task_id)` changes; call inside the write's transaction."""
+    targets = webhook_targets({user_id for user_id, action, task_id in changes}, using)
+    rows = [
+        WebhookEvent(webhook_id=webhook_id, task_id=task_id, event=f'task.{action}')
+        for user_id, action, task_id in changes
+        for webhook_id in targets.get(user_id, ())
+    ]
+    if rows:
+        WebhookEvent.objects.using(using).bulk_create(rows)
+    return len(rows)
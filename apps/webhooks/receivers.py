@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.tasks.signals import tasks_changed, tasks_due
+from .models import Webhook
+from .outbox import enqueue, invalidate_targets
+
+
+@receiver([tasks_changed, tasks_due])
+def enqueue_webhook_events(sender, user_ids, using, changes=(), **kwargs):
+    """Add the changes to the outbox in the same transaction, so they are delivered only if it commits."""
+    if changes:
+        enqueue(changes, using=using)
+
+
+@receiver(post_save, sender=Webhook)
+@receiver(post_delete, sender=Webhook)
+def invalidate_webhook_targets(sender, instance, using, **kwargs):
+    invalidate_targets([instance.user_id], using=using)
@@ -0,0 +1,20 @@
+from django.conf import settings
+from rest_framework import serializers
+from .models import Webhook
+from .validators import UnsafeURL, check_url
+
+class WebhookSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Webhook
+        fields = ('id', 'url', 'secret', 'is_active', 'created_at', 'updated_at')
+        read_only_fields = ('secret', 'created_at', 'updated_at')
+    
+    def validate_url(self, value):
+        if getattr(settings, 'WEBHOOKS', {}).get('ALLOW_PRIVATE_HOSTS', False):
+            return value
+        try:
+            # Names that don't resolve yet are checked again on every delivery.
+            check_url(value, resolve=False)
+        except UnsafeURL as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
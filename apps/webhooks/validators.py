@@ -0,0 +1,54 @@
+import ipaddress
+import socket
+from urllib.parse import urlsplit
+
+
+class UnsafeURL(ValueError):
+    """A webhook URL the server must not send requests to."""
+
+
+def is_public(address):
+    """Whether `address` is a globally routable unicast IP address."""
+    ip = ipaddress.ip_address(address.split('%', 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not (
+        ip.is_loopback or ip.is_link_local or ip.is_private or ip.is_reserved
+        or ip.is_multicast or ip.is_unspecified
+    )
+
+
+def check_url(url, resolve=True):
+    """
+    Raise `UnsafeURL` unless `url` is http(s) and its host is, or resolves
+    only to, public addresses: webhooks must not reach loopback, link-local
+    (cloud metadata), private or reserved hosts inside the network.
+
+    With `resolve` a host name that doesn't resolve is refused too;
+    without, it is let through (returning None), to be checked again when
+    sending. Returns the address to connect to: looking the host up again
+    could answer with another one (DNS rebinding).
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise UnsafeURL('Only http and https URLs are accepted.')
+    try:
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+    except ValueError:
+        raise UnsafeURL('Invalid port.')
+    host = parts.hostname
+    try:
+        addresses = [str(ipaddress.ip_address(host))]
+    except ValueError:
+        if host == 'localhost' or host.endswith('.localhost'):
+            raise UnsafeURL('Webhooks cannot target this host.')
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except (OSError, UnicodeError):
+            if resolve:
+                raise UnsafeURL(f'{host} does not resolve.')
+            return None
+        addresses = [info[4][0] for info in infos]
+    if not all(is_public(address) for address in addresses):
+        raise UnsafeURL('Webhooks cannot target loopback, link-local, private or reserved addresses.')
+    return addresses[0]
@@ -0,0 +1,25 @@
+from rest_framework import generics, permissions
+from apps.accounts.permissions import IsOwner
+from .models import Webhook
+from .serializers import WebhookSerializer
+
+class WebhookListCreateView(generics.ListCreateAPIView):
+    """
+    The user's webhooks. Each active webhook receives every change to the
+    user's tasks as batched POSTs signed with its `secret`.
+    """
+    serializer_class = WebhookSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return Webhook.objects.filter(user=self.request.user)
+    
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+class WebhookDetailView(generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = WebhookSerializer
+    permission_classes = [permissions.IsAuthenticated, IsOwner]
+    
+    def get_queryset(self):
+        return Webhook.objects.filter(user=self.request.user)
@@ -0,0 +1,24 @@
+"""ASGI config for taskmanager project.
+
+It exposes the ASGI callable as a module-level variable named ``application``,
+e.g. ``uvicorn taskmanager.asgi:application``. Requests are routed through
+``ASGI_ROOT_URLCONF`` (``taskmanager.asgi_urls``), which serves the hot endpoints
+with async views; ``AsgiUrlconfMiddleware`` selects it for ASGI requests only.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'taskmanager.settings')
+
+application = get_asgi_application()
+
+# Due-date reminders in a thread of this process when REMINDERS['IN_PROCESS']
+# is set; otherwise run `python manage.py send_reminders`.
+from apps.tasks.reminders import start_worker  # noqa: E402
+
+start_worker()
@@ -0,0 +1,20 @@
+"""
+URLconf of the ASGI entry point (`taskmanager.asgi`).
+
+The hot endpoints are served by native async views; every other route is
+the regular URLconf, run by Django in a thread.
+"""
+from django.urls import path
+
+from apps.accounts import async_views as account_views
+from apps.tasks import async_views as task_views
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('api/auth/login/', account_views.AsyncLoginView.as_view(), name='login'),
+    path('api/auth/me/', account_views.AsyncMeView.as_view(), name='me'),
+    path('api/tasks/', task_views.AsyncTaskListCreateView.as_view(), name='task-list'),
+    path('api/tasks/<int:pk>/', task_views.AsyncTaskDetailView.as_view(), name='task-detail'),
+    path('api/tasks/<int:pk>/toggle-complete/', task_views.AsyncTaskCompleteToggleView.as_view(),
+         name='task-toggle-complete'),
+] + sync_urlpatterns
@@ -36,9 +36,12 @@ INSTALLED_APPS = [
     'apps.accounts',
     'apps.tasks',
     'apps.projects',
+    'apps.webhooks',
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.RequestMetricsMiddleware',  # First, so its total covers the others
+    'apps.core.middleware.AsgiUrlconfMiddleware',  # Async views under ASGI; before CommonMiddleware's slash check
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -51,6 +54,8 @@ MIDDLEWARE = [
 ]
 
 ROOT_URLCONF = 'taskmanager.urls'
+# URLconf of requests served by taskmanager/asgi.py (see AsgiUrlconfMiddleware).
+ASGI_ROOT_URLCONF = 'taskmanager.asgi_urls'
 
 TEMPLATES = [
     {
@@ -121,10 +126,146 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # Same bytes as DRF's JSONRenderer, encoded with orjson when installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
 
+# Per-request query count and timings (apps/core/middleware.py): sent as a
+# Server-Timing header and logged by `apps.core.metrics`, at WARNING when a
+# request is over budget. ROUTES overrides the budgets per URL name.
+REQUEST_METRICS = {
+    'ENABLED': os.getenv('REQUEST_METRICS_ENABLED', 'True') == 'True',
+    'SERVER_TIMING': os.getenv('REQUEST_METRICS_SERVER_TIMING', 'True') == 'True',
+    'QUERY_BUDGET': int(os.getenv('REQUEST_METRICS_QUERY_BUDGET', '20')),
+    'LATENCY_BUDGET_MS': int(os.getenv('REQUEST_METRICS_LATENCY_BUDGET_MS', '500')),
+    'ROUTES': {
+        'task-export': {'LATENCY_BUDGET_MS': 5000},
+        'task-import': {'QUERY_BUDGET': None, 'LATENCY_BUDGET_MS': 5000},
+        'task-bulk': {'QUERY_BUDGET': None},
+        # Password hashing is slow on purpose.
+        'login': {'LATENCY_BUDGET_MS': 2000},
+        'register': {'LATENCY_BUDGET_MS': 2000},
+    },
+}
+
+# Per-route counters and latency histograms served at /api/metrics/
+# (apps/core/prometheus.py). With several worker processes, point
+# PROMETHEUS_MULTIPROC_DIR at a directory they share and empty it when the
+# service starts; without it each process only reports itself.
+PROMETHEUS = {
+    'ENABLED': os.getenv('PROMETHEUS_ENABLED', 'True') == 'True',
+    'DIRECTORY': os.getenv('PROMETHEUS_MULTIPROC_DIR') or None,
+    'FLUSH_INTERVAL': float(os.getenv('PROMETHEUS_FLUSH_INTERVAL', '1')),
+}
+
+# Silences the request metrics log lines while testing.
+TEST_RUNNER = 'taskmanager.test_runner.TestRunner'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'metrics': {'class': 'logging.StreamHandler', 'formatter': 'message'},
+    },
+    'loggers': {
+        # INFO logs every request; WARNING only those over budget.
+        'apps.core.metrics': {
+            'handlers': ['metrics'],
+            'level': os.getenv('REQUEST_METRICS_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+# In-process cache of resolved auth tokens (see apps/accounts/token_cache.py).
+# Revocations are seen immediately by the worker that handled them and
+# within TIMEOUT seconds by every other worker. TIMEOUT 0 disables it.
+TOKEN_CACHE = {
+    'MAX_ENTRIES': int(os.getenv('TOKEN_CACHE_MAX_ENTRIES', '10000')),
+    'TIMEOUT': int(os.getenv('TOKEN_CACHE_TIMEOUT', '60')),
+}
+
+# Cache backend: process-local memory by default. Point CACHE_BACKEND and
+# CACHE_LOCATION at a shared backend (e.g.
+# django.core.cache.backends.redis.RedisCache and redis://127.0.0.1:6379/1)
+# so every worker sees the same response cache versions.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'task-manager'),
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '10000')),
+        },
+    }
+}
+
+# Cached list responses (see apps/core/response_cache.py), keyed on user,
+# a per-user version bumped by every write, and the query string.
+RESPONSE_CACHE = {
+    'ALIAS': os.getenv('RESPONSE_CACHE_ALIAS', 'default'),
+    'TIMEOUT': int(os.getenv('RESPONSE_CACHE_TIMEOUT', '300')),
+}
+
+# Delta sync (`GET /api/tasks/changes/`, see apps/tasks/sync.py). Tombstones
+# of deleted tasks and projects are kept TOMBSTONE_RETENTION_DAYS (purged by
+# `manage.py purge_tombstones`); older cursors must sync from scratch.
+# Changes younger than SETTLE_SECONDS wait for the next sync, so concurrent
+# transactions have committed before the cursor moves past them.
+SYNC = {
+    'TOMBSTONE_RETENTION_DAYS': int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', '30')),
+    'SETTLE_SECONDS': float(os.getenv('SYNC_SETTLE_SECONDS', '1')),
+    'PAGE_SIZE': 500,
+    'MAX_PAGE_SIZE': 1000,
+}
+
+# Server-Sent Events change feed (/api/events/). MemoryBroker only reaches
+# streams served by the writing process; with several workers, use
+# 'apps.core.events.RedisBroker' (needs the redis package and URL).
+EVENTS = {
+    'BROKER': os.getenv('EVENTS_BROKER', 'apps.core.events.MemoryBroker'),
+    'OPTIONS': {
+        'URL': os.getenv('EVENTS_REDIS_URL', 'redis://localhost:6379/0'),
+        'REPLAY': 10000,
+    },
+    'HEARTBEAT': 15,
+    'MAX_AGE': 300,
+    'QUEUE_SIZE': 100,
+}
+
+# Due-date reminders (`python manage.py send_reminders`, or a thread of
+# each web process with REMINDERS_IN_PROCESS=True).
+REMINDERS = {
+    'WINDOW_MINUTES': int(os.getenv('REMINDERS_WINDOW_MINUTES', '60')),
+    'LOOKBACK_MINUTES': 24 * 60,  # overdue tasks older than this are not reminded
+    'BATCH_SIZE': 1000,
+    'INTERVAL': 30,
+    'IN_PROCESS': os.getenv('REMINDERS_IN_PROCESS', 'False') == 'True',
+}
+
+# Webhook outbox, delivered by `python manage.py deliver_webhooks`.
+WEBHOOKS = {
+    'BATCH_SIZE': 100,  # events per POST
+    'CLAIM_SIZE': 1000,  # events leased per delivery round
+    'CONCURRENCY': int(os.getenv('WEBHOOKS_CONCURRENCY', '8')),
+    'TIMEOUT': float(os.getenv('WEBHOOKS_TIMEOUT', '5')),
+    'MAX_ATTEMPTS': 8,
+    'BACKOFF': 30,  # seconds before the first retry, doubling after each failure
+    'MAX_BACKOFF': 3600,
+    'LEASE': 300,
+    'TARGETS_CACHE_TIMEOUT': 300,
+    # Allow webhooks to internal hosts (loopback, private networks): local development only.
+    'ALLOW_PRIVATE_HOSTS': os.getenv('WEBHOOKS_ALLOW_PRIVATE_HOSTS', 'False') == 'True',
+}
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -0,0 +1,21 @@
+import logging
+
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """
+    The default runner, with the per-request `apps.core.metrics` lines kept
+    out of the test output. Tests about them capture them with `assertLogs`,
+    which sets the logger's level for its block.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        logger = logging.getLogger('apps.core.metrics')
+        self._metrics_level = logger.level
+        logger.setLevel(logging.CRITICAL + 1)
+
+    def teardown_test_environment(self, **kwargs):
+        logging.getLogger('apps.core.metrics').setLevel(self._metrics_level)
+        super().teardown_test_environment(**kwargs)
@@ -5,7 +5,7 @@ from django.conf.urls.static import static
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
-from apps.core.views import APIRootView  # Import the root view
+from apps.core.views import APIRootView, EventStreamView, MetricsView  # Import the root view
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -37,6 +37,9 @@ urlpatterns = [
     path('api/auth/', include('apps.accounts.urls')),
     path('api/tasks/', include('apps.tasks.urls')),
     path('api/projects/', include('apps.projects.urls')),
+    path('api/webhooks/', include('apps.webhooks.urls')),
+    path('api/events/', EventStreamView.as_view(), name='event-stream'),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
     
     # API Documentation
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
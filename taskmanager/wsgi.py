@@ -13,3 +13,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'taskmanager.settings')
 
 application = get_wsgi_application()
+
+# Due-date reminders in a thread of this process when REMINDERS['IN_PROCESS']
+# is set; otherwise run `python manage.py send_reminders`.
+from apps.tasks.reminders import start_worker  # noqa: E402
+
+start_worker()
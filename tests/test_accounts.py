@@ -3,6 +3,8 @@ from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from apps.accounts.token_cache import TokenCache, token_cache
 
 User = get_user_model()
 
@@ -103,4 +105,74 @@ class AccountsTests(TestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['email'], self.user_data['email'])
-        self.assertEqual(response.data['name'], self.user_data['name'])
\ No newline at end of file
+        self.assertEqual(response.data['name'], self.user_data['name'])
+
+
+class TokenCacheTests(TestCase):
+    """Test cases for the in-process token cache"""
+    
+    def setUp(self):
+        """Set up test data"""
+        token_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='cache@example.com',
+            name='Cache User',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.me_url = reverse('me')
+    
+    def test_repeat_requests_skip_token_query(self):
+        """Test that a cached token is resolved without a query"""
+        self.assertEqual(self.client.get(self.me_url).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.me_url)
+        self.assertEqual(response.data['email'], 'cache@example.com')
+        self.assertEqual(token_cache.stats()['hits'], 1)
+        self.assertEqual(token_cache.stats()['misses'], 1)
+    
+    def test_raw_token_header_uses_cache(self):
+        """Test that the raw '<token>' format shares the cache"""
+        self.client.get(self.me_url)
+        self.client.credentials(HTTP_AUTHORIZATION=self.token.key)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_logout_evicts_token(self):
+        """Test that a logged out token is rejected straight away"""
+        self.client.get(self.me_url)
+        response = self.client.post(reverse('logout'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_deactivation_and_password_change_evict_tokens(self):
+        """Test that saving the user drops its cached tokens"""
+        self.client.get(self.me_url)
+        self.user.set_password('newpass456')
+        self.user.save()
+        self.assertEqual(token_cache.stats()['size'], 0)
+        
+        self.client.get(self.me_url)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_cache_is_bounded_lru_with_ttl(self):
+        """Test eviction by size and by age"""
+        now = [0.0]
+        cache = TokenCache(max_entries=2, timeout=10, clock=lambda: now[0])
+        for key in ['a', 'b']:
+            cache.set(key, self.user, self.token)
+        cache.get('a')
+        cache.set('c', self.user, self.token)
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        
+        now[0] = 11
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['size'], 1)
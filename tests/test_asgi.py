@@ -0,0 +1,188 @@
+import asyncio
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+@override_settings(ROOT_URLCONF='taskmanager.asgi_urls')
+class AsyncEndpointTests(TestCase):
+    """Test cases for the async views served by the ASGI entry point"""
+    
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='async@example.com',
+            name='Async User',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.auth = {'Authorization': f'Token {self.token.key}'}
+        self.project = Project.objects.create(name='Async Project', user=self.user)
+        for i in range(12):
+            self.task = Task.objects.create(
+                title=f'Task {i}',
+                user=self.user,
+                project=self.project if i % 2 else None,
+                status=['pending', 'in_progress', 'completed'][i % 3]
+            )
+        self.tasks_url = reverse('task-list')
+        self.detail_url = reverse('task-detail', args=[self.task.id])
+    
+    def sync_get(self, url, params=None):
+        """The same request through the regular WSGI URLconf"""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        with self.settings(ROOT_URLCONF='taskmanager.urls'):
+            return client.get(url, params)
+    
+    def test_views_are_async(self):
+        """Test that the hot endpoints resolve to coroutine views"""
+        for url in [self.tasks_url, self.detail_url, reverse('task-toggle-complete', args=[self.task.id]),
+                    reverse('me'), reverse('login')]:
+            with self.subTest(url=url):
+                self.assertTrue(asyncio.iscoroutinefunction(resolve(url).func))
+        self.assertFalse(asyncio.iscoroutinefunction(resolve(reverse('task-stats')).func))
+    
+    async def test_list_matches_sync(self):
+        """Test that async list responses match the sync view byte for byte"""
+        for params in [
+            {},
+            {'page': 2},
+            {'status': 'pending', 'ordering': 'created_at'},
+            {'project': self.project.id},
+            {'pagination': 'cursor', 'page_size': 5},
+        ]:
+            with self.subTest(**params):
+                response = await self.async_client.get(self.tasks_url, params, headers=self.auth)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                expected = await asyncio.to_thread(self.sync_get, self.tasks_url, params)
+                self.assertEqual(response.content, expected.content)
+                self.assertEqual(response['ETag'], expected['ETag'])
+    
+    async def test_list_errors(self):
+        """Test authentication failures and invalid pages"""
+        response = await self.async_client.get(self.tasks_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.get(self.tasks_url, headers={'Authorization': 'Token invalid'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.get(self.tasks_url, {'page': 9}, headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    async def test_list_cache_and_not_modified(self):
+        """Test the response cache and conditional GET on the async list"""
+        first = await self.async_client.get(self.tasks_url, headers=self.auth)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        response = await self.async_client.get(self.tasks_url, headers=self.auth)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.content, first.content)
+        response = await self.async_client.get(self.tasks_url, headers={**self.auth, 'If-None-Match': first['ETag']})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    async def test_create(self):
+        """Test creating a task through the async list view"""
+        response = await self.async_client.post(
+            self.tasks_url, {'title': 'Async task', 'project': self.project.id},
+            content_type='application/json', headers=self.auth
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(await Task.objects.filter(user=self.user).acount(), 13)
+    
+    async def test_detail(self):
+        """Test task detail reads, conditional reads and writes"""
+        response = await self.async_client.get(self.detail_url, headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['title'], 'Task 11')
+        response = await self.async_client.get(
+            self.detail_url, headers={**self.auth, 'If-None-Match': response['ETag']}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        response = await self.async_client.patch(
+            self.detail_url, {'status': 'in_progress'}, content_type='application/json', headers=self.auth
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['status'], 'in_progress')
+        
+        response = await self.async_client.delete(self.detail_url, headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = await self.async_client.get(self.detail_url, headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    async def test_detail_of_other_user(self):
+        """Test that another user's task is not found"""
+        other = await User.objects.acreate(email='other@example.com', name='Other')
+        task = await Task.objects.acreate(title='Hidden', user=other)
+        response = await self.async_client.get(reverse('task-detail', args=[task.id]), headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    async def test_toggle(self):
+        """Test toggling completion and the project counters it maintains"""
+        url = reverse('task-toggle-complete', args=[self.task.id])
+        response = await self.async_client.post(url, headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['task']['status'], 'pending')
+        await self.project.arefresh_from_db()
+        self.assertEqual((self.project.task_count, self.project.completed_count), (6, 1))
+        
+        response = await self.async_client.post(url, headers=self.auth)
+        self.assertEqual(response.json()['task']['status'], 'completed')
+        response = await self.async_client.post(reverse('task-toggle-complete', args=[0]), headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    async def test_login_and_me(self):
+        """Test login and the current user profile"""
+        response = await self.async_client.post(
+            reverse('login'), {'email': 'async@example.com', 'password': 'testpass123'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['token'], self.token.key)
+        response = await self.async_client.post(
+            reverse('login'), {'email': 'async@example.com', 'password': 'wrong'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        response = await self.async_client.get(reverse('me'), headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['email'], 'async@example.com')
+        response = await self.async_client.get(reverse('me'), headers={'Authorization': self.token.key})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class AsgiUrlconfTests(TestCase):
+    """Test cases for picking the URLconf by the handler serving the request"""
+    
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='urlconf@example.com',
+            name='Urlconf User',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.tasks_url = reverse('task-list')
+    
+    async def test_asgi_requests_use_async_views(self):
+        """Test that requests of the ASGI handler are routed to the async views"""
+        response = await self.async_client.get(self.tasks_url, headers={'Authorization': f'Token {self.token.key}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(asyncio.iscoroutinefunction(response.resolver_match.func))
+    
+    def test_wsgi_requests_use_sync_views(self):
+        """Test that requests of the WSGI handler keep ROOT_URLCONF"""
+        response = self.client.get(self.tasks_url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(asyncio.iscoroutinefunction(response.resolver_match.func))
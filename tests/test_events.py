@@ -0,0 +1,216 @@
+import asyncio
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.core import events
+from apps.dashboard.views import quick_update_task
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+class EventPublishTests(TestCase):
+    """Test cases for the events published by the write paths"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            email='events@example.com',
+            name='Events User',
+            password='testpass123'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.project = Project.objects.create(name='Feed', user=self.user)
+        self.task = Task.objects.create(title='Existing', user=self.user, project=self.project)
+        patcher = mock.patch.object(events, 'broker', events.MemoryBroker())
+        self.broker = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def published(self):
+        return [(event.type, event.data) for event in self.broker.replay(self.user.pk, '0')]
+    
+    def test_task_api_writes(self):
+        """Test that creating, editing, toggling and deleting a task publish events"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('task-list'), {'title': 'New'}, format='json')
+        task_id = response.data['id']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('task-detail', args=[task_id]), {'title': 'Renamed'}, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task-toggle-complete', args=[task_id]))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('task-detail', args=[task_id]))
+        self.assertEqual(self.published(), [
+            ('task.created', {'ids': [task_id]}),
+            ('task.updated', {'ids': [task_id]}),
+            ('task.toggled', {'ids': [task_id]}),
+            ('task.deleted', {'ids': [task_id]}),
+        ])
+    
+    def test_queryset_update(self):
+        """Test that bulk status changes (the admin actions) publish one event per action"""
+        done = Task.objects.create(title='Done', user=self.user, status='completed')
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.filter(user=self.user).update(status='completed')
+        self.assertEqual(self.published(), [
+            ('task.toggled', {'ids': [self.task.id]}),
+            ('task.updated', {'ids': [done.id]}),
+        ])
+    
+    def test_dashboard_quick_update(self):
+        """Test that the dashboard's quick update publishes a toggle"""
+        request = RequestFactory().post(
+            f'/dashboard/tasks/{self.task.id}/', json.dumps({'status': 'completed'}), content_type='application/json'
+        )
+        request.user = self.user
+        with self.captureOnCommitCallbacks(execute=True):
+            quick_update_task(request, self.task.id)
+        self.assertEqual(self.published(), [('task.toggled', {'ids': [self.task.id]})])
+    
+    def test_project_writes(self):
+        """Test that creating, editing and deleting a project publish events"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('project-list'), {'name': 'Another'}, format='json')
+        project_id = response.data['id']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('project-detail', args=[project_id]), {'name': 'Renamed'}, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('project-detail', args=[project_id]))
+        self.assertEqual(self.published(), [
+            ('project.created', {'ids': [project_id]}),
+            ('project.updated', {'ids': [project_id]}),
+            ('project.deleted', {'ids': [project_id]}),
+        ])
+    
+    def test_rolled_back_writes(self):
+        """Test that writes rolled back publish nothing"""
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Task.objects.create(title='Gone', user=self.user)
+                raise RuntimeError
+        self.assertEqual(self.published(), [])
+    
+    def test_events_are_per_user(self):
+        """Test that another user's writes don't reach this user's feed"""
+        other = User.objects.create_user(email='other@example.com', name='Other', password='testpass123')
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(title='Not mine', user=other)
+        self.assertEqual(self.published(), [])
+        self.assertEqual(len(self.broker.replay(other.pk, '0')), 1)
+
+
+class EventStreamTests(TestCase):
+    """Test cases for the Server-Sent Events stream"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.broker = events.MemoryBroker(replay=100)
+    
+    async def test_replay_then_live(self):
+        """Test that a resumed stream replays missed events, then follows live ones"""
+        first = self.broker.publish(1, 'task.created', {'ids': [1]})
+        self.broker.publish(1, 'task.updated', {'ids': [1]})
+        self.broker.publish(2, 'task.created', {'ids': [2]})
+        stream = events.event_stream(1, first.id, source=self.broker)
+        try:
+            self.assertEqual(await anext(stream), 'retry: 3000\n\n')
+            self.assertEqual(await anext(stream), 'id: 2\nevent: task.updated\ndata: {"ids":[1]}\n\n')
+            self.broker.publish(1, 'task.deleted', {'ids': [1]})
+            self.assertEqual(await anext(stream), 'id: 4\nevent: task.deleted\ndata: {"ids":[1]}\n\n')
+        finally:
+            await stream.aclose()
+        self.assertEqual(len(self.broker.hub), 0)
+    
+    async def test_resync(self):
+        """Test that an id the broker no longer knows asks the client to resync"""
+        self.broker.publish(1, 'task.created', {'ids': [1]})
+        for last_event_id in ['99', 'garbage']:
+            stream = events.event_stream(1, last_event_id, source=self.broker)
+            try:
+                await anext(stream)
+                self.assertEqual(await anext(stream), 'event: resync\ndata: {}\n\n')
+            finally:
+                await stream.aclose()
+    
+    @override_settings(EVENTS={'HEARTBEAT': 0.01, 'MAX_AGE': 0.05})
+    async def test_heartbeat_and_max_age(self):
+        """Test that idle streams send heartbeats and end after MAX_AGE"""
+        chunks = [chunk async for chunk in events.event_stream(1, source=self.broker)]
+        self.assertIn(': keepalive\n\n', chunks)
+        self.assertEqual(len(self.broker.hub), 0)
+    
+    @override_settings(EVENTS={'QUEUE_SIZE': 2})
+    async def test_slow_stream_is_closed(self):
+        """Test that a stream falling behind ends instead of buffering without bound"""
+        stream = events.event_stream(1, source=self.broker)
+        await anext(stream)
+        for i in range(5):
+            self.broker.publish(1, 'task.created', {'ids': [i]})
+        await asyncio.sleep(0)
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+        self.assertEqual(len(self.broker.hub), 0)
+    
+    async def test_fan_out(self):
+        """Test that one event reaches thousands of idle streams of the same user"""
+        subscriptions = [self.broker.subscribe(1) for _ in range(2000)]
+        self.broker.subscribe(2)
+        event = self.broker.publish(1, 'project.updated', {'ids': [7]})
+        await asyncio.sleep(0)
+        self.assertEqual(len(self.broker.hub), 2001)
+        for subscription in subscriptions:
+            self.assertIs(subscription.queue.get_nowait(), event)
+
+
+class EventStreamViewTests(TestCase):
+    """Test cases for the event stream endpoint"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            email='stream@example.com',
+            name='Stream User',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.url = reverse('event-stream')
+    
+    async def test_requires_authentication(self):
+        """Test that the stream rejects anonymous clients with an error event"""
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertTrue(response.content.startswith(b'event: error\ndata: '))
+    
+    @override_settings(EVENTS={'MAX_AGE': 0.05})
+    async def test_stream(self):
+        """Test that the stream resumes from Last-Event-ID"""
+        broker = events.MemoryBroker()
+        event = broker.publish(self.user.pk, 'task.created', {'ids': [1]})
+        broker.publish(self.user.pk, 'task.deleted', {'ids': [1]})
+        with mock.patch.object(events, 'broker', broker):
+            response = await self.async_client.get(
+                self.url, headers={'Authorization': f'Token {self.token.key}', 'Last-Event-ID': event.id}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            self.assertEqual(response['Cache-Control'], 'no-cache')
+            body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(body, b'retry: 3000\n\nid: 2\nevent: task.deleted\ndata: {"ids":[1]}\n\n')
+    
+    def test_not_served_by_wsgi(self):
+        """Test that the WSGI entry point refuses to hold streams open"""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        response = client.get(self.url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
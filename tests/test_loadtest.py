@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, F
+from django.test import LiveServerTestCase, TestCase
+
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+class SeedDataTests(TestCase):
+    """Test cases for the seed_data command"""
+    
+    def seed(self, *args):
+        out = StringIO()
+        call_command('seed_data', '--users', '5', '--projects', '12', '--tasks', '300', *args, stdout=out)
+        return out.getvalue()
+    
+    def test_seeds_users_projects_and_tasks(self):
+        """Test that the requested counts are created with mixed values and consistent project counters"""
+        output = self.seed()
+        self.assertIn('Seeded 5 users, 12 projects and 300 tasks', output)
+        users = User.objects.filter(email__startswith='seed-')
+        self.assertEqual(users.count(), 5)
+        self.assertTrue(users.first().check_password('seed-password'))
+        self.assertEqual(Project.objects.count(), 12)
+        self.assertEqual(Task.objects.count(), 300)
+        self.assertEqual(set(Task.objects.values_list('status', flat=True)), {'pending', 'in_progress', 'completed'})
+        self.assertEqual(set(Task.objects.values_list('priority', flat=True)), {'low', 'medium', 'high'})
+        self.assertTrue(Task.objects.filter(due_date__isnull=True).exists())
+        self.assertTrue(Task.objects.filter(description='').exists())
+        self.assertFalse(Task.objects.filter(status='completed', completed_at__isnull=True).exists())
+        # Tasks only go in their owner's projects, and the counters include them
+        self.assertFalse(Task.objects.exclude(project=None).exclude(project__user=F('user')).exists())
+        self.assertFalse(Project.objects.drifted().exists())
+        # Skewed: the heaviest user has more than the average
+        heaviest = users.annotate(count=Count('tasks')).order_by('-count').first()
+        self.assertGreater(heaviest.count, 60)
+    
+    def test_same_seed_same_data(self):
+        """Test that the data only depends on the seed, and existing seed users need --clear"""
+        self.seed()
+        titles = list(Task.objects.order_by('id').values_list('title', 'status', 'priority'))
+        with self.assertRaises(CommandError):
+            self.seed()
+        self.seed('--clear')
+        self.assertEqual(list(Task.objects.order_by('id').values_list('title', 'status', 'priority')), titles)
+
+
+class LoadTestTests(LiveServerTestCase):
+    """Test cases for the loadtest command, against a live server"""
+    
+    def setUp(self):
+        """Seed a few users and a report directory"""
+        call_command('seed_data', '--users', '2', '--projects', '4', '--tasks', '60', stdout=StringIO())
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+    
+    def loadtest(self, *args):
+        out = StringIO()
+        call_command('loadtest', '--url', self.live_server_url, '--concurrency', '1', '--users', '2',
+                     '--requests', '40', *args, stdout=out)
+        return out.getvalue()
+    
+    def test_report(self):
+        """Test that every endpoint is exercised and the JSON report has throughput and percentiles"""
+        output = os.path.join(self.directory, 'run.json')
+        self.assertIn('Report written to', self.loadtest('--output', output, '--label', 'baseline'))
+        with open(output) as f:
+            report = json.load(f)
+        self.assertEqual(report['label'], 'baseline')
+        # 40 requests after logging in, listing the projects and the tasks
+        self.assertEqual(report['total']['requests'], 43)
+        self.assertEqual(report['total']['errors'], 0)
+        self.assertEqual(set(report['scenarios']) - {'login', 'project-list'}, {
+            'task-list', 'task-filter', 'task-search', 'task-ordering', 'task-detail', 'task-toggle',
+            'project-detail',
+        })
+        for key in ('requests_per_second', 'p50_ms', 'p95_ms', 'p99_ms'):
+            self.assertIn(key, report['total'])
+        self.assertLessEqual(report['total']['p50_ms'], report['total']['p99_ms'])
+        
+        compared = self.loadtest('--output', os.path.join(self.directory, 'next.json'), '--compare', output)
+        self.assertIn('vs previous', compared)
+    
+    def test_unknown_users(self):
+        """Test that the command fails when no client can log in"""
+        with self.assertRaises(CommandError):
+            self.loadtest('--prefix', 'missing', '--output', os.path.join(self.directory, 'run.json'))
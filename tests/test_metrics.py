@@ -0,0 +1,115 @@
+import json
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.core import metrics
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+def parse_server_timing(header):
+    entries = {}
+    for entry in header.split(', '):
+        name, *params = entry.split(';')
+        entries[name] = dict(param.split('=', 1) for param in params)
+    return entries
+
+
+class RequestMetricsTests(TestCase):
+    """Test cases for the request metrics middleware"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='metrics@example.com',
+            name='Metrics User',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        for i in range(3):
+            Task.objects.create(title=f'Task {i}', user=self.user)
+        self.tasks_url = reverse('task-list')
+    
+    def test_server_timing(self):
+        """Test that responses carry the query count and the db, auth and serialize timings"""
+        response = self.client.get(self.tasks_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(set(timing), {'db', 'auth', 'serialize', 'total'})
+        # Token lookup, page count and the page, as in test_list_tasks_query_count_is_fixed
+        self.assertEqual(timing['db']['desc'], '"3 queries"')
+        for name in timing:
+            self.assertRegex(timing[name]['dur'], r'^\d+\.\d\d$')
+        self.assertLessEqual(float(timing['db']['dur']), float(timing['total']['dur']))
+    
+    @override_settings(ROOT_URLCONF='taskmanager.asgi_urls')
+    async def test_async_views(self):
+        """Test that queries run by async views and their threads are counted"""
+        response = await self.async_client.get(self.tasks_url, headers={'Authorization': f'Token {self.token.key}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = parse_server_timing(response['Server-Timing'])
+        self.assertEqual(timing['db']['desc'], '"3 queries"')
+        self.assertIn('auth', timing)
+    
+    @override_settings(REQUEST_METRICS={'LATENCY_BUDGET_MS': None})
+    def test_log_lines(self):
+        """Test that every request is logged as one JSON line at INFO"""
+        with self.assertLogs('apps.core.metrics', 'INFO') as logs:
+            self.client.get(reverse('task-detail', args=[Task.objects.first().id]))
+        self.assertEqual(logs.records[0].levelname, 'INFO')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['route'], 'task-detail')
+        self.assertEqual((record['method'], record['status'], record['budget_exceeded']), ('GET', 200, []))
+        self.assertEqual(record['queries'], 2)
+        self.assertEqual(set(record), {
+            'method', 'path', 'route', 'status', 'queries', 'db_ms', 'auth_ms', 'serialize_ms', 'total_ms',
+            'budget_exceeded',
+        })
+    
+    @override_settings(REQUEST_METRICS={'QUERY_BUDGET': 2, 'LATENCY_BUDGET_MS': 0,
+                                        'ROUTES': {'task-detail': {'QUERY_BUDGET': None, 'LATENCY_BUDGET_MS': None}}})
+    def test_budgets(self):
+        """Test that requests over budget are logged as warnings, with per-route overrides"""
+        with self.assertLogs('apps.core.metrics', 'WARNING') as logs:
+            self.client.get(self.tasks_url)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['budget_exceeded'], ['queries', 'latency'])
+        
+        with self.assertLogs('apps.core.metrics', 'INFO') as logs:
+            self.client.get(reverse('task-detail', args=[Task.objects.first().id]))
+        self.assertEqual(logs.records[0].levelname, 'INFO')
+    
+    @override_settings(REQUEST_METRICS={'ENABLED': False})
+    def test_disabled(self):
+        """Test that the middleware can be switched off"""
+        response = self.client.get(self.tasks_url)
+        self.assertNotIn('Server-Timing', response)
+    
+    def test_queries_outside_requests(self):
+        """Test that queries outside a request are not counted, and the wrapper is installed once"""
+        self.assertIsNone(metrics.current())
+        self.assertEqual(connection.execute_wrappers.count(metrics.record_query), 1)
+        metrics.install(None, connection)
+        self.assertEqual(connection.execute_wrappers.count(metrics.record_query), 1)
+        current, token = metrics.activate()
+        try:
+            Task.objects.count()
+            with metrics.timing('serialize'), metrics.timing('serialize'):
+                pass
+        finally:
+            metrics.deactivate(token)
+        Task.objects.count()
+        self.assertEqual(current.queries, 1)
+        self.assertEqual(list(current.timings), ['serialize'])
+        self.assertTrue(re.match(r'db;dur=[\d.]+;desc="1 queries", serialize;dur=[\d.]+, total;dur=[\d.]+$',
+                                 metrics.server_timing(current, current.elapsed())))
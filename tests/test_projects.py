@@ -88,6 +88,25 @@ class ProjectTests(TestCase):
         self.assertEqual(len(data), 1)  # Only user's project
         self.assertEqual(data[0]['name'], 'Test Project')
     
+    def test_list_projects_cached(self):
+        """Test that the project list is cached until a project or task changes"""
+        from django.core.cache import cache
+        cache.clear()
+        self.client.get(self.projects_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.projects_url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        
+        Task.objects.create(title='Counted', user=self.user, project=self.project)
+        response = self.client.get(self.projects_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['task_count'], 1)
+        
+        self.client.patch(reverse('project-detail', args=[self.project.id]), {'name': 'Renamed'}, format='json')
+        response = self.client.get(self.projects_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['name'], 'Renamed')
+    
     def test_project_detail_with_tasks(self):
         """Test getting project details with associated tasks"""
         # Create tasks for this project
@@ -114,6 +133,105 @@ class ProjectTests(TestCase):
         self.assertEqual(response.data['completed_tasks'], 1)
         self.assertEqual(len(response.data['tasks']), 2)
     
+    def test_list_projects_counts_in_one_query(self):
+        """Test that task counts are annotated instead of counted per project"""
+        for i in range(3):
+            project = Project.objects.create(name=f'Project {i}', user=self.user)
+            for status_value in ['pending', 'completed', 'completed'][:i + 1]:
+                Task.objects.create(title='Task', user=self.user, project=project, status=status_value)
+        
+        # Token lookup, page count and the annotated page itself.
+        with self.assertNumQueries(3):
+            response = self.client.get(self.projects_url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counts = {
+            project['name']: (project['task_count'], project['completed_tasks'])
+            for project in response.data['results']
+        }
+        self.assertEqual(counts, {
+            'Test Project': (0, 0),
+            'Project 0': (1, 0),
+            'Project 1': (2, 1),
+            'Project 2': (3, 2),
+        })
+    
+    def test_order_projects_by_task_count(self):
+        """Test server-side ordering on the annotated counts"""
+        busy = Project.objects.create(name='Busy Project', user=self.user)
+        for status_value in ['pending', 'completed']:
+            Task.objects.create(title='Task', user=self.user, project=busy, status=status_value)
+        
+        response = self.client.get(self.projects_url, {'ordering': '-task_count'})
+        names = [project['name'] for project in response.data['results']]
+        self.assertEqual(names, ['Busy Project', 'Test Project'])
+        
+        response = self.client.get(self.projects_url, {'ordering': 'completed_tasks'})
+        names = [project['name'] for project in response.data['results']]
+        self.assertEqual(names, ['Test Project', 'Busy Project'])
+    
+    def test_project_detail_tasks_are_bounded(self):
+        """Test that nested tasks are capped and paginated by cursor"""
+        for i in range(5):
+            Task.objects.create(
+                title=f'Task {i}',
+                user=self.user,
+                project=self.project,
+                status='completed' if i % 2 else 'pending'
+            )
+        
+        # Token lookup, the annotated project and one slice of tasks.
+        with self.assertNumQueries(3):
+            response = self.client.get(self.project_detail_url, {'tasks_page_size': 2})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['task_count'], 5)
+        self.assertEqual([task['title'] for task in response.data['tasks']], ['Task 4', 'Task 3'])
+        self.assertEqual(response.data['tasks'][0]['project_name'], 'Test Project')
+        
+        titles = []
+        while response.data['tasks_next']:
+            response = self.client.get(response.data['tasks_next'])
+            titles.extend(task['title'] for task in response.data['tasks'])
+        self.assertEqual(titles, ['Task 2', 'Task 1', 'Task 0'])
+    
+    def test_project_detail_tasks_filtered_by_status(self):
+        """Test filtering the nested tasks by status"""
+        Task.objects.create(title='Open', user=self.user, project=self.project)
+        Task.objects.create(title='Done', user=self.user, project=self.project, status='completed')
+        
+        response = self.client.get(self.project_detail_url, {'tasks_status': 'completed'})
+        self.assertEqual([task['title'] for task in response.data['tasks']], ['Done'])
+        self.assertIsNone(response.data['tasks_next'])
+        
+        response = self.client.get(self.project_detail_url, {'tasks_status': 'bogus'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_project_fieldsets(self):
+        """Test `?fields=`/`?exclude=` on the project list and detail"""
+        project = Project.objects.create(name='Sparse', description='Long text', user=self.user)
+        Task.objects.create(title='Nested', user=self.user, project=project)
+        response = self.client.get(self.projects_url, {'fields': 'id,name'})
+        self.assertIn({'id': project.id, 'name': 'Sparse'}, response.data['results'])
+        self.assertTrue(all(list(item) == ['id', 'name'] for item in response.data['results']))
+        
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        detail_url = reverse('project-detail', args=[project.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(detail_url, {'exclude': 'description,tasks,tasks_next'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('tasks', response.data)
+        self.assertNotIn('description', response.data)
+        self.assertEqual(response.data['task_count'], 1)
+        # Neither the description nor the nested task page is read
+        project_sql = [query['sql'] for query in queries.captured_queries if 'FROM "projects_project"' in query['sql']]
+        self.assertFalse(any('"description"' in sql for sql in project_sql))
+        self.assertFalse(any('"title"' in sql for sql in project_sql))
+        
+        response = self.client.get(detail_url, {'fields': 'name,owner'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
     def test_update_project(self):
         """Test updating a project"""
         data = {'name': 'Updated Project Name'}
@@ -139,4 +257,166 @@ class ProjectTests(TestCase):
         url = reverse('project-detail', args=[other_project.id])
         response = self.client.get(url)
         
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+class ProjectCounterTests(TestCase):
+    """Test cases for the denormalized project task counters"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            email='counters@example.com',
+            name='Counter User',
+            password='testpass123'
+        )
+        self.alpha = Project.objects.create(name='Alpha', user=self.user)
+        self.beta = Project.objects.create(name='Beta', user=self.user)
+    
+    def assertCounts(self, project, total, completed):
+        project.refresh_from_db()
+        self.assertEqual((project.task_count, project.completed_count), (total, completed))
+        self.assertFalse(Project.objects.drifted().exists())
+    
+    def test_counters_follow_model_writes(self):
+        """Test create, status change, project move and delete through save()/delete()"""
+        task = Task.objects.create(title='One', user=self.user, project=self.alpha)
+        Task.objects.create(title='Two', user=self.user, project=self.alpha, status='completed')
+        self.assertCounts(self.alpha, 2, 1)
+        
+        task.status = 'completed'
+        task.save()
+        self.assertCounts(self.alpha, 2, 2)
+        
+        task.project = self.beta
+        task.save()
+        self.assertCounts(self.alpha, 1, 1)
+        self.assertCounts(self.beta, 1, 1)
+        
+        task.title = 'Renamed'
+        task.project = None
+        task.save(update_fields=['title'])
+        self.assertCounts(self.beta, 1, 1)
+        
+        Task.objects.get(pk=task.pk).delete()
+        self.assertCounts(self.beta, 0, 0)
+    
+    def test_counters_follow_set_based_writes(self):
+        """Test queryset update/delete and bulk create/update"""
+        from django.db.models import Case, Value, When
+        tasks = Task.objects.bulk_create([
+            Task(title=f'Task {i}', user=self.user, project=self.alpha if i % 2 else self.beta)
+            for i in range(6)
+        ])
+        self.assertCounts(self.alpha, 3, 0)
+        self.assertCounts(self.beta, 3, 0)
+        
+        Task.objects.filter(project=self.alpha).update(status='completed')
+        self.assertCounts(self.alpha, 3, 3)
+        
+        self.beta.tasks.filter(title='Task 0').update(project=self.alpha)
+        self.assertCounts(self.alpha, 4, 3)
+        self.assertCounts(self.beta, 2, 0)
+        
+        Task.objects.filter(project=self.alpha).update(
+            status=Case(When(title='Task 1', then=Value('pending')), default='status')
+        )
+        self.assertCounts(self.alpha, 4, 2)
+        
+        for task in tasks:
+            task.refresh_from_db()
+            task.project = self.beta
+        Task.objects.bulk_update(tasks[:2], ['project'])
+        self.assertCounts(self.alpha, 2, 2)
+        self.assertCounts(self.beta, 4, 0)
+        
+        Task.objects.filter(status='completed').delete()
+        self.assertCounts(self.alpha, 0, 0)
+        self.assertCounts(self.beta, 4, 0)
+    
+    def test_admin_actions_and_changelist(self):
+        """Test that admin actions keep the counters and the changelist does not count"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        admin = User.objects.create_superuser(email='admin@example.com', name='Admin', password='adminpass123')
+        for i in range(3):
+            Task.objects.create(title=f'Task {i}', user=self.user, project=self.alpha)
+        self.client.force_login(admin)
+        
+        response = self.client.post(reverse('admin:tasks_task_changelist'), {
+            'action': 'mark_as_completed',
+            '_selected_action': list(self.alpha.tasks.values_list('pk', flat=True)[:2]),
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertCounts(self.alpha, 3, 2)
+        
+        for i in range(10):
+            Project.objects.create(name=f'Extra {i}', user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:projects_project_changelist'))
+        self.assertContains(response, 'Alpha')
+        self.assertFalse([query for query in queries.captured_queries if 'tasks_task' in query['sql']])
+    
+    def test_reconcile_command(self):
+        """Test that drifted counters are reported and repaired"""
+        from io import StringIO
+        from django.core.management import call_command
+        Task.objects.create(title='One', user=self.user, project=self.alpha, status='completed')
+        Project.objects.filter(pk=self.alpha.pk).update(task_count=7, completed_count=0)
+        
+        out = StringIO()
+        call_command('reconcile_project_counts', dry_run=True, stdout=out)
+        self.assertIn(f'Project {self.alpha.pk}: 0/7 stored, 1/1 counted', out.getvalue())
+        self.assertTrue(Project.objects.drifted().exists())
+        
+        call_command('reconcile_project_counts', stdout=StringIO())
+        self.assertCounts(self.alpha, 1, 1)
+
+
+class ProjectConditionalRequestTests(TestCase):
+    """Test cases for ETag/Last-Modified validators on project detail"""
+    
+    def setUp(self):
+        """Set up test data"""
+        from rest_framework.authtoken.models import Token
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='projectetag@example.com',
+            name='Project ETag User',
+            password='testpass123'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.project = Project.objects.create(name='Launch', user=self.user)
+        self.task = Task.objects.create(title='Plan', user=self.user, project=self.project)
+        self.detail_url = reverse('project-detail', args=[self.project.id])
+    
+    def test_detail_not_modified(self):
+        """Test that an unchanged project answers 304 with a single query"""
+        etag = self.client.get(self.detail_url)['ETag']
+        self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)  # warm the token cache
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        response = self.client.get(self.detail_url, {'tasks_status': 'completed'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_nested_task_changes_change_etag(self):
+        """Test that edits to the embedded tasks invalidate the project ETag"""
+        etag = self.client.get(self.detail_url)['ETag']
+        self.task.title = 'Renamed'
+        self.task.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['tasks'][0]['title'], 'Renamed')
+    
+    def test_if_match_on_update(self):
+        """Test optimistic concurrency on project updates"""
+        etag = self.client.get(self.detail_url)['ETag']
+        Task.objects.create(title='Concurrent', user=self.user, project=self.project)
+        response = self.client.patch(self.detail_url, {'name': 'Stale'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        
+        etag = self.client.get(self.detail_url)['ETag']
+        response = self.client.patch(self.detail_url, {'name': 'Fresh'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
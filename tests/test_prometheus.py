@@ -0,0 +1,158 @@
+import multiprocessing
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.accounts.token_cache import token_cache
+from apps.core import prometheus
+from apps.core.prometheus import MetricsStore
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+def serve_requests(store, count):
+    """Run in a forked worker: record requests and write them out."""
+    for i in range(count):
+        store.observe_request('task-list', 'GET', 200, 0.02, 3, 0.001)
+    store.flush()
+
+
+class MetricsEndpointTests(TestCase):
+    """Test cases for the Prometheus metrics endpoint"""
+    
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.addCleanup(cache.clear)
+        token_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='prometheus@example.com',
+            name='Prometheus User',
+            password='testpass123'
+        )
+        self.staff = User.objects.create_user(
+            email='scraper@example.com',
+            name='Scraper',
+            password='testpass123',
+            is_staff=True
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.task = Task.objects.create(title='Task', user=self.user)
+        self.metrics_url = reverse('metrics')
+        self.store = MetricsStore(buckets=(0.1, 1.0))
+        patcher = mock.patch.object(prometheus, 'store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def scrape(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.staff).key}')
+        response = self.client.get(self.metrics_url, HTTP_ACCEPT='text/plain;version=0.0.4;q=0.5,*/*;q=0.1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        return response.content.decode().splitlines()
+    
+    def test_staff_only(self):
+        """Test that only staff users can read the metrics"""
+        response = self.client.get(self.metrics_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        response = self.client.get(self.metrics_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(response.content.startswith(b'# detail: '))
+    
+    def test_requests_by_route(self):
+        """Test that requests are counted per route, method and status, with latency and queries"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.client.get(reverse('task-list'))
+        self.client.get(reverse('task-list'))
+        self.client.get(reverse('task-detail', args=[self.task.id + 1]))
+        self.client.post(reverse('task-toggle-complete', args=[self.task.id]))
+        self.client.get('/api/missing/')
+        
+        lines = self.scrape()
+        self.assertIn('# TYPE http_requests_total counter', lines)
+        self.assertIn('http_requests_total{method="GET",route="task-list",status="200"} 2', lines)
+        self.assertIn('http_requests_total{method="GET",route="task-detail",status="404"} 1', lines)
+        self.assertIn('http_requests_total{method="POST",route="task-toggle-complete",status="200"} 1', lines)
+        self.assertIn('http_requests_total{method="GET",route="unmatched",status="404"} 1', lines)
+        # Token lookup, page count and the page; the second list is a cache hit
+        self.assertIn('http_request_db_queries_total{route="task-list"} 3', lines)
+        self.assertIn('http_request_duration_seconds_bucket{method="GET",route="task-list",le="+Inf"} 2', lines)
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="task-list"} 2', lines)
+        self.assertTrue(any(
+            line.startswith('http_request_duration_seconds_bucket{method="GET",route="task-list",le="0.1"} ')
+            for line in lines
+        ))
+    
+    def test_cache_hit_ratio(self):
+        """Test that the hits and misses of registered caches are exposed with their ratio"""
+        self.store.register_cache('response', SimpleNamespace(hits=3, misses=1))
+        lines = self.scrape()
+        self.assertIn('cache_requests_total{cache="response",result="hit"} 3', lines)
+        self.assertIn('cache_requests_total{cache="response",result="miss"} 1', lines)
+        self.assertIn('cache_hit_ratio{cache="response"} 0.75', lines)
+    
+    @override_settings(PROMETHEUS={'ENABLED': False})
+    def test_disabled(self):
+        """Test that requests are not counted when disabled"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.client.get(reverse('task-list'))
+        self.assertEqual(self.store.collect(), ({}, {}))
+
+
+class MetricsStoreTests(TestCase):
+    """Test cases for aggregating metrics over worker processes"""
+    
+    def setUp(self):
+        """Set up a metrics directory"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+    
+    def test_worker_processes_are_summed(self):
+        """Test that each forked worker writes its own file and the reader sums them"""
+        store = MetricsStore(self.directory, flush_interval=3600, buckets=(0.01, 0.1))
+        store.observe_request('task-list', 'GET', 200, 0.5, 1, 0.001)
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=serve_requests, args=(store, count)) for count in (2, 3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+        
+        lines = store.render().splitlines()
+        self.assertIn('http_requests_total{method="GET",route="task-list",status="200"} 6', lines)
+        self.assertIn('http_request_db_queries_total{route="task-list"} 16', lines)
+        self.assertIn('http_request_duration_seconds_bucket{method="GET",route="task-list",le="0.01"} 0', lines)
+        self.assertIn('http_request_duration_seconds_bucket{method="GET",route="task-list",le="0.1"} 5', lines)
+        self.assertIn('http_request_duration_seconds_bucket{method="GET",route="task-list",le="+Inf"} 6', lines)
+    
+    def test_flush(self):
+        """Test that the process's file is rewritten with its totals"""
+        store = MetricsStore(self.directory, flush_interval=3600)
+        store.observe_request('task-list', 'BREW', 200, 0.01, 1, 0.001)
+        store.flush()
+        store.observe_request('task-list', 'BREW', 200, 0.01, 1, 0.001)
+        store.flush()
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+        counters, histograms = MetricsStore(self.directory).collect()
+        self.assertEqual(counters[('http_requests_total', (('method', 'other'), ('route', 'task-list'),
+                                                           ('status', '200')))], 2)
+    
+    def test_label_escaping(self):
+        """Test that label values are escaped"""
+        store = MetricsStore()
+        store.observe_request('a"b\\c', 'GET', 200, 0.01, 0, 0)
+        self.assertIn('route="a\\"b\\\\c"', store.render())
@@ -0,0 +1,138 @@
+import re
+import unittest
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.projects.models import Project
+from apps.tasks import stats
+from apps.tasks.reminders import ReminderScheduler
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+# A plan line is a regression if SQLite has to read a whole table or sort
+# rows in a temporary B-tree instead of walking an index in order.
+BAD_PLAN = re.compile(r'\bSCAN (TABLE )?(tasks_task|tasks_tombstone|tasks_taskreminder|projects_project)\b|USE TEMP B-TREE')
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+class QueryPlanTests(TestCase):
+    """
+    Capture `EXPLAIN QUERY PLAN` for every query an endpoint runs and fail
+    when any of them falls back to a full scan or a temp B-tree sort.
+    """
+
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='plans@example.com',
+            name='Plan User',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+        self.project = Project.objects.create(name='Plan Project', user=self.user)
+        for i in range(6):
+            Task.objects.create(
+                title=f'Task {i}',
+                user=self.user,
+                project=self.project if i % 2 else None,
+                status=['pending', 'in_progress', 'completed'][i % 3],
+                due_date=timezone.now() + timedelta(days=i)
+            )
+        self.task = Task.objects.filter(user=self.user).first()
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertPlansUseIndexes(self, queries):
+        selects = [query['sql'] for query in queries if query['sql'].startswith('SELECT')]
+        self.assertTrue(selects)
+        for sql in selects:
+            plan = self.explain(sql)
+            bad = [line for line in plan if BAD_PLAN.search(line)]
+            self.assertFalse(bad, f'\n{sql}\n' + '\n'.join(plan))
+
+    def assertEndpointUsesIndexes(self, method, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, params)
+        self.assertLess(response.status_code, 400, response.content)
+        self.assertPlansUseIndexes(queries.captured_queries)
+        return response
+
+    def test_task_list_plans(self):
+        """Test the task list for every filter and ordering"""
+        url = reverse('task-list')
+        for params in [
+            {},
+            {'status': 'pending'},
+            {'priority': 'high'},
+            {'project': self.project.id},
+            {'ordering': 'due_date'},
+            {'ordering': '-priority'},
+            {'status': 'completed', 'ordering': '-created_at'},
+            # Ranked search sorts its matches; unranked search must not sort.
+            {'search': 'task', 'ordering': '-created_at'},
+        ]:
+            with self.subTest(**params):
+                self.assertEndpointUsesIndexes('get', url, params)
+
+    def test_task_list_cursor_plans(self):
+        """Test keyset pages, including the seek predicate of a later page"""
+        url = reverse('task-list')
+        for ordering in ['-created_at', 'due_date', '-due_date', 'priority']:
+            with self.subTest(ordering=ordering):
+                params = {'pagination': 'cursor', 'page_size': 2, 'ordering': ordering}
+                response = self.assertEndpointUsesIndexes('get', url, params)
+                self.assertEndpointUsesIndexes('get', response.data['next'])
+
+    def test_task_detail_plans(self):
+        """Test task detail and toggle"""
+        self.assertEndpointUsesIndexes('get', reverse('task-detail', args=[self.task.id]))
+        self.assertEndpointUsesIndexes('post', reverse('task-toggle-complete', args=[self.task.id]))
+
+    @override_settings(SYNC={'SETTLE_SECONDS': 0})
+    def test_task_changes_plans(self):
+        """Test the delta sync reads, first sync and from a cursor"""
+        url = reverse('task-changes')
+        response = self.assertEndpointUsesIndexes('get', url, {'page_size': 2})
+        Task.objects.filter(pk=self.task.pk).delete()
+        self.assertEndpointUsesIndexes('get', url, {'cursor': response.data['cursor'], 'page_size': 2})
+
+    def test_project_plans(self):
+        """Test project list and detail"""
+        self.assertEndpointUsesIndexes('get', reverse('project-list'))
+        self.assertEndpointUsesIndexes('get', reverse('project-detail', args=[self.project.id]))
+
+    def test_dashboard_plans(self):
+        """Test the dashboard statistics and open-task shapes"""
+        tasks = Task.objects.filter(user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            tasks.count()
+            tasks.filter(status='completed').count()
+            tasks.filter(status='pending').count()
+            list(tasks.exclude(status='completed').order_by('due_date')[:10])
+            stats.compute_summary(self.user)
+        self.assertPlansUseIndexes(queries.captured_queries)
+
+    def test_reminder_plans(self):
+        """Test that the reminder scheduler walks the open due-date index"""
+        scheduler = ReminderScheduler(batch_size=2)
+        with CaptureQueriesContext(connection) as queries:
+            scheduler.run_pending(timezone.now() + timedelta(days=2))
+        self.assertPlansUseIndexes(queries.captured_queries)
+        select = next(query['sql'] for query in queries.captured_queries if query['sql'].startswith('SELECT'))
+        plan = self.explain(select)
+        self.assertIn('task_open_due_idx', ' '.join(plan))
@@ -0,0 +1,116 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.core import events
+from apps.tasks.models import Task, TaskReminder
+from apps.tasks.reminders import ReminderScheduler, ReminderWorker, start_worker
+from apps.webhooks.models import Webhook, WebhookEvent
+
+User = get_user_model()
+
+
+class ReminderSchedulerTests(TestCase):
+    """Test cases for due-date reminders"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            email='reminders@example.com',
+            name='Reminder User',
+            password='testpass123'
+        )
+        self.now = timezone.now()
+        self.scheduler = ReminderScheduler(window=timedelta(hours=1), lookback=timedelta(hours=24), batch_size=2)
+    
+    def task(self, title, due_in, status='pending'):
+        due_date = None if due_in is None else self.now + due_in
+        return Task.objects.create(title=title, user=self.user, status=status, due_date=due_date)
+    
+    def reminded(self):
+        return set(TaskReminder.objects.values_list('task__title', flat=True))
+    
+    def test_reminds_open_tasks_entering_the_window(self):
+        """Test that only open tasks due within the window, or recently overdue, are reminded"""
+        self.task('Soon', timedelta(minutes=30))
+        self.task('Just overdue', timedelta(hours=-1))
+        self.task('Later', timedelta(hours=2))
+        self.task('Done', timedelta(minutes=30), status='completed')
+        self.task('Undated', None)
+        self.task('Long overdue', timedelta(days=-2))
+        self.assertEqual(self.scheduler.run_pending(self.now), 2)
+        self.assertEqual(self.reminded(), {'Soon', 'Just overdue'})
+        self.assertEqual(self.scheduler.run_pending(self.now), 0)
+        
+        self.assertEqual(self.scheduler.run_pending(self.now + timedelta(hours=1)), 1)
+        self.assertIn('Later', self.reminded())
+    
+    def test_batches(self):
+        """Test that work is claimed in batches until nothing is due"""
+        for i in range(5):
+            self.task(f'Task {i}', timedelta(minutes=i + 1))
+        self.assertEqual(self.scheduler.claim(self.now), 2)
+        self.assertEqual(self.scheduler.run_pending(self.now), 3)
+        self.assertEqual(TaskReminder.objects.count(), 5)
+    
+    def test_due_date_edits_and_completion(self):
+        """Test that moving the due date re-arms the reminder and completing a task disarms it"""
+        task = self.task('Moved', timedelta(minutes=10))
+        self.scheduler.run_pending(self.now)
+        task.due_date = self.now + timedelta(minutes=40)
+        task.save()
+        self.assertEqual(self.scheduler.run_pending(self.now), 1)
+        self.assertEqual(TaskReminder.objects.filter(task=task).count(), 2)
+        
+        task.due_date = self.now + timedelta(minutes=50)
+        task.status = 'completed'
+        task.save()
+        self.assertEqual(self.scheduler.run_pending(self.now), 0)
+        Task.objects.filter(pk=task.pk).update(status='pending')
+        self.assertEqual(self.scheduler.run_pending(self.now), 1)
+    
+    def test_reminders_are_published(self):
+        """Test that reminders reach the change feed and the webhook outbox"""
+        cache.clear()
+        self.addCleanup(cache.clear)
+        Webhook.objects.create(user=self.user, url='https://example.com/hook')
+        task = self.task('Soon', timedelta(minutes=5))
+        with mock.patch.object(events, 'broker', events.MemoryBroker()) as broker:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.scheduler.run_pending(self.now)
+            self.assertEqual(
+                [(event.type, event.data) for event in broker.replay(self.user.pk, '0')],
+                [('task.due', {'ids': [task.id]})]
+            )
+        self.assertEqual(WebhookEvent.objects.filter(event='task.due', task_id=task.id).count(), 1)
+    
+    @override_settings(REMINDERS={'BATCH_SIZE': 10})
+    def test_send_reminders_command(self):
+        """Test that the command sends what is due and exits with --once"""
+        self.task('Soon', timedelta(minutes=5))
+        out = StringIO()
+        call_command('send_reminders', '--once', stdout=out)
+        self.assertIn('Sent 1 reminders.', out.getvalue())
+    
+    def test_worker(self):
+        """Test that the in-process worker keeps running after a failed tick"""
+        self.assertIsNone(start_worker())
+        worker = ReminderWorker(self.scheduler, interval=0.01)
+        calls = []
+        
+        def run_pending():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError('database unavailable')
+            worker.stop()
+        
+        with mock.patch.object(self.scheduler, 'run_pending', run_pending), \
+                self.assertLogs('apps.tasks.reminders', 'ERROR'):
+            worker.run()
+        self.assertEqual(len(calls), 2)
@@ -0,0 +1,112 @@
+import unittest
+import json
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from apps.projects.models import Project
+from apps.tasks.models import Task
+from apps.tasks import search
+
+User = get_user_model()
+
+
+@unittest.skipUnless(
+    connection.vendor == 'sqlite' and search.supports_full_text(connection),
+    'Requires SQLite with FTS5'
+)
+class TaskSearchTests(TestCase):
+    """Test cases for full-text task search"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='search@example.com',
+            name='Search User',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            email='othersearch@example.com',
+            name='Other Search User',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.tasks_url = reverse('task-list')
+        
+        self.project = Project.objects.create(name='Finance', user=self.user)
+        Task.objects.create(
+            title='Quarterly invoice review',
+            description='Check every invoice against the ledger; invoice totals must match.',
+            user=self.user,
+            project=self.project
+        )
+        Task.objects.create(
+            title='Team meeting',
+            description='Bring the invoice numbers.',
+            user=self.user,
+            status='completed'
+        )
+        Task.objects.create(title='Deploy release', description='', user=self.user)
+        Task.objects.create(title='Invoice for other user', user=self.other_user)
+    
+    def search(self, **params):
+        response = self.client.get(self.tasks_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task['title'] for task in response.data['results']]
+    
+    def test_search_is_ranked_and_scoped_to_user(self):
+        """Test that better matches come first and other users never match"""
+        self.assertEqual(self.search(search='invoice'), ['Quarterly invoice review', 'Team meeting'])
+    
+    def test_search_prefix_matching(self):
+        """Test that partial words match"""
+        self.assertEqual(self.search(search='depl'), ['Deploy release'])
+        self.assertEqual(self.search(search='inv rev'), ['Quarterly invoice review'])
+    
+    def test_search_combines_with_filters_and_ordering(self):
+        """Test search together with the list filters and explicit ordering"""
+        self.assertEqual(self.search(search='invoice', status='completed'), ['Team meeting'])
+        self.assertEqual(self.search(search='invoice', project=self.project.id), ['Quarterly invoice review'])
+        self.assertEqual(
+            self.search(search='invoice', ordering='-created_at'),
+            ['Team meeting', 'Quarterly invoice review']
+        )
+    
+    def test_index_follows_writes(self):
+        """Test that updates and deletes, including queryset updates, reach the index"""
+        task = Task.objects.get(title='Deploy release')
+        task.title = 'Ship release'
+        task.save()
+        self.assertEqual(self.search(search='deploy'), [])
+        Task.objects.filter(pk=task.pk).update(description='Includes the migration')
+        self.assertEqual(self.search(search='migration'), ['Ship release'])
+        task.delete()
+        self.assertEqual(self.search(search='ship'), [])
+    
+    def test_punctuation_is_not_query_syntax(self):
+        """Test that FTS5 operators in user input are treated as text"""
+        self.assertEqual(self.search(search='"invoice*" ('), ['Quarterly invoice review', 'Team meeting'])
+        self.assertEqual(self.search(search='invoice OR deploy'), [])
+    
+    def test_punctuation_only_search_matches_nothing(self):
+        """Test that a search without any word returns no tasks rather than all of them"""
+        for text in ('***', '*', '%%%', '" ( )'):
+            self.assertEqual(self.search(search=text), [], text)
+    
+    def test_rebuild_command(self):
+        """Test repopulating the index from the task table"""
+        call_command('rebuild_task_search', stdout=StringIO())
+        self.assertEqual(self.search(search='invoice'), ['Quarterly invoice review', 'Team meeting'])
+    
+    def test_export_uses_ranked_search(self):
+        """Test that the export applies the same ranked search as the list"""
+        response = self.client.get(reverse('task-export'), {'search': 'invoice'})
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in lines], ['Quarterly invoice review', 'Team meeting'])
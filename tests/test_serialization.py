@@ -0,0 +1,178 @@
+import datetime
+import decimal
+import uuid
+from collections import OrderedDict
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+
+from apps.core.renderers import FastJSONRenderer
+from apps.core.serialization import uncompiled
+from apps.projects.models import Project
+from apps.projects.serializers import ProjectDetailSerializer, ProjectSerializer
+from apps.tasks.models import Task
+from apps.tasks.serializers import TaskSerializer
+
+User = get_user_model()
+
+
+class SerializationTestCase(TestCase):
+    """Tasks with and without a project, shared by the serialization tests"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            email='fast@example.com',
+            name='Fast User',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Fast “Project”', user=self.user)
+        now = timezone.now()
+        Task.objects.create(title='Plain', user=self.user)
+        Task.objects.create(
+            title='Line separator – ✓', description='Multi\nline', user=self.user,
+            project=self.project, status='in_progress', priority='high', due_date=now
+        )
+        Task.objects.create(title='Done', user=self.user, project=self.project, status='completed')
+        request = Request(RequestFactory().get('/api/projects/1/'))
+        request.user = self.user
+        self.context = {'request': request}
+    
+    def assertSameBytes(self, serializer_class, instance, many=False):
+        stock = uncompiled(serializer_class)(instance, many=many, context=self.context).data
+        fast = serializer_class(instance, many=many, context=self.context).data
+        self.assertEqual(fast, stock)
+        self.assertEqual(FastJSONRenderer().render(fast), JSONRenderer().render(stock))
+
+
+class CompiledSerializerTests(SerializationTestCase):
+    """Test that the compiled serializers match DRF's stock output"""
+    
+    def test_task_serializer(self):
+        """Test tasks with and without a project, due date and completion time"""
+        tasks = Task.objects.filter(user=self.user).select_related('user', 'project')
+        self.assertSameBytes(TaskSerializer, list(tasks), many=True)
+        for task in tasks:
+            self.assertSameBytes(TaskSerializer, task)
+        # Without a project the `project_name` key is left out, as DRF does
+        self.assertNotIn('project_name', TaskSerializer(tasks.get(title='Plain')).data)
+    
+    def test_project_serializers(self):
+        """Test the project list and detail representations"""
+        self.project.refresh_from_db()
+        self.assertSameBytes(ProjectSerializer, [self.project], many=True)
+        self.assertSameBytes(ProjectDetailSerializer, self.project)
+    
+    def test_other_time_zone(self):
+        """Test that datetimes follow the active time zone"""
+        task = Task.objects.select_related('user', 'project').get(title='Done')
+        with timezone.override('Asia/Kolkata'):
+            self.assertSameBytes(TaskSerializer, task)
+            self.assertTrue(TaskSerializer(task).data['created_at'].endswith('+05:30'))
+
+
+class TaskRowTests(SerializationTestCase):
+    """Test the values_list read path of the task list and project detail"""
+    
+    def test_rows_match_instances(self):
+        """Test that rows serialize exactly like model instances"""
+        queryset = Task.objects.filter(user=self.user).select_related('user', 'project')
+        rows = list(TaskSerializer().rows(queryset))
+        self.assertIsInstance(rows[0], tuple)
+        self.assertFalse(hasattr(rows[0], '__dict__'))
+        self.assertEqual(
+            FastJSONRenderer().render(TaskSerializer(rows, many=True).data),
+            JSONRenderer().render(uncompiled(TaskSerializer)(list(queryset), many=True).data)
+        )
+        plain = TaskSerializer(next(row for row in rows if row.project_id is None)).data
+        self.assertNotIn('project_name', plain)
+    
+    def test_row_columns(self):
+        """Test that rows hold the serialized columns only, joined across the foreign keys"""
+        columns = TaskSerializer().rows(Task.objects.all()).query.values_select
+        self.assertIn('user__email', columns)
+        self.assertIn('project__name', columns)
+        self.assertIn('project_id', columns)
+        with self.assertRaises(ImproperlyConfigured):
+            ProjectDetailSerializer(context=self.context).rows(Project.objects.all())
+    
+    def test_lists_build_no_instances(self):
+        """Test that the task list and the nested project tasks never build Task instances"""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        with mock.patch.object(Task, 'from_db', side_effect=AssertionError('Task instance built')):
+            for url in ['/api/tasks/', '/api/tasks/?pagination=cursor&page_size=2',
+                        f'/api/projects/{self.project.pk}/?tasks_page_size=1']:
+                with self.subTest(url=url):
+                    response = client.get(url, HTTP_ACCEPT='application/json')
+                    self.assertEqual(response.status_code, 200)
+        response = client.get('/api/tasks/?ordering=created_at', HTTP_ACCEPT='application/json')
+        self.assertEqual([task['title'] for task in response.data['results']], ['Plain', 'Line\u2028separator – ✓', 'Done'])
+        self.assertEqual(response.data['results'][1]['project_name'], self.project.name)
+        self.assertEqual(response.data['results'][1]['user_email'], self.user.email)
+    
+    def test_benchmark_runs(self):
+        """Test that the rows benchmark compares both paths and leaves no data behind"""
+        out = StringIO()
+        call_command('benchmark_task_rows', rows=20, repeat=1, stdout=out)
+        self.assertIn('bytes/row', out.getvalue())
+        self.assertFalse(User.objects.filter(email='rows-benchmark@example.com').exists())
+
+
+class FastJSONRendererTests(TestCase):
+    """Test that FastJSONRenderer renders the same bytes as JSONRenderer"""
+    
+    def assertSameBytes(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type)
+        )
+    
+    def test_values(self):
+        """Test the value types DRF's encoder knows"""
+        utc = datetime.timezone.utc
+        for data in [
+            None,
+            {'results': [], 'count': 0, 'next': None},
+            OrderedDict([('b', 1), ('a', [True, False, None])]),
+            {'text': 'naïve “quotes”     \x00 \\ / \U0001f600'},
+            {'number': 12.5, 'negative': -3, 'ratio': 33.3},
+            {'when': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=utc)},
+            {'when': datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=2)))},
+            {'when': datetime.datetime(2024, 5, 1, 12, 30)},
+            {'date': datetime.date(2024, 5, 1), 'time': datetime.time(8, 15, 0, 5)},
+            {'amount': decimal.Decimal('10.25'), 'id': uuid.UUID(int=1)},
+            {'lazy': gettext_lazy('Not found.'), 'duration': datetime.timedelta(minutes=3)},
+            {'tuple': (1, 2), 'set': {3}},
+        ]:
+            with self.subTest(data=data):
+                self.assertSameBytes(data)
+    
+    def test_fallbacks(self):
+        """Test the inputs orjson rejects and indented output"""
+        self.assertSameBytes({1: 'integer key'})
+        self.assertSameBytes({'big': 2 ** 70})
+        self.assertSameBytes({'a': [1, 2]}, 'application/json; indent=4')
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({'object': object()})
+
+
+class SerializationBenchmarkTests(TestCase):
+    """Test the serialization micro-benchmark command"""
+    
+    def test_benchmark_runs(self):
+        """Test that the benchmark checks the outputs match and reports both paths"""
+        out = StringIO()
+        call_command('benchmark_serialization', rows=20, repeat=1, stdout=out)
+        self.assertIn('Task', out.getvalue())
+        self.assertIn('Project', out.getvalue())
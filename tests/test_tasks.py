@@ -1,10 +1,17 @@
-from django.test import TestCase
+import csv
+import json
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.urls import reverse
+from django.db import connection
+from django.core.cache import cache
+from django.test.utils import CaptureQueriesContext
+from apps.core.response_cache import response_cache
+from apps.tasks import export
 from apps.tasks.models import Task
 
 User = get_user_model()
@@ -147,6 +154,34 @@ class TaskTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Task.objects.count(), 0)
     
+    def test_list_tasks_query_count_is_fixed(self):
+        """Test that listing does not load the user or project per task"""
+        from apps.projects.models import Project
+        for i in range(5):
+            project = Project.objects.create(name=f'Project {i}', user=self.user)
+            Task.objects.create(title=f'Task {i}', user=self.user, project=project)
+        
+        # Token lookup, page count and the joined page.
+        with self.assertNumQueries(3):
+            response = self.client.get(self.tasks_url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['project_name'], 'Project 4')
+        self.assertEqual(response.data['results'][0]['user_email'], self.user.email)
+    
+    def test_detail_update_and_toggle_query_counts(self):
+        """Test that single-task endpoints run a fixed number of queries"""
+        # Token lookup and the joined task.
+        with self.assertNumQueries(2):
+            self.client.get(self.task_detail_url)
+        # The token is cached from here on: the task once and the UPDATE.
+        with self.assertNumQueries(2):
+            response = self.client.patch(self.task_detail_url, {'title': 'Renamed'}, format='json')
+        self.assertEqual(response.data['title'], 'Renamed')
+        with self.assertNumQueries(2):
+            response = self.client.post(reverse('task-toggle-complete', args=[self.task.id]))
+        self.assertEqual(response.data['task']['status'], 'completed')
+    
     def test_filter_tasks_by_status(self):
         """Test filtering tasks by status"""
         # Create completed task
@@ -161,4 +196,850 @@ class TaskTests(TestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], 'Completed Task')
\ No newline at end of file
+        self.assertEqual(response.data[0]['title'], 'Completed Task')
+
+class TaskCursorPaginationTests(TestCase):
+    """Test cases for keyset (cursor) pagination of the task list"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='cursor@example.com',
+            name='Cursor User',
+            password='testpass123'
+        )
+        from rest_framework.authtoken.models import Token
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.tasks_url = reverse('task-list')
+        
+        priorities = ['low', 'medium', 'high']
+        for i in range(7):
+            Task.objects.create(
+                title=f'Task {i}',
+                user=self.user,
+                priority=priorities[i % 3],
+                status='completed' if i % 2 else 'pending',
+                due_date=timezone.now() + timedelta(days=i) if i % 3 else None
+            )
+    
+    def crawl(self, params):
+        """Follow `next` links until exhausted and return the titles seen"""
+        titles = []
+        response = self.client.get(self.tasks_url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            titles.extend(task['title'] for task in response.data['results'])
+            if not response.data['next']:
+                return titles
+            response = self.client.get(response.data['next'])
+    
+    def test_cursor_crawl_returns_every_task_once(self):
+        """Test that crawling by cursor visits every task in created order"""
+        titles = self.crawl({'pagination': 'cursor', 'page_size': 2})
+        self.assertEqual(titles, [f'Task {i}' for i in reversed(range(7))])
+    
+    def test_cursor_crawl_with_ties_and_nulls(self):
+        """Test cursor ordering on low-cardinality and nullable fields"""
+        for ordering in ['priority', '-priority', 'due_date', '-due_date']:
+            direction = '-' if ordering.startswith('-') else ''
+            expected = [
+                task.title for task in Task.objects.filter(user=self.user).order_by(
+                    ordering, direction + 'created_at', direction + 'id'
+                )
+            ]
+            titles = self.crawl({'pagination': 'cursor', 'page_size': 2, 'ordering': ordering})
+            self.assertEqual(titles, expected, ordering)
+    
+    def test_cursor_with_filter_skips_count_query(self):
+        """Test that cursor pages honour filters and never run COUNT(*)"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                self.tasks_url, {'pagination': 'cursor', 'status': 'completed', 'page_size': 2}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertTrue(all(task['status'] == 'completed' for task in response.data['results']))
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+        
+        previous = self.client.get(self.client.get(response.data['next']).data['previous'])
+        self.assertEqual(previous.data['results'], response.data['results'])
+    
+    def test_cursor_page_size_is_bounded(self):
+        """Test that page_size cannot exceed the maximum"""
+        response = self.client.get(self.tasks_url, {'pagination': 'cursor', 'page_size': 100000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 7)
+    
+    def test_invalid_cursor(self):
+        """Test that a tampered cursor is rejected"""
+        response = self.client.get(self.tasks_url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TaskBulkTests(TestCase):
+    """Test cases for the bulk task endpoint"""
+    
+    def setUp(self):
+        """Set up test data"""
+        from apps.projects.models import Project
+        from rest_framework.authtoken.models import Token
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='bulk@example.com',
+            name='Bulk User',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            email='otherbulk@example.com',
+            name='Other Bulk User',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.bulk_url = reverse('task-bulk')
+        
+        self.inbox = Project.objects.create(name='Inbox', user=self.user)
+        self.archive = Project.objects.create(name='Archive', user=self.user)
+        self.foreign = Project.objects.create(name='Foreign', user=self.other_user)
+        self.open_task = Task.objects.create(title='Open', user=self.user, project=self.inbox)
+        self.done_task = Task.objects.create(title='Done', user=self.user, status='completed')
+        self.other_task = Task.objects.create(title='Theirs', user=self.other_user)
+    
+    def test_bulk_create_update_delete(self):
+        """Test every operation in a single request"""
+        payload = {
+            'create': [
+                {'title': 'New 1', 'project': self.inbox.id},
+                {'title': 'New 2', 'status': 'completed'},
+            ],
+            'update': [{'id': self.open_task.id, 'project': self.archive.id, 'priority': 'high'}],
+            'delete': [self.done_task.id],
+        }
+        response = self.client.post(self.bulk_url, payload, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['created'], response.data['updated'], response.data['deleted']), (2, 1, 1))
+        created = response.data['results']['create']
+        self.assertEqual(created[0]['task']['project_name'], 'Inbox')
+        self.assertIsNotNone(created[1]['task']['completed_at'])
+        self.assertTrue(Task.objects.filter(pk=created[0]['task']['id'], user=self.user).exists())
+        
+        self.open_task.refresh_from_db()
+        self.assertEqual((self.open_task.project, self.open_task.priority), (self.archive, 'high'))
+        self.assertFalse(Task.objects.filter(pk=self.done_task.id).exists())
+    
+    def test_bulk_uses_set_based_writes(self):
+        """Test that the query count does not grow with the number of items"""
+        payload = {
+            'create': [{'title': f'Task {i}', 'project': self.inbox.id} for i in range(50)],
+            'update': [{'id': self.open_task.id, 'title': 'Renamed'}],
+        }
+        self.client.post(self.bulk_url, {}, format='json')  # warm the token cache
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.bulk_url, payload, format='json')
+        self.assertEqual(response.data['created'], 50)
+        self.assertLessEqual(len(queries.captured_queries), 8)
+    
+    def test_bulk_reports_per_item_errors(self):
+        """Test validation, ownership and completed-task rules per item"""
+        payload = {
+            'create': [{'title': 'Fine'}, {'description': 'No title'}, {'title': 'Bad', 'project': self.foreign.id}],
+            'update': [
+                {'id': self.done_task.id, 'title': 'Edit while completed'},
+                {'id': self.other_task.id, 'title': 'Not mine'},
+                {'title': 'No id'},
+            ],
+            'delete': [self.other_task.id, 999999],
+        }
+        response = self.client.post(self.bulk_url, payload, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        results = response.data['results']
+        self.assertEqual([r['status'] for r in results['create']], [201, 400, 400])
+        self.assertIn('project', results['create'][2]['errors'])
+        self.assertEqual([r['status'] for r in results['update']], [400, 404, 400])
+        self.assertEqual([r['status'] for r in results['delete']], [404, 404])
+        self.assertTrue(Task.objects.filter(pk=self.other_task.id, title='Theirs').exists())
+        self.assertTrue(Task.objects.filter(title='Fine').exists())
+    
+    def test_bulk_reopen_completed_task(self):
+        """Test that completed_at follows status changes in bulk updates"""
+        payload = {'update': [{'id': self.done_task.id, 'status': 'pending', 'title': 'Reopened'}]}
+        response = self.client.post(self.bulk_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.done_task.refresh_from_db()
+        self.assertEqual((self.done_task.title, self.done_task.completed_at), ('Reopened', None))
+    
+    def test_bulk_rejects_oversized_requests(self):
+        """Test the cap on items per request"""
+        payload = {'delete': list(range(1001))}
+        response = self.client.post(self.bulk_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskExportTests(TestCase):
+    """Test cases for the streaming task export"""
+    
+    def setUp(self):
+        """Set up test data"""
+        from apps.projects.models import Project
+        from rest_framework.authtoken.models import Token
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='export@example.com',
+            name='Export User',
+            password='testpass123'
+        )
+        other_user = User.objects.create_user(
+            email='otherexport@example.com',
+            name='Other Export User',
+            password='testpass123'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.export_url = reverse('task-export')
+        
+        self.project = Project.objects.create(name='Launch', user=self.user)
+        for i in range(25):
+            Task.objects.create(
+                title=f'Task {i}',
+                description='line one\nline "two", three',
+                user=self.user,
+                project=self.project if i % 2 else None,
+                status='completed' if i % 5 == 0 else 'pending',
+            )
+        Task.objects.create(title='Not mine', user=other_user)
+    
+    def read(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+    
+    def test_export_ndjson_matches_api_representation(self):
+        """Test NDJSON rows carry the same values as the task API"""
+        response = self.client.get(self.export_url)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(rows), 25)
+        
+        task = Task.objects.filter(project=self.project).first()
+        detail = self.client.get(reverse('task-detail', args=[task.id])).data
+        exported = next(row for row in rows if row['id'] == task.id)
+        for field in exported:
+            self.assertEqual(exported[field], detail[field], field)
+    
+    def test_export_csv_honours_filters(self):
+        """Test CSV output with the list's filter and ordering parameters"""
+        response = self.client.get(self.export_url, {'format': 'csv', 'status': 'completed', 'ordering': 'created_at'})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('tasks.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(self.read(response).splitlines(keepends=True)))
+        
+        expected = Task.objects.filter(user=self.user, status='completed').order_by('created_at')
+        self.assertEqual([int(row['id']) for row in rows], [task.id for task in expected])
+        self.assertEqual(rows[0]['description'], 'line one\nline "two", three')
+    
+    def test_export_streams_in_chunks(self):
+        """Test the export reads rows in chunks instead of all at once"""
+        rows = export.export_rows(Task.objects.filter(user=self.user), chunk_size=10)
+        self.assertEqual(len(next(rows)), len(export.EXPORT_FIELDS))
+        self.assertEqual(sum(1 for row in rows), 24)
+    
+    def test_export_requires_authentication(self):
+        """Test that exporting requires a token"""
+        self.client.credentials()
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TaskImportTests(TestCase):
+    """Test cases for the streaming task import"""
+    
+    def setUp(self):
+        """Set up test data"""
+        from apps.projects.models import Project
+        from rest_framework.authtoken.models import Token
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='import@example.com',
+            name='Import User',
+            password='testpass123'
+        )
+        other_user = User.objects.create_user(
+            email='otherimport@example.com',
+            name='Other Import User',
+            password='testpass123'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.import_url = reverse('task-import')
+        
+        self.project = Project.objects.create(name='Existing', user=self.user)
+        Project.objects.create(name='Migrated', user=other_user)
+    
+    def post(self, body, content_type='application/x-ndjson', **params):
+        url = self.import_url
+        if params:
+            url += '?' + '&'.join(f'{key}={value}' for key, value in params.items())
+        return self.client.generic('POST', url, body.encode('utf-8'), content_type=content_type)
+    
+    def test_import_ndjson(self):
+        """Test importing NDJSON with validation errors reported per line"""
+        lines = [
+            {'title': 'One', 'project_name': 'Existing', 'priority': 'high'},
+            {'title': 'Two', 'project_name': 'Migrated', 'status': 'completed'},
+            {'description': 'Missing title'},
+            {'title': 'Three', 'status': 'unknown'},
+        ]
+        body = '\n'.join(json.dumps(line) for line in lines) + '\n\n{not json\n'
+        response = self.post(body, batch_size=1)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {key: response.data[key] for key in ('processed', 'imported', 'failed', 'projects_created')},
+            {'processed': 5, 'imported': 2, 'failed': 3, 'projects_created': 1}
+        )
+        self.assertEqual([error['row'] for error in response.data['errors']], [3, 4, 6])
+        self.assertIn('title', response.data['errors'][0]['errors'])
+        
+        one = Task.objects.get(title='One')
+        self.assertEqual((one.user, one.project, one.priority), (self.user, self.project, 'high'))
+        two = Task.objects.get(title='Two')
+        self.assertEqual(two.project.user, self.user)
+        self.assertEqual(two.project.name, 'Migrated')
+        self.assertIsNotNone(two.completed_at)
+    
+    def test_import_csv_upload(self):
+        """Test importing a CSV file upload, with quoted multi-line cells"""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        content = (
+            'title,description,status,due_date,project_name\n'
+            'Plan,"first line\nsecond, line",pending,2030-01-01T09:00:00Z,Existing\n'
+            'Build,,in_progress,,\n'
+        )
+        upload = SimpleUploadedFile('tasks.csv', content.encode('utf-8'), content_type='text/csv')
+        response = self.client.post(self.import_url, {'file': upload}, format='multipart')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['imported'], response.data['failed']), (2, 0))
+        plan = Task.objects.get(title='Plan')
+        self.assertEqual((plan.description, plan.project), ('first line\nsecond, line', self.project))
+        self.assertEqual(plan.due_date.year, 2030)
+        self.assertIsNone(Task.objects.get(title='Build').project)
+    
+    def test_import_batches_inserts(self):
+        """Test that rows are inserted in batches and projects looked up once"""
+        body = '\n'.join(json.dumps({'title': f'Task {i}', 'project_name': 'Existing'}) for i in range(40))
+        self.post('', content_type='application/x-ndjson')  # warm the token cache
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(body, batch_size=20)
+        self.assertEqual(response.data['imported'], 40)
+        inserts = [query for query in queries.captured_queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 2)
+        self.assertLessEqual(len(queries.captured_queries), 10)
+    
+    def test_import_rejects_invalid_encoding(self):
+        """Test a body that is not UTF-8"""
+        response = self.client.generic('POST', self.import_url, b'{"title": "\xff"}\n', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_import_command_round_trips_export(self):
+        """Test that an export can be imported with the management command"""
+        import os
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+        Task.objects.create(title='Exported', description='Keep me', user=self.user, project=self.project)
+        response = self.client.get(reverse('task-export'), {'format': 'csv'})
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as handle:
+            handle.write(b''.join(response.streaming_content))
+        try:
+            out = StringIO()
+            call_command('import_tasks', handle.name, user=self.user.email, stdout=out)
+        finally:
+            os.unlink(handle.name)
+        self.assertIn('Imported 1 of 1 rows', out.getvalue())
+        copies = Task.objects.filter(title='Exported', description='Keep me', project=self.project)
+        self.assertEqual(copies.count(), 2)
+
+
+class TaskStatsTests(TestCase):
+    """Test cases for the cached task summary"""
+    
+    def setUp(self):
+        """Set up test data"""
+        from django.core.cache import cache
+        from rest_framework.authtoken.models import Token
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='stats@example.com',
+            name='Stats User',
+            password='testpass123'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.stats_url = reverse('task-stats')
+        
+        for status_value in ['pending', 'pending', 'in_progress', 'completed']:
+            Task.objects.create(title=f'{status_value} task', user=self.user, status=status_value)
+    
+    def get_stats(self):
+        response = self.client.get(self.stats_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+    
+    def test_summary_counts(self):
+        """Test the summary values"""
+        self.assertEqual(self.get_stats(), {
+            'total_tasks': 4,
+            'pending_tasks': 2,
+            'in_progress_tasks': 1,
+            'completed_tasks': 1,
+            'completion_rate': 25.0,
+            'project_count': 0,
+        })
+    
+    def test_summary_is_cached(self):
+        """Test that a repeated request runs no queries"""
+        self.get_stats()
+        with CaptureQueriesContext(connection) as queries:
+            self.get_stats()
+        self.assertEqual(len(queries.captured_queries), 0)
+    
+    def test_summary_invalidated_on_writes(self):
+        """Test that every write path invalidates the cached summary"""
+        from apps.projects.models import Project
+        self.get_stats()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task-list'), {'title': 'New'}, format='json')
+        self.assertEqual(self.get_stats()['total_tasks'], 5)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.filter(user=self.user, status='pending').update(status='completed')
+        self.assertEqual(self.get_stats()['completed_tasks'], 4)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task-bulk'), {'delete': [Task.objects.filter(user=self.user).first().id]}, format='json')
+        self.assertEqual(self.get_stats()['total_tasks'], 4)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(name='Launch', user=self.user)
+        self.assertEqual(self.get_stats()['project_count'], 1)
+    
+    def test_summary_not_invalidated_by_rolled_back_writes(self):
+        """Test that invalidation waits for the commit"""
+        from django.db import transaction
+        self.get_stats()
+        try:
+            with transaction.atomic():
+                Task.objects.create(title='Rolled back', user=self.user)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get_stats()['total_tasks'], 4)
+        self.assertEqual(len(queries.captured_queries), 0)
+
+
+class TaskConditionalRequestTests(TestCase):
+    """Test cases for ETag/Last-Modified validators on tasks"""
+    
+    def setUp(self):
+        """Set up test data"""
+        from rest_framework.authtoken.models import Token
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='etag@example.com',
+            name='ETag User',
+            password='testpass123'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.tasks_url = reverse('task-list')
+        for i in range(3):
+            self.task = Task.objects.create(title=f'Task {i}', user=self.user)
+        self.detail_url = reverse('task-detail', args=[self.task.id])
+    
+    def test_list_not_modified(self):
+        """Test that an unchanged list answers 304 without running the page query"""
+        for params in [{}, {'status': 'pending'}, {'pagination': 'cursor', 'page_size': 2}]:
+            with self.subTest(**params):
+                response = self.client.get(self.tasks_url, params)
+                etag = response['ETag']
+                self.assertTrue(response.has_header('Last-Modified'))
+                
+                cache.clear()  # revalidate through the validators, not a cached response
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(self.tasks_url, params, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response['ETag'], etag)
+                self.assertEqual(len(queries.captured_queries), 1)
+    
+    def test_list_etag_changes_on_writes(self):
+        """Test that edits, queryset updates and deletes change the list ETag"""
+        etags = {self.client.get(self.tasks_url)['ETag']}
+        etags.add(self.client.get(self.tasks_url, {'status': 'pending'})['ETag'])
+        
+        self.client.patch(self.detail_url, {'title': 'Renamed'}, format='json')
+        etags.add(self.client.get(self.tasks_url)['ETag'])
+        Task.objects.filter(user=self.user).update(priority='high')
+        etags.add(self.client.get(self.tasks_url)['ETag'])
+        Task.objects.filter(user=self.user).first().delete()
+        etags.add(self.client.get(self.tasks_url)['ETag'])
+        self.assertEqual(len(etags), 5)
+    
+    def test_if_modified_since(self):
+        """Test Last-Modified based revalidation"""
+        last_modified = self.client.get(self.detail_url)['Last-Modified']
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_detail_not_modified(self):
+        """Test conditional GET on a task"""
+        etag = self.client.get(self.detail_url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        self.client.patch(self.detail_url, {'priority': 'low'}, format='json')
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+    
+    def test_if_match_on_writes(self):
+        """Test that writes with a stale If-Match are rejected"""
+        etag = self.client.get(self.detail_url)['ETag']
+        response = self.client.patch(self.detail_url, {'title': 'First'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        response = self.client.patch(self.detail_url, {'title': 'Second'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        response = self.client.delete(self.detail_url, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, 'First')
+        
+        etag = self.client.get(self.detail_url)['ETag']
+        response = self.client.delete(self.detail_url, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class TaskResponseCacheTests(TestCase):
+    """Test cases for the cached task list responses"""
+    
+    def setUp(self):
+        """Set up test data"""
+        from rest_framework.authtoken.models import Token
+        cache.clear()
+        response_cache.reset_stats()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='cache@example.com',
+            name='Cache User',
+            password='testpass123'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.tasks_url = reverse('task-list')
+        for i in range(3):
+            self.task = Task.objects.create(title=f'Task {i}', user=self.user)
+    
+    def titles(self, response):
+        return sorted(task['title'] for task in response.json()['results'])
+    
+    def test_hit_runs_no_queries(self):
+        """Test that a repeated list request is served from the cache"""
+        first = self.client.get(self.tasks_url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get(self.tasks_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.content, first.content)
+        self.assertEqual(response['Content-Type'], first['Content-Type'])
+        self.assertEqual(response['ETag'], first['ETag'])
+    
+    def test_query_string_is_normalized(self):
+        """Test that parameter order does not matter but parameter values do"""
+        self.client.get(self.tasks_url + '?status=pending&ordering=created_at')
+        response = self.client.get(self.tasks_url + '?ordering=created_at&status=pending')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        response = self.client.get(self.tasks_url, {'status': 'completed'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['count'], 0)
+    
+    def test_not_modified_from_cache(self):
+        """Test that a cached entry answers If-None-Match with 304"""
+        etag = self.client.get(self.tasks_url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.tasks_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+    
+    def test_writes_invalidate(self):
+        """Test that the API, model saves and queryset updates all bump the version"""
+        writes = [
+            lambda: self.client.patch(reverse('task-detail', args=[self.task.id]), {'title': 'Task A'}, format='json'),
+            # The dashboard's quick update saves the instance
+            lambda: Task.objects.filter(pk=self.task.pk).first().save(),
+            # Admin actions use QuerySet.update
+            lambda: Task.objects.filter(user=self.user).update(title='Task B'),
+            lambda: self.client.post(self.tasks_url, {'title': 'Task C'}, format='json'),
+        ]
+        for write in writes:
+            self.client.get(self.tasks_url)
+            self.assertEqual(self.client.get(self.tasks_url)['X-Cache'], 'HIT')
+            write()
+            response = self.client.get(self.tasks_url)
+            self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(self.titles(response), ['Task B', 'Task B', 'Task B', 'Task C'])
+    
+    def test_entries_are_per_user(self):
+        """Test that users never see each other's cached lists"""
+        from rest_framework.authtoken.models import Token
+        self.client.get(self.tasks_url)
+        other = User.objects.create_user(email='other@example.com', name='Other', password='testpass123')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=other).key}')
+        response = client.get(self.tasks_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['count'], 0)
+        
+        # Writes of the other user leave this user's entries alone
+        Task.objects.create(title='Other task', user=other)
+        self.assertEqual(self.client.get(self.tasks_url)['X-Cache'], 'HIT')
+    
+    def test_hit_rate(self):
+        """Test the hit/miss statistics, local and shared"""
+        for _ in range(4):
+            self.client.get(self.tasks_url)
+        stats = response_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (3, 1))
+        self.assertEqual(stats['hit_rate'], 0.75)
+        response_cache.flush_stats()
+        self.assertEqual(response_cache.shared_stats(), stats)
+
+class TaskFieldsetTests(TestCase):
+    """Test cases for `?fields=`/`?exclude=` on the task endpoints"""
+    
+    def setUp(self):
+        """Set up test data"""
+        from rest_framework.authtoken.models import Token
+        from apps.projects.models import Project
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='fields@example.com',
+            name='Fields User',
+            password='testpass123'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.tasks_url = reverse('task-list')
+        self.project = Project.objects.create(name='Board', user=self.user)
+        for i in range(3):
+            self.task = Task.objects.create(
+                title=f'Card {i}', description='Long text ' * 50, user=self.user, project=self.project
+            )
+    
+    def get_with_sql(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        select = next(query['sql'] for query in reversed(queries.captured_queries) if '"description"' in query['sql']
+                      or '"title"' in query['sql'])
+        return response, select
+    
+    def test_list_fields(self):
+        """Test that only the requested fields are selected and returned"""
+        response, sql = self.get_with_sql(self.tasks_url, {'fields': 'id,title,status,priority'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['results'][0]), ['id', 'title', 'status', 'priority'])
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('JOIN', sql)
+    
+    def test_list_exclude(self):
+        """Test that excluded fields are left out and their joins skipped"""
+        response, sql = self.get_with_sql(self.tasks_url, {'exclude': 'description,user_email'})
+        task = response.data['results'][0]
+        self.assertNotIn('description', task)
+        self.assertNotIn('user_email', task)
+        self.assertEqual(task['project_name'], 'Board')
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('"users"', sql)
+        self.assertIn('JOIN', sql)
+    
+    def test_unknown_field(self):
+        """Test that unknown field names are rejected"""
+        response = self.client.get(self.tasks_url, {'fields': 'id,colour'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('colour', str(response.data['fields']))
+        response = self.client.get(self.task_detail_url(), {'exclude': 'colour'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_cursor_pages(self):
+        """Test that cursor pagination works when the ordering columns aren't requested"""
+        response = self.client.get(self.tasks_url, {'fields': 'title', 'pagination': 'cursor', 'page_size': 2})
+        self.assertEqual([task['title'] for task in response.data['results']], ['Card 2', 'Card 1'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'], [{'title': 'Card 0'}])
+    
+    def task_detail_url(self):
+        return reverse('task-detail', args=[self.task.id])
+    
+    def test_detail_fields(self):
+        """Test sparse fields on the task detail, with their own ETag"""
+        full = self.client.get(self.task_detail_url())
+        response, sql = self.get_with_sql(self.task_detail_url(), {'fields': 'id,title'})
+        self.assertEqual(response.data, {'id': self.task.id, 'title': 'Card 2'})
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('JOIN', sql)
+        self.assertNotEqual(response['ETag'], full['ETag'])
+        response = self.client.get(self.task_detail_url(), {'fields': 'id,title'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        response = self.client.get(self.task_detail_url(), {'fields': 'title,project_name'})
+        self.assertEqual(response.data, {'title': 'Card 2', 'project_name': 'Board'})
+    
+    def test_writes_ignore_fieldsets(self):
+        """Test that writes accept and return every field"""
+        response = self.client.post(self.tasks_url + '?fields=id', {'title': 'New', 'description': 'Kept'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['description'], 'Kept')
+
+@override_settings(SYNC={'SETTLE_SECONDS': 0, 'PAGE_SIZE': 50, 'MAX_PAGE_SIZE': 100})
+class TaskSyncTests(TestCase):
+    """Test cases for the delta sync endpoint"""
+    
+    def setUp(self):
+        """Set up test data"""
+        from rest_framework.authtoken.models import Token
+        from apps.projects.models import Project
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='sync@example.com',
+            name='Sync User',
+            password='testpass123'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.changes_url = reverse('task-changes')
+        self.project = Project.objects.create(name='Offline', user=self.user)
+        self.tasks = [
+            Task.objects.create(title=f'Task {i}', user=self.user, project=self.project if i % 2 else None)
+            for i in range(4)
+        ]
+    
+    def sync(self, cursor=None, **params):
+        if cursor:
+            params['cursor'] = cursor
+        response = self.client.get(self.changes_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data
+    
+    def test_first_sync_returns_everything(self):
+        """Test that a sync without a cursor returns every task and no deletions"""
+        Task.objects.create(title='Not mine', user=User.objects.create_user(
+            email='notmine@example.com', name='Other', password='testpass123'))
+        data = self.sync()
+        self.assertEqual([task['title'] for task in data['changes']], ['Task 0', 'Task 1', 'Task 2', 'Task 3'])
+        self.assertEqual(data['deleted'], {'tasks': [], 'projects': []})
+        self.assertFalse(data['has_more'])
+        
+        data = self.sync(data['cursor'])
+        self.assertEqual(data['changes'], [])
+    
+    def test_changes_and_tombstones(self):
+        """Test that only writes since the cursor come back, with deletions as ids"""
+        cursor = self.sync()['cursor']
+        self.client.patch(reverse('task-detail', args=[self.tasks[0].id]), {'title': 'Edited'}, format='json')
+        self.client.delete(reverse('task-detail', args=[self.tasks[1].id]))
+        Task.objects.filter(pk=self.tasks[2].pk).delete()
+        created = Task.objects.create(title='New', user=self.user)
+        
+        data = self.sync(cursor)
+        self.assertEqual([task['id'] for task in data['changes']], [self.tasks[0].id, created.id])
+        self.assertEqual(data['changes'][0]['title'], 'Edited')
+        self.assertEqual(data['deleted'], {'tasks': [self.tasks[1].id, self.tasks[2].id], 'projects': []})
+        
+        project_id = self.project.id
+        self.project.delete()
+        data = self.sync(data['cursor'])
+        self.assertEqual(data['changes'], [])
+        self.assertEqual(data['deleted'], {'tasks': [], 'projects': [project_id]})
+    
+    def test_pages(self):
+        """Test that small pages walk through every change exactly once"""
+        cursor = self.sync()['cursor']
+        deleted_ids = [task.id for task in self.tasks[:3]]
+        for task in self.tasks[:3]:
+            task.delete()
+        self.tasks[3].save()
+        created = [Task.objects.create(title=f'New {i}', user=self.user) for i in range(2)]
+        
+        seen, deleted, calls = [], [], 0
+        data = {'cursor': cursor, 'has_more': True}
+        while data['has_more']:
+            calls += 1
+            data = self.sync(data['cursor'], page_size=1)
+            seen += [task['id'] for task in data['changes']]
+            deleted += data['deleted']['tasks']
+        self.assertEqual(seen, [self.tasks[3].id] + [task.id for task in created])
+        self.assertEqual(deleted, deleted_ids)
+        self.assertEqual(calls, 3)
+    
+    def test_fieldsets(self):
+        """Test that sparse fieldsets apply to the changed tasks"""
+        data = self.sync(fields='id,title')
+        self.assertEqual(data['changes'][0], {'id': self.tasks[0].id, 'title': 'Task 0'})
+        data = self.sync(data['cursor'], fields='id,title')
+        self.assertEqual(data['changes'], [])
+    
+    def test_recent_writes_settle(self):
+        """Test that changes younger than the settle time wait for the next sync"""
+        with self.settings(SYNC={'SETTLE_SECONDS': 60}):
+            self.assertEqual(self.sync()['changes'], [])
+    
+    def test_invalid_and_expired_cursors(self):
+        """Test that bad cursors are rejected and stale ones must resync"""
+        response = self.client.get(self.changes_url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.changes_url, {'page_size': 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        cursor = self.sync()['cursor']
+        with self.settings(SYNC={'SETTLE_SECONDS': 0, 'TOMBSTONE_RETENTION_DAYS': 0}):
+            response = self.client.get(self.changes_url, {'cursor': cursor})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+    
+    def test_daily_syncs_without_deletions_stay_valid(self):
+        """Test that a cursor keeps up with the retention when the user deletes nothing"""
+        from unittest import mock
+        cursor = self.sync()['cursor']
+        start = timezone.now()
+        for day in range(1, 41):
+            with mock.patch('django.utils.timezone.now', return_value=start + timedelta(days=day)):
+                cursor = self.sync(cursor)['cursor']
+    
+    def test_purge_tombstones(self):
+        """Test that tombstones past the retention are purged"""
+        from io import StringIO
+        from django.core.management import call_command
+        from apps.tasks.models import Tombstone
+        old, recent = self.tasks[0].id, self.tasks[1].id
+        self.tasks[0].delete()
+        self.tasks[1].delete()
+        Tombstone.objects.filter(object_id=old).update(deleted_at=timezone.now() - timedelta(days=31))
+        call_command('purge_tombstones', stdout=StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [recent])
+    
+    def test_deleting_the_owner(self):
+        """Test that deleting a user leaves no tombstones behind"""
+        from apps.tasks.models import Tombstone
+        self.user.delete()
+        self.assertFalse(Tombstone.objects.exists())
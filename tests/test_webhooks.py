@@ -0,0 +1,282 @@
+import hashlib
+import hmac
+import json
+import socket
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.tasks.models import Task
+from apps.tasks.reminders import ReminderScheduler
+from apps.webhooks.delivery import WebhookDeliverer
+from apps.webhooks.models import Webhook, WebhookEvent
+
+User = get_user_model()
+
+
+class Receiver(ThreadingHTTPServer):
+    """Local stand-in for an integration: records each POST and answers with `status`."""
+    
+    def __init__(self):
+        self.requests = []
+        self.status = 200
+        super().__init__(('127.0.0.1', 0), ReceiverHandler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+    
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/hook'
+    
+    def events(self):
+        return [event for request in self.requests for event in json.loads(request['body'])['events']]
+
+
+class ReceiverHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.requests.append({'path': self.path, 'headers': dict(self.headers), 'body': body})
+        self.send_response(self.server.status)
+        if 300 <= self.server.status < 400:
+            self.send_header('Location', '/elsewhere')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class WebhookTests(TestCase):
+    """Test cases for webhook subscriptions and the outbox"""
+    
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(
+            email='hooks@example.com',
+            name='Hooks User',
+            password='testpass123'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.receiver = Receiver()
+        self.addCleanup(self.receiver.server_close)
+        self.addCleanup(self.receiver.shutdown)
+        self.webhook = Webhook.objects.create(user=self.user, url=self.receiver.url)
+        # The receiver listens on the loopback interface.
+        self.deliverer = WebhookDeliverer(batch_size=2, concurrency=2, timeout=2, max_attempts=3, backoff=10, jitter=0,
+                                          allow_private_hosts=True)
+        self.addCleanup(self.deliverer.close)
+    
+    def test_crud(self):
+        """Test creating, listing and deleting webhooks, each with its own secret"""
+        response = self.client.post(reverse('webhook-list'), {'url': 'https://example.com/hook'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['secret']), 64)
+        self.assertNotEqual(response.data['secret'], self.webhook.secret)
+        response = self.client.post(reverse('webhook-list'), {'url': 'not a url'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse('webhook-list'))
+        self.assertEqual(response.data['count'], 2)
+        
+        other = User.objects.create_user(email='other@example.com', name='Other', password='testpass123')
+        hidden = Webhook.objects.create(user=other, url='https://example.com/other')
+        response = self.client.delete(reverse('webhook-detail', args=[hidden.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.delete(reverse('webhook-detail', args=[self.webhook.id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+    
+    def test_internal_urls_are_refused(self):
+        """Test that webhooks to loopback, private and link-local hosts are refused"""
+        for url in ('http://localhost/', 'http://10.0.0.1/', 'http://127.0.0.1:8000/hook',
+                    'http://169.254.169.254/latest/meta-data/', 'http://[::1]/', 'ftp://example.com/'):
+            response = self.client.post(reverse('webhook-list'), {'url': url}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, url)
+        
+        # Checked again when sending, and redirects are not followed
+        deliverer = WebhookDeliverer(max_attempts=3, backoff=10, jitter=0)
+        self.addCleanup(deliverer.close)
+        Task.objects.create(title='Internal', user=self.user)
+        self.assertEqual(deliverer.deliver().retrying, 1)
+        self.assertIn('private', WebhookEvent.objects.get().last_error)
+        self.assertEqual(self.receiver.requests, [])
+        self.receiver.status = 307
+        Task.objects.update(title='Redirected')
+        self.assertEqual(self.deliverer.deliver(now=timezone.now() + timedelta(hours=1)).retrying, 1)
+        self.assertEqual(WebhookEvent.objects.get().last_error, 'HTTP 307')
+        self.assertEqual(len(self.receiver.requests), 1)
+    
+    def test_requests_go_to_the_checked_address(self):
+        """Test that a host answering differently on a second lookup (DNS rebinding) is not looked up again"""
+        port = self.receiver.server_address[1]
+        answers = [('127.0.0.1', port), ('169.254.169.254', port)]
+        resolve = socket.getaddrinfo
+        
+        def getaddrinfo(host, *args, **kwargs):
+            if host != 'hooks.example.com':
+                return resolve(host, *args, **kwargs)
+            return [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', answers.pop(0))]
+        
+        self.webhook.url = f'http://hooks.example.com:{port}/hook?source=tasks'
+        self.webhook.save()
+        deliverer = WebhookDeliverer(timeout=2)
+        self.addCleanup(deliverer.close)
+        Task.objects.create(title='Pinned', user=self.user)
+        # Pretend the first answer is a public address
+        with mock.patch('socket.getaddrinfo', getaddrinfo), \
+                mock.patch('apps.webhooks.validators.is_public', lambda address: address == '127.0.0.1'):
+            self.assertEqual(deliverer.deliver().delivered, 1)
+        self.assertEqual(len(answers), 1)
+        self.assertEqual(self.receiver.requests[0]['headers']['Host'], f'hooks.example.com:{port}')
+        self.assertEqual(self.receiver.requests[0]['path'], '/hook?source=tasks')
+    
+    def test_outbox_is_written_with_the_change(self):
+        """Test that task writes add outbox rows in their transaction, and rolled-back ones don't"""
+        response = self.client.post(reverse('task-list'), {'title': 'Hooked'}, format='json')
+        self.assertEqual(
+            list(WebhookEvent.objects.values_list('task_id', 'event')), [(response.data['id'], 'task.created')]
+        )
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            Task.objects.create(title='Rolled back', user=self.user)
+            raise RuntimeError
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+    
+    def test_targets_follow_subscriptions(self):
+        """Test that writes of users without webhooks queue nothing, and that subscribing takes effect"""
+        other = User.objects.create_user(email='other@example.com', name='Other', password='testpass123')
+        task = Task.objects.create(title='Other', user=other)
+        # The ids read and the UPDATE: the webhook lookup is cached.
+        with self.assertNumQueries(2):
+            Task.objects.filter(pk=task.pk).update(title='Renamed')
+        self.assertEqual(WebhookEvent.objects.count(), 0)
+        
+        Webhook.objects.create(user=other, url=self.receiver.url)
+        task.delete()
+        self.assertEqual(list(WebhookEvent.objects.values_list('event', flat=True)), ['task.deleted'])
+        self.webhook.is_active = False
+        self.webhook.save()
+        Task.objects.create(title='Unhooked', user=self.user)
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+    
+    def test_batched_coalesced_delivery(self):
+        """Test that rapid updates to a task are delivered once, in signed batches"""
+        completed, reopened = [Task.objects.create(title=title, user=self.user) for title in ['Open', 'Reopened']]
+        WebhookEvent.objects.all().delete()
+        for task, statuses in [(completed, ['completed']), (reopened, ['completed', 'pending'])]:
+            for task_status in statuses:
+                task.status = task_status
+                task.save()
+            task.title = f'{task.title} and edited'
+            task.save()
+        task = Task.objects.create(title='Draft', user=self.user)
+        for title in ['One', 'Two', 'Three']:
+            task.title = title
+            task.save()
+        others = [Task.objects.create(title=f'Task {i}', user=self.user) for i in range(2)]
+        others[1].delete()
+        
+        result = self.deliverer.deliver()
+        self.assertEqual((result.claimed, result.delivered, result.requests), (12, 5, 3))
+        self.assertEqual(WebhookEvent.objects.count(), 0)
+        events = {event['task']['id']: event for event in self.receiver.events()}
+        self.assertEqual(events[task.id]['type'], 'task.created')
+        self.assertEqual(events[task.id]['task']['title'], 'Three')
+        self.assertEqual(events[others[0].id]['type'], 'task.created')
+        self.assertEqual(events[others[0].id]['task']['user_email'], self.user.email)
+        self.assertEqual(events[max(events)]['type'], 'task.deleted')
+        # An odd number of toggles changed the completion state; an even one didn't
+        self.assertEqual(events[completed.id]['type'], 'task.toggled')
+        self.assertEqual(events[completed.id]['task']['status'], 'completed')
+        self.assertEqual(events[reopened.id]['type'], 'task.updated')
+        self.assertEqual(len(events), 5)
+        
+        request = self.receiver.requests[0]
+        expected = hmac.new(
+            self.webhook.secret.encode(), f"{request['headers']['X-Webhook-Timestamp']}.".encode() + request['body'],
+            hashlib.sha256
+        ).hexdigest()
+        self.assertEqual(request['headers']['X-Webhook-Signature'], f'sha256={expected}')
+    
+    def test_due_reminders_are_not_coalesced(self):
+        """Test that a due reminder claimed with changes of its task is delivered alongside them"""
+        task = Task.objects.create(title='Due', user=self.user, due_date=timezone.now() + timedelta(minutes=30))
+        ReminderScheduler().run_pending()
+        result = self.deliverer.deliver()
+        self.assertEqual((result.claimed, result.delivered), (2, 2))
+        self.assertEqual([event['type'] for event in self.receiver.events()], ['task.created', 'task.due'])
+        
+        task.due_date = timezone.now() + timedelta(minutes=20)
+        task.save()
+        ReminderScheduler().run_pending()
+        task.title = 'Due soon'
+        task.save()
+        self.assertEqual(self.deliverer.deliver().delivered, 2)
+        events = self.receiver.events()[2:]
+        self.assertEqual(sorted(event['type'] for event in events), ['task.due', 'task.updated'])
+        self.assertEqual({event['task']['title'] for event in events}, {'Due soon'})
+    
+    def test_retries_with_backoff(self):
+        """Test that failed deliveries are retried later, then marked failed"""
+        task = Task.objects.create(title='Flaky', user=self.user)
+        self.receiver.status = 503
+        now = timezone.now()
+        result = self.deliverer.deliver(now=now)
+        self.assertEqual((result.retrying, result.failed), (1, 0))
+        event = WebhookEvent.objects.get()
+        self.assertEqual((event.attempts, event.last_error), (1, 'HTTP 503'))
+        self.assertEqual(event.next_attempt_at, now + timedelta(seconds=10))
+        self.assertEqual(self.deliverer.deliver(now=now + timedelta(seconds=5)).claimed, 0)
+        
+        # Changes made meanwhile are coalesced into the retry
+        task.status = 'completed'
+        task.save()
+        result = self.deliverer.deliver(now=now + timedelta(seconds=10))
+        self.assertEqual((result.claimed, result.delivered, result.retrying), (2, 0, 1))
+        event = WebhookEvent.objects.get()
+        self.assertEqual((event.event, event.attempts), ('task.created', 2))
+        self.assertEqual(event.next_attempt_at, now + timedelta(seconds=30))
+        
+        self.receiver.status = 200
+        self.assertEqual(self.deliverer.deliver(now=now + timedelta(seconds=30)).delivered, 1)
+        self.assertEqual(self.receiver.events()[-1]['task']['status'], 'completed')
+        
+        Task.objects.create(title='Doomed', user=self.user)
+        self.receiver.status = 500
+        for attempt in range(3):
+            result = self.deliverer.deliver(now=now + timedelta(hours=attempt + 1))
+        self.assertEqual(result.failed, 1)
+        self.assertEqual(WebhookEvent.objects.get().status, WebhookEvent.FAILED)
+        self.assertEqual(self.deliverer.deliver(now=now + timedelta(days=1)).claimed, 0)
+    
+    def test_unreachable_receiver(self):
+        """Test that connection errors are retried like error responses"""
+        self.webhook.url = 'http://127.0.0.1:9/closed'
+        self.webhook.save()
+        Task.objects.create(title='Nowhere', user=self.user)
+        self.assertEqual(self.deliverer.deliver().retrying, 1)
+        self.assertTrue(WebhookEvent.objects.get().last_error)
+    
+    def test_deliver_webhooks_command(self):
+        """Test that the command delivers what is due and exits with --once"""
+        with self.settings(WEBHOOKS={'BATCH_SIZE': 10, 'ALLOW_PRIVATE_HOSTS': True}):
+            for i in range(3):
+                Task.objects.create(title=f'Task {i}', user=self.user)
+            out = StringIO()
+            call_command('deliver_webhooks', '--once', stdout=out)
+        self.assertIn('3 events: 3 delivered in 1 requests', out.getvalue())
+        self.assertEqual(len(self.receiver.events()), 3)